@@ -1,14 +1,13 @@
-from django.db.models import OuterRef
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 
 from activity_grid.models import ActivityPairCard
-from data.models import Allegation
-from data.utils.subqueries import SQCount
+from data.models import OfficerCoaccusal
 
 
 def cache_data():
-    allegations = Allegation.objects.filter(
-        officerallegation__officer=OuterRef('officer1')
-    ).filter(
-        officerallegation__officer=OuterRef('officer2')
-    )
-    ActivityPairCard.objects.update(coaccusal_count=SQCount(allegations.values('crid')))
+    coaccusal_counts = OfficerCoaccusal.objects.filter(
+        officer_1=OuterRef('officer1'),
+        officer_2=OuterRef('officer2')
+    ).values('coaccusal_count')
+    ActivityPairCard.objects.update(coaccusal_count=Coalesce(Subquery(coaccusal_counts), Value(0)))
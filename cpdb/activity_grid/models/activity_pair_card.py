@@ -1,7 +1,7 @@
 from django.db import models
 
 from data.models.common import TimeStampsModel
-from data.models import Allegation
+from data.models import OfficerCoaccusal
 
 
 class ActivityPairCard(TimeStampsModel):
@@ -19,8 +19,7 @@ class ActivityPairCard(TimeStampsModel):
         super(ActivityPairCard, self).save(*args, **kwargs)
 
     def _set_coaccusal_count(self):
-        self.coaccusal_count = Allegation.objects.filter(
-            officerallegation__officer=self.officer1_id
-        ).filter(
-            officerallegation__officer=self.officer2_id
-        ).distinct().count()
+        self.coaccusal_count = OfficerCoaccusal.objects.filter(
+            officer_1=self.officer1_id,
+            officer_2=self.officer2_id
+        ).values_list('coaccusal_count', flat=True).first() or 0
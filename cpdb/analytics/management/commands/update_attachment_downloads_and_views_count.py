@@ -1,24 +1,24 @@
 from django.core.management.base import BaseCommand
-from django.db.models import OuterRef
+from django.db.models import Count, Q
 
 from data.models import AttachmentFile
-from analytics.models import AttachmentTracking
 from analytics import constants
-from data.utils.subqueries import SQCount
+from utils.bulk_db import bulk_update
 
 
 class Command(BaseCommand):
     help = "Count attachments views and downloads"
 
     def handle(self, *args, **kwargs):
-        AttachmentFile.objects.all().update(views_count=SQCount(
-            AttachmentTracking.objects.filter(
-                attachment_file_id=OuterRef('id'), kind=constants.VIEW_EVENT_TYPE
-            ).values('id')
-        ))
+        counts = list(AttachmentFile.objects.annotate(
+            views_count_value=Count('attachmenttracking', filter=Q(attachmenttracking__kind=constants.VIEW_EVENT_TYPE)),
+            downloads_count_value=Count(
+                'attachmenttracking', filter=Q(attachmenttracking__kind=constants.DOWNLOAD_EVENT_TYPE)
+            ),
+        ).values('id', 'views_count_value', 'downloads_count_value'))
 
-        AttachmentFile.objects.all().update(downloads_count=SQCount(
-            AttachmentTracking.objects.filter(
-                attachment_file_id=OuterRef('id'), kind=constants.DOWNLOAD_EVENT_TYPE
-            ).values('id')
-        ))
+        bulk_update(AttachmentFile._meta.db_table, 'id', ['views_count', 'downloads_count'], ({
+            'id': count['id'],
+            'views_count': count['views_count_value'],
+            'downloads_count': count['downloads_count_value'],
+        } for count in counts))
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+MERGE_DUPLICATE_QUERIES = '''
+    UPDATE analytics_searchtracking AS t SET
+      usages = duplicates.usages,
+      last_entered = duplicates.last_entered
+    FROM (
+      SELECT MIN(id) AS id, SUM(usages) AS usages, MAX(last_entered) AS last_entered
+      FROM analytics_searchtracking
+      GROUP BY query
+      HAVING COUNT(*) > 1
+    ) AS duplicates
+    WHERE t.id = duplicates.id;
+
+    DELETE FROM analytics_searchtracking AS t
+    USING analytics_searchtracking AS kept
+    WHERE t.query = kept.query AND t.id > kept.id;
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_add_kind_to_attachmenttracking'),
+    ]
+
+    operations = [
+        migrations.RunSQL(MERGE_DUPLICATE_QUERIES, reverse_sql=migrations.RunSQL.noop),
+        migrations.AlterField(
+            model_name='searchtracking',
+            name='query',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
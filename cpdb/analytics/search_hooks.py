@@ -1,5 +1,100 @@
+import atexit
+import logging
+from threading import Lock, Thread
+from time import sleep
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from psycopg2.extras import execute_values
+
 from .models import SearchTracking
 
+logger = logging.getLogger(__name__)
+
+QUERY_MAX_LENGTH = SearchTracking._meta.get_field('query').max_length
+
+UPSERT_SEARCH_TRACKINGS_QUERY = f'''
+    INSERT INTO {SearchTracking._meta.db_table} (query, usages, results, query_type, created_at, last_entered)
+    VALUES %s
+    ON CONFLICT (query) DO UPDATE SET
+      usages = {SearchTracking._meta.db_table}.usages + EXCLUDED.usages,
+      results = EXCLUDED.results,
+      query_type = EXCLUDED.query_type,
+      last_entered = EXCLUDED.last_entered
+'''
+
+
+class SearchTrackingBuffer(object):
+    """
+    Collects search usages in memory and merges them into SearchTracking with one batched upsert, so searches
+    do not wait on the write and concurrent increments are never lost. A daemon thread flushes the buffer every
+    SEARCH_TRACKING_FLUSH_INTERVAL seconds; when the interval is None every usage is written right away.
+    """
+    def __init__(self):
+        self._pending = {}
+        self._lock = Lock()
+        self._flusher = None
+
+    def add(self, query, results):
+        query = query[:QUERY_MAX_LENGTH]
+        with self._lock:
+            usages, _, _ = self._pending.get(query, (0, None, None))
+            self._pending[query] = (usages + 1, results, timezone.now())
+
+        if settings.SEARCH_TRACKING_FLUSH_INTERVAL is None:
+            self.flush()
+        else:
+            self._start_flusher()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        rows = [
+            (query, usages, results, 'free_text', entered_at, entered_at)
+            for query, (usages, results, entered_at) in pending.items()
+        ]
+        try:
+            with connection.cursor() as cursor:
+                execute_values(cursor.cursor, UPSERT_SEARCH_TRACKINGS_QUERY, rows)
+        except Exception:
+            self._restore(pending)
+            raise
+
+    def _restore(self, pending):
+        # Put back the usages of a failed flush so that the next flush writes them, usages added meanwhile are newer
+        with self._lock:
+            for query, (usages, results, entered_at) in pending.items():
+                if query in self._pending:
+                    newer_usages, results, entered_at = self._pending[query]
+                    usages += newer_usages
+                self._pending[query] = (usages, results, entered_at)
+
+    def _start_flusher(self):
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = Thread(target=self._run_flusher, name='search-tracking-flusher', daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+
+    def _run_flusher(self):
+        while True:
+            sleep(settings.SEARCH_TRACKING_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Failed to flush search trackings')
+            finally:
+                connection.close()
+
+
+search_tracking_buffer = SearchTrackingBuffer()
+
 
 class QueryTrackingSearchHook(object):
     @staticmethod
@@ -9,14 +104,4 @@ class QueryTrackingSearchHook(object):
 
     @staticmethod
     def execute(term, content_type=None, results={}):
-        query_searches = SearchTracking.objects.filter(query=term)
-        if len(query_searches) == 0:
-            SearchTracking.objects.create(
-                query=term, usages=1, results=QueryTrackingSearchHook._count_result(results), query_type='free_text'
-            )
-        else:
-            query_search = query_searches[0]
-            query_search.usages = query_search.usages + 1
-            query_search.results = QueryTrackingSearchHook._count_result(results)
-            query_search.query_type = 'free_text'
-            query_search.save()
+        search_tracking_buffer.add(term, QueryTrackingSearchHook._count_result(results))
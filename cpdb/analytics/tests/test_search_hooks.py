@@ -1,8 +1,12 @@
-from django.test import TestCase
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+
+from mock import patch
 
 from robber import expect
 
-from analytics.search_hooks import QueryTrackingSearchHook
+from analytics import search_hooks
+from analytics.search_hooks import QueryTrackingSearchHook, SearchTrackingBuffer
 from analytics.models import SearchTracking
 from analytics.factories import SearchTrackingFactory
 
@@ -21,3 +25,93 @@ class QueryTrackingSearchHookTestCase(TestCase):
         expect(search_tracking.query).to.be.eq('query')
         expect(search_tracking.usages).to.be.eq(6)
         expect(search_tracking.results).to.be.eq(4)
+
+
+class SearchTrackingBufferTestCase(TestCase):
+    @override_settings(SEARCH_TRACKING_FLUSH_INTERVAL=5)
+    @patch('analytics.search_hooks.SearchTrackingBuffer._start_flusher')
+    def test_flush_merges_buffered_usages(self, start_flusher):
+        SearchTrackingFactory(query='query', results=10, usages=5)
+        search_tracking_buffer = SearchTrackingBuffer()
+
+        search_tracking_buffer.add('query', 3)
+        search_tracking_buffer.add('query', 2)
+        search_tracking_buffer.add('new query', 1)
+
+        expect(start_flusher).to.be.called()
+        expect(SearchTracking.objects.count()).to.eq(1)
+
+        search_tracking_buffer.flush()
+
+        expect(SearchTracking.objects.count()).to.eq(2)
+        search_tracking = SearchTracking.objects.get(query='query')
+        expect(search_tracking.usages).to.eq(7)
+        expect(search_tracking.results).to.eq(2)
+        new_search_tracking = SearchTracking.objects.get(query='new query')
+        expect(new_search_tracking.usages).to.eq(1)
+        expect(new_search_tracking.query_type).to.eq('free_text')
+
+    @override_settings(SEARCH_TRACKING_FLUSH_INTERVAL=5)
+    @patch('analytics.search_hooks.atexit')
+    @patch('analytics.search_hooks.Thread')
+    def test_add_starts_flusher_once(self, thread_mock, atexit_mock):
+        search_tracking_buffer = SearchTrackingBuffer()
+
+        search_tracking_buffer.add('query', 3)
+        search_tracking_buffer.add('query', 2)
+
+        thread_mock.assert_called_once_with(
+            target=search_tracking_buffer._run_flusher, name='search-tracking-flusher', daemon=True
+        )
+        expect(thread_mock.return_value.start).to.be.called_once()
+        atexit_mock.register.assert_called_once_with(search_tracking_buffer.flush)
+        expect(SearchTracking.objects.count()).to.eq(0)
+
+    @override_settings(SEARCH_TRACKING_FLUSH_INTERVAL=5)
+    @patch('analytics.search_hooks.logger')
+    @patch('analytics.search_hooks.sleep')
+    @patch('analytics.search_hooks.SearchTrackingBuffer._start_flusher')
+    def test_flusher_keeps_usages_of_failed_flush(self, _, sleep_mock, logger_mock):
+        class StopFlusher(Exception):
+            pass
+
+        SearchTrackingFactory(query='query', results=10, usages=5)
+        search_tracking_buffer = SearchTrackingBuffer()
+        search_tracking_buffer.add('query', 3)
+        search_tracking_buffer.add('query', 2)
+
+        execute_values = search_hooks.execute_values
+        calls = []
+
+        def flaky_execute_values(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                search_tracking_buffer.add('query', 1)
+                search_tracking_buffer.add('new query', 4)
+                raise DatabaseError('connection lost')
+            execute_values(*args)
+
+        sleep_mock.side_effect = [None, None, StopFlusher()]
+        with patch('analytics.search_hooks.execute_values', side_effect=flaky_execute_values), \
+                patch.object(connection, 'close') as close_mock:
+            expect(search_tracking_buffer._run_flusher).to.throw(StopFlusher)
+
+        sleep_mock.assert_called_with(5)
+        expect(calls).to.have.length(2)
+        expect(logger_mock.exception).to.be.called_once()
+        expect(close_mock.call_count).to.eq(2)
+        search_tracking = SearchTracking.objects.get(query='query')
+        expect(search_tracking.usages).to.eq(8)
+        expect(search_tracking.results).to.eq(1)
+        expect(SearchTracking.objects.get(query='new query').usages).to.eq(1)
+        expect(SearchTracking.objects.get(query='new query').results).to.eq(4)
+
+    def test_flush_nothing(self):
+        SearchTrackingBuffer().flush()
+
+        expect(SearchTracking.objects.count()).to.eq(0)
+
+    def test_add_truncate_long_query(self):
+        SearchTrackingBuffer().add('a' * 300, 0)
+
+        expect(SearchTracking.objects.first().query).to.eq('a' * 255)
@@ -334,3 +334,5 @@ TAGGIT_CASE_INSENSITIVE = True
 GA_TRACKING_ID = env.str('GA_TRACKING_ID', '')
 CLICKY_TRACKING_ID = env.str('CLICKY_TRACKING_ID', '')
 CLICKY_SITEKEY_ADMIN = env.str('CLICKY_SITEKEY_ADMIN', '')
+
+SEARCH_TRACKING_FLUSH_INTERVAL = 5
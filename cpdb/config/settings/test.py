@@ -24,6 +24,8 @@ V1_URL = 'http://cpdb.lvh.me'
 
 ENABLE_SITEMAP = True
 
+SEARCH_TRACKING_FLUSH_INTERVAL = None
+
 
 # OVERRIDE PROTECTED KEYS from common
 MAILCHIMP_API_KEY = ''
@@ -1,12 +1,10 @@
+from collections import defaultdict
+
 from django.db import connection
-from django.db.models import OuterRef, Subquery, Count, Exists
+from django.db.models import Count, Q, F
 from django.db.models.functions import Lower
-from tqdm import tqdm
 
-from data.constants import (
-    MAJOR_AWARDS, MIN_VISUAL_TOKEN_YEAR, MAX_VISUAL_TOKEN_YEAR,
-    PERCENTILE_TRR_GROUP, PERCENTILE_ALLEGATION_INTERNAL_CIVILIAN_GROUP, PERCENTILE_ALLEGATION_GROUP
-)
+from data.constants import MAJOR_AWARDS, MIN_VISUAL_TOKEN_YEAR, MAX_VISUAL_TOKEN_YEAR, YEARLY_PERCENTILE_GROUPS
 
 from data.models import (
     Officer, OfficerAllegation, Award,
@@ -15,7 +13,8 @@ from data.models import (
 )
 from trr.models import TRR
 from data import officer_percentile
-from utils.bulk_db import build_bulk_update_sql
+from shared.utils import timeit
+from utils.bulk_db import bulk_update
 
 
 def cache_data():
@@ -24,114 +23,118 @@ def cache_data():
     build_cached_columns()
 
 
-def _allegation_count_subquery(**kwargs):
-    return Subquery(
-        OfficerAllegation.objects.filter(
-            officer_id=OuterRef('id'),
-            **kwargs
-        ).values('officer_id').annotate(
-            count=Count('allegation_id', distinct=True)
-        ).values('count')[:1]
-    )
-
-
-def _award_count_subquery(**kwargs):
-    return Subquery(
-        Award.objects.filter(
-            officer_id=OuterRef('id'),
-            **kwargs
-        ).values('officer_id').annotate(
+def _officer_allegation_columns():
+    return OfficerAllegation.objects.filter(officer_id__isnull=False).values('officer_id').annotate(
+        allegation_count=Count('allegation_id', distinct=True),
+        sustained_count=Count('allegation_id', distinct=True, filter=Q(final_finding='SU')),
+        unsustained_count=Count('allegation_id', distinct=True, filter=Q(final_finding='NS')),
+        discipline_count=Count('allegation_id', distinct=True, filter=Q(disciplined=True)),
+    ).order_by()
+
+
+def _award_columns():
+    return Award.objects.filter(officer_id__isnull=False).annotate(
+        lower_award_type=Lower('award_type')
+    ).values('officer_id').annotate(
+        honorable_mention_count=Count('id', filter=Q(award_type__contains='Honorable Mention')),
+        civilian_compliment_count=Count('id', filter=Q(award_type='Complimentary Letter')),
+        major_award_count=Count('id', filter=Q(lower_award_type__in=MAJOR_AWARDS)),
+    ).order_by()
+
+
+def _trr_columns():
+    return TRR.objects.filter(officer_id__isnull=False).values('officer_id').annotate(
+        trr_count=Count('id')
+    ).order_by()
+
+
+def _badge_columns():
+    return OfficerBadgeNumber.objects.filter(current=True).order_by(
+        'officer_id', 'id'
+    ).distinct('officer_id').values('officer_id', current_badge=F('star'))
+
+
+def _history_columns():
+    return OfficerHistory.objects.order_by(
+        'officer_id', '-end_date'
+    ).distinct('officer_id').values('officer_id', last_unit_id=F('unit_id'))
+
+
+def _salary_columns():
+    return Salary.objects.order_by(
+        'officer_id', '-year'
+    ).distinct('officer_id').values('officer_id', current_salary=F('salary'))
+
+
+# One grouped pass per source table, each yielding officer_id and the cached columns it provides
+CACHED_COLUMN_STAGES = [
+    ('officerallegation', _officer_allegation_columns),
+    ('award', _award_columns),
+    ('trr', _trr_columns),
+    ('badge', _badge_columns),
+    ('history', _history_columns),
+    ('salary', _salary_columns),
+]
+
+CACHED_COLUMN_DEFAULTS = {
+    'allegation_count': 0,
+    'sustained_count': 0,
+    'unsustained_count': 0,
+    'discipline_count': 0,
+    'honorable_mention_count': 0,
+    'civilian_compliment_count': 0,
+    'major_award_count': 0,
+    'trr_count': 0,
+    'current_badge': None,
+    'last_unit_id': None,
+    'current_salary': None,
+}
+
+
+def _duplicate_names():
+    return set(
+        Officer.objects.values_list('first_name', 'last_name').annotate(
             count=Count('id')
-        ).values('count')[:1]
+        ).filter(count__gt=1).values_list('first_name', 'last_name').order_by()
     )
 
 
 def build_cached_columns():
-    Officer.objects.update(
-        allegation_count=_allegation_count_subquery(),
-        sustained_count=_allegation_count_subquery(final_finding='SU'),
-        unsustained_count=_allegation_count_subquery(final_finding='NS'),
-        discipline_count=_allegation_count_subquery(disciplined=True),
-        honorable_mention_count=_award_count_subquery(award_type__contains='Honorable Mention'),
-        civilian_compliment_count=_award_count_subquery(award_type='Complimentary Letter'),
-        major_award_count=Subquery(
-            Award.objects.annotate(
-                lower_award_type=Lower('award_type')
-            ).filter(
-                officer_id=OuterRef('id'),
-                lower_award_type__in=MAJOR_AWARDS
-            ).values('officer_id').annotate(
-                count=Count('id')
-            ).values('count')[:1]
-        ),
-        trr_count=Subquery(
-            TRR.objects.filter(
-                officer_id=OuterRef('id'),
-            ).values('officer_id').annotate(
-                count=Count('id')
-            ).values('count')[:1]
-        ),
-        current_badge=Subquery(
-            OfficerBadgeNumber.objects.filter(
-                officer_id=OuterRef('id'),
-                current=True
-            ).values('star')[:1]
-        ),
-        last_unit=Subquery(
-            OfficerHistory.objects.filter(
-                officer_id=OuterRef('id'),
-            ).order_by('-end_date').values('unit_id')[:1]
+    officer_columns = defaultdict(dict)
+    for table_name, stage in CACHED_COLUMN_STAGES:
+        rows = timeit(lambda: list(stage()), start_message=f'Computing officer cached columns from {table_name}')
+        for row in rows:
+            officer_columns[row.pop('officer_id')].update(row)
+
+    duplicate_names = timeit(_duplicate_names, start_message='Computing officer unique names')
+
+    officers = Officer.objects.values_list('id', 'first_name', 'last_name')
+    data = [{
+        'id': officer_id,
+        **CACHED_COLUMN_DEFAULTS,
+        **officer_columns.get(officer_id, {}),
+        'has_unique_name': (first_name, last_name) not in duplicate_names,
+    } for officer_id, first_name, last_name in officers]
+
+    timeit(
+        lambda: bulk_update(
+            Officer._meta.db_table, 'id', list(CACHED_COLUMN_DEFAULTS.keys()) + ['has_unique_name'], data
         ),
-        current_salary=Subquery(
-            Salary.objects.filter(
-                officer_id=OuterRef('id'),
-            ).order_by('-year').values('salary')[:1]
-        ),
-        has_unique_name=~Exists(
-            Officer.objects.exclude(
-                id=OuterRef('id')
-            ).filter(
-                first_name=OuterRef('first_name'), last_name=OuterRef('last_name')
-            )
-        )
+        start_message='Writing officer cached columns'
     )
 
-    count_columns = [
-        'allegation_count',
-        'sustained_count',
-        'unsustained_count',
-        'discipline_count',
-        'honorable_mention_count',
-        'civilian_compliment_count',
-        'major_award_count',
-        'trr_count',
-    ]
-
-    for column in count_columns:
-        Officer.objects.filter(**{f'{column}__isnull': True}).update(**{column: 0})
-
 
 def build_cached_yearly_percentiles():
-    percentile_groups = [
-        PERCENTILE_ALLEGATION_GROUP,
-        PERCENTILE_ALLEGATION_INTERNAL_CIVILIAN_GROUP,
-        PERCENTILE_TRR_GROUP
-    ]
-
-    def _not_retired(officer):
-        return not officer.resignation_date or officer.year <= officer.resignation_date.year
-
-    results = []
-    for yr in tqdm(range(MIN_VISUAL_TOKEN_YEAR, MAX_VISUAL_TOKEN_YEAR + 1), desc='Prepare percentile data'):
-        officers = officer_percentile.top_percentile(yr, percentile_groups=percentile_groups)
-        results.extend(filter(_not_retired, officers))
+    results = officer_percentile.yearly_percentiles(
+        MIN_VISUAL_TOKEN_YEAR, MAX_VISUAL_TOKEN_YEAR, percentile_groups=YEARLY_PERCENTILE_GROUPS
+    ).rows()
 
     cursor = connection.cursor()
     cursor.execute(f'TRUNCATE TABLE {OfficerYearlyPercentile._meta.db_table}')
 
     OfficerYearlyPercentile.objects.bulk_create(
         OfficerYearlyPercentile(
-            officer=result,
+            officer_id=result.officer_id,
             year=result.year,
             percentile_trr=getattr(result, 'percentile_trr', None),
             percentile_allegation=getattr(result, 'percentile_allegation', None),
@@ -153,14 +156,14 @@ def build_cached_percentiles():
             honorable_mention_percentile=None,
         )
 
-        data = [{
+        data = ({
             'id': officer.officer_id,
             'complaint_percentile': getattr(officer, 'percentile_allegation', None),
             'civilian_allegation_percentile': getattr(officer, 'percentile_allegation_civilian', None),
             'internal_allegation_percentile': getattr(officer, 'percentile_allegation_internal', None),
             'trr_percentile': getattr(officer, 'percentile_trr', None),
             'honorable_mention_percentile': getattr(officer, 'percentile_honorable_mention', None),
-        } for officer in percentile_values]
+        } for officer in percentile_values.rows())
 
         update_fields = [
             'complaint_percentile',
@@ -170,10 +173,4 @@ def build_cached_percentiles():
             'honorable_mention_percentile'
         ]
 
-        cursor = connection.cursor()
-
-        batch_size = 100
-        for i in tqdm(range(0, len(data), batch_size)):
-            batch_data = data[i:i + batch_size]
-            update_command = build_bulk_update_sql(Officer._meta.db_table, 'id', update_fields, batch_data)
-            cursor.execute(update_command)
+        bulk_update(Officer._meta.db_table, 'id', update_fields, data)
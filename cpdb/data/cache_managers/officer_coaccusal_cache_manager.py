@@ -0,0 +1,7 @@
+from data.models import OfficerCoaccusal
+from social_graph import cache as social_graph_cache
+
+
+def cache_data():
+    OfficerCoaccusal.rebuild()
+    social_graph_cache.invalidate()
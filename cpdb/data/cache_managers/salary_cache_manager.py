@@ -1,24 +1,25 @@
-from itertools import groupby
-from operator import attrgetter
-
-from tqdm import tqdm
 from data.models import Salary
+from utils.bulk_db import bulk_update
 
 
 def cache_data():
     build_cached_rank_changes()
 
 
+def _rank_changes(salaries):
+    last_officer_rank = None
+    for salary_id, officer_id, rank in salaries:
+        yield {'id': salary_id, 'rank_changed': (officer_id, rank) != last_officer_rank}
+        last_officer_rank = (officer_id, rank)
+
+
 def build_cached_rank_changes():
     salaries = Salary.objects.exclude(spp_date__isnull=True).order_by('officer_id', 'year')
-    rank_change_ids = [
-        list(grouped_salaries)[0].id
-        for _, grouped_salaries in groupby(salaries, key=attrgetter('officer_id', 'rank'))
-    ]
-
-    Salary.objects.update(rank_changed=False)
 
-    batch_size = 100
-    for i in tqdm(range(0, len(rank_change_ids), batch_size)):
-        batch_ids = rank_change_ids[i:i + batch_size]
-        Salary.objects.filter(id__in=batch_ids).update(rank_changed=True)
+    Salary.objects.filter(spp_date__isnull=True).update(rank_changed=False)
+    bulk_update(
+        Salary._meta.db_table,
+        'id',
+        ['rank_changed'],
+        _rank_changes(list(salaries.values_list('id', 'officer_id', 'rank')))
+    )
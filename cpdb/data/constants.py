@@ -133,6 +133,11 @@ PERCENTILE_GROUPS = [
     PERCENTILE_TRR_GROUP,
     PERCENTILE_HONORABLE_MENTION_GROUP
 ]
+YEARLY_PERCENTILE_GROUPS = [
+    PERCENTILE_ALLEGATION_GROUP,
+    PERCENTILE_ALLEGATION_INTERNAL_CIVILIAN_GROUP,
+    PERCENTILE_TRR_GROUP
+]
 
 MAJOR_AWARDS = [
     'honored police star',
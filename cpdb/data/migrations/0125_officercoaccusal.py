@@ -0,0 +1,35 @@
+# Generated by Django 2.2.10 on 2020-06-15 09:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0124_attachmentnarrative'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfficerCoaccusal',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('coaccusal_count', models.IntegerField(default=0)),
+                ('civilian_coaccusal_count', models.IntegerField(default=0)),
+                ('officer_complaint_coaccusal_count', models.IntegerField(default=0)),
+                ('first_incident_date', models.DateTimeField(null=True)),
+                ('last_incident_date', models.DateTimeField(null=True)),
+                ('officer_1', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='coaccusal_edges', to='data.Officer')),
+                ('officer_2', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='coaccused_edges', to='data.Officer')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='officercoaccusal',
+            index=models.Index(fields=['officer_1', '-coaccusal_count'], name='data_office_officer_7d61ad_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='officercoaccusal',
+            unique_together={('officer_1', 'officer_2')},
+        ),
+    ]
@@ -0,0 +1,115 @@
+from django.db import migrations
+
+
+def _coaccusal_edges_sql(condition):
+    return f'''
+        INSERT INTO data_officercoaccusal (
+            officer_1_id, officer_2_id, coaccusal_count, civilian_coaccusal_count, officer_complaint_coaccusal_count,
+            first_incident_date, last_incident_date
+        )
+        SELECT
+            A.officer_id,
+            B.officer_id,
+            COUNT(DISTINCT A.allegation_id),
+            COUNT(DISTINCT A.allegation_id) FILTER (WHERE data_allegation.is_officer_complaint IS FALSE),
+            COUNT(DISTINCT A.allegation_id) FILTER (WHERE data_allegation.is_officer_complaint IS TRUE),
+            MIN(data_allegation.incident_date),
+            MAX(data_allegation.incident_date)
+        FROM data_officerallegation AS A
+        INNER JOIN data_officerallegation AS B ON A.allegation_id = B.allegation_id AND A.officer_id <> B.officer_id
+        INNER JOIN data_allegation ON data_allegation.crid = A.allegation_id
+        {condition}
+        GROUP BY A.officer_id, B.officer_id;
+    '''
+
+
+ALLEGATION_OFFICER_IDS_SQL = '''
+    ARRAY(
+        SELECT officer_id FROM data_officerallegation
+        WHERE allegation_id = {row}.{column} AND officer_id IS NOT NULL
+    )
+'''
+
+REFRESH_FUNCTION_SQL = f'''
+    CREATE OR REPLACE FUNCTION refresh_officer_coaccusals(officer_ids integer[]) RETURNS void AS $$
+    BEGIN
+        IF officer_ids IS NULL THEN
+            DELETE FROM data_officercoaccusal;
+            {_coaccusal_edges_sql('')}
+        ELSE
+            DELETE FROM data_officercoaccusal
+            WHERE officer_1_id = ANY(officer_ids) AND officer_2_id = ANY(officer_ids);
+            {_coaccusal_edges_sql('WHERE A.officer_id = ANY(officer_ids) AND B.officer_id = ANY(officer_ids)')}
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql;
+'''
+
+TRIGGERS_SQL = f'''
+    CREATE OR REPLACE FUNCTION data_officerallegation_refresh_coaccusals() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM refresh_officer_coaccusals(
+                array_append({ALLEGATION_OFFICER_IDS_SQL.format(row='OLD', column='allegation_id')}, OLD.officer_id)
+            );
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM refresh_officer_coaccusals({ALLEGATION_OFFICER_IDS_SQL.format(row='NEW', column='allegation_id')});
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION data_allegation_refresh_coaccusals() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_officer_coaccusals({ALLEGATION_OFFICER_IDS_SQL.format(row='NEW', column='crid')});
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER data_officerallegation_refresh_coaccusals_insert_delete
+    AFTER INSERT OR DELETE ON data_officerallegation
+    FOR EACH ROW EXECUTE PROCEDURE data_officerallegation_refresh_coaccusals();
+
+    CREATE TRIGGER data_officerallegation_refresh_coaccusals_update
+    AFTER UPDATE ON data_officerallegation
+    FOR EACH ROW WHEN ((OLD.officer_id, OLD.allegation_id) IS DISTINCT FROM (NEW.officer_id, NEW.allegation_id))
+    EXECUTE PROCEDURE data_officerallegation_refresh_coaccusals();
+
+    CREATE TRIGGER data_allegation_refresh_coaccusals_update
+    AFTER UPDATE ON data_allegation
+    FOR EACH ROW WHEN (
+        (OLD.incident_date, OLD.is_officer_complaint) IS DISTINCT FROM (NEW.incident_date, NEW.is_officer_complaint)
+    )
+    EXECUTE PROCEDURE data_allegation_refresh_coaccusals();
+'''
+
+CREATE_FUNCTIONS_SQL = f'''
+    {REFRESH_FUNCTION_SQL}
+    {TRIGGERS_SQL}
+    SELECT refresh_officer_coaccusals(NULL);
+'''
+
+DROP_TRIGGERS_SQL = '''
+    DROP TRIGGER IF EXISTS data_allegation_refresh_coaccusals_update ON data_allegation;
+    DROP TRIGGER IF EXISTS data_officerallegation_refresh_coaccusals_update ON data_officerallegation;
+    DROP TRIGGER IF EXISTS data_officerallegation_refresh_coaccusals_insert_delete ON data_officerallegation;
+    DROP FUNCTION IF EXISTS data_allegation_refresh_coaccusals();
+    DROP FUNCTION IF EXISTS data_officerallegation_refresh_coaccusals();
+'''
+
+DROP_FUNCTIONS_SQL = f'''
+    {DROP_TRIGGERS_SQL}
+    DROP FUNCTION IF EXISTS refresh_officer_coaccusals(integer[]);
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0125_officercoaccusal'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=CREATE_FUNCTIONS_SQL, reverse_sql=DROP_FUNCTIONS_SQL),
+    ]
@@ -0,0 +1,104 @@
+from importlib import import_module
+
+from django.db import migrations, models
+
+coaccusal_triggers = import_module('data.migrations.0126_officer_coaccusal_triggers')
+
+
+def _queue_change_sql(row, officer_id_column, crid_column):
+    officer_id = f'{row}.{officer_id_column}' if officer_id_column else 'NULL'
+    return (
+        'INSERT INTO data_officercoaccusalchange (officer_id, crid, created_at) '
+        f'VALUES ({officer_id}, {row}.{crid_column}, now());'
+    )
+
+
+# Concurrent refreshes of overlapping officers would both delete then insert the same edges, so they are serialized.
+# Plain reads of the edges are not blocked.
+REFRESH_FUNCTION_SQL = f'''
+    CREATE OR REPLACE FUNCTION refresh_officer_coaccusals(officer_ids integer[]) RETURNS void AS $$
+    BEGIN
+        LOCK TABLE data_officercoaccusal IN EXCLUSIVE MODE;
+        IF officer_ids IS NULL THEN
+            DELETE FROM data_officercoaccusal;
+            {coaccusal_triggers._coaccusal_edges_sql('')}
+        ELSE
+            DELETE FROM data_officercoaccusal
+            WHERE officer_1_id = ANY(officer_ids) AND officer_2_id = ANY(officer_ids);
+            {coaccusal_triggers._coaccusal_edges_sql(
+                'WHERE A.officer_id = ANY(officer_ids) AND B.officer_id = ANY(officer_ids)'
+            )}
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql;
+'''
+
+# Triggers only queue the changed officers and allegations, the edges are refreshed once per batch of changes
+# by OfficerCoaccusal.refresh_changed
+TRIGGERS_SQL = f'''
+    CREATE OR REPLACE FUNCTION data_officerallegation_queue_coaccusal_change() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            {_queue_change_sql('OLD', 'officer_id', 'allegation_id')}
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            {_queue_change_sql('NEW', 'officer_id', 'allegation_id')}
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION data_allegation_queue_coaccusal_change() RETURNS trigger AS $$
+    BEGIN
+        {_queue_change_sql('NEW', None, 'crid')}
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER data_officerallegation_queue_coaccusal_change_insert_delete
+    AFTER INSERT OR DELETE ON data_officerallegation
+    FOR EACH ROW EXECUTE PROCEDURE data_officerallegation_queue_coaccusal_change();
+
+    CREATE TRIGGER data_officerallegation_queue_coaccusal_change_update
+    AFTER UPDATE ON data_officerallegation
+    FOR EACH ROW WHEN ((OLD.officer_id, OLD.allegation_id) IS DISTINCT FROM (NEW.officer_id, NEW.allegation_id))
+    EXECUTE PROCEDURE data_officerallegation_queue_coaccusal_change();
+
+    CREATE TRIGGER data_allegation_queue_coaccusal_change_update
+    AFTER UPDATE ON data_allegation
+    FOR EACH ROW WHEN (
+        (OLD.incident_date, OLD.is_officer_complaint) IS DISTINCT FROM (NEW.incident_date, NEW.is_officer_complaint)
+    )
+    EXECUTE PROCEDURE data_allegation_queue_coaccusal_change();
+'''
+
+DROP_TRIGGERS_SQL = '''
+    DROP TRIGGER IF EXISTS data_allegation_queue_coaccusal_change_update ON data_allegation;
+    DROP TRIGGER IF EXISTS data_officerallegation_queue_coaccusal_change_update ON data_officerallegation;
+    DROP TRIGGER IF EXISTS data_officerallegation_queue_coaccusal_change_insert_delete ON data_officerallegation;
+    DROP FUNCTION IF EXISTS data_allegation_queue_coaccusal_change();
+    DROP FUNCTION IF EXISTS data_officerallegation_queue_coaccusal_change();
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0126_officer_coaccusal_triggers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfficerCoaccusalChange',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('officer_id', models.IntegerField(null=True)),
+                ('crid', models.CharField(max_length=30, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RunSQL(
+            sql=coaccusal_triggers.DROP_TRIGGERS_SQL + REFRESH_FUNCTION_SQL + TRIGGERS_SQL,
+            reverse_sql=DROP_TRIGGERS_SQL + coaccusal_triggers.REFRESH_FUNCTION_SQL + coaccusal_triggers.TRIGGERS_SQL
+        ),
+    ]
@@ -0,0 +1,94 @@
+from importlib import import_module
+
+from django.db import migrations, models
+
+coaccusal_triggers = import_module('data.migrations.0126_officer_coaccusal_triggers')
+coaccusal_change_outbox = import_module('data.migrations.0127_officer_coaccusal_change_outbox')
+
+# Every refresh bumps the edges version, so that results computed from the edges can be cached per version
+REFRESH_FUNCTION_SQL = f'''
+    CREATE OR REPLACE FUNCTION refresh_officer_coaccusals(officer_ids integer[]) RETURNS void AS $$
+    BEGIN
+        LOCK TABLE data_officercoaccusal IN EXCLUSIVE MODE;
+        IF officer_ids IS NULL THEN
+            DELETE FROM data_officercoaccusal;
+            {coaccusal_triggers._coaccusal_edges_sql('')}
+        ELSE
+            DELETE FROM data_officercoaccusal
+            WHERE officer_1_id = ANY(officer_ids) AND officer_2_id = ANY(officer_ids);
+            {coaccusal_triggers._coaccusal_edges_sql(
+                'WHERE A.officer_id = ANY(officer_ids) AND B.officer_id = ANY(officer_ids)'
+            )}
+        END IF;
+        INSERT INTO data_officercoaccusalversion (id, version) VALUES (1, 1)
+        ON CONFLICT (id) DO UPDATE SET version = data_officercoaccusalversion.version + 1;
+    END;
+    $$ LANGUAGE plpgsql;
+'''
+
+# The row triggers queue changes, these statement triggers then refresh the edges of all changes queued by the
+# statement at once: a bulk insert of officer allegations costs a single refresh, and the edges are current as soon
+# as the statement returns. Changes queued by other transactions are not visible yet and are left to them.
+STATEMENT_TRIGGERS_SQL = '''
+    CREATE OR REPLACE FUNCTION refresh_queued_officer_coaccusals() RETURNS trigger AS $$
+    DECLARE
+        officer_ids integer[];
+    BEGIN
+        WITH changes AS (
+            DELETE FROM data_officercoaccusalchange RETURNING officer_id, crid
+        )
+        SELECT array_agg(DISTINCT changed.officer_id) INTO officer_ids
+        FROM (
+            SELECT officer_id FROM changes WHERE officer_id IS NOT NULL
+            UNION
+            SELECT OA.officer_id
+            FROM data_officerallegation AS OA
+            INNER JOIN changes ON changes.crid = OA.allegation_id
+            WHERE OA.officer_id IS NOT NULL
+        ) AS changed;
+
+        IF officer_ids IS NOT NULL THEN
+            PERFORM refresh_officer_coaccusals(officer_ids);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER data_officerallegation_refresh_queued_coaccusals
+    AFTER INSERT OR UPDATE OR DELETE ON data_officerallegation
+    FOR EACH STATEMENT EXECUTE PROCEDURE refresh_queued_officer_coaccusals();
+
+    CREATE TRIGGER data_allegation_refresh_queued_coaccusals
+    AFTER UPDATE ON data_allegation
+    FOR EACH STATEMENT EXECUTE PROCEDURE refresh_queued_officer_coaccusals();
+'''
+
+DROP_STATEMENT_TRIGGERS_SQL = '''
+    DROP TRIGGER IF EXISTS data_allegation_refresh_queued_coaccusals ON data_allegation;
+    DROP TRIGGER IF EXISTS data_officerallegation_refresh_queued_coaccusals ON data_officerallegation;
+    DROP FUNCTION IF EXISTS refresh_queued_officer_coaccusals();
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0127_officer_coaccusal_change_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfficerCoaccusalVersion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunSQL(
+            sql=REFRESH_FUNCTION_SQL + STATEMENT_TRIGGERS_SQL + '''
+                DELETE FROM data_officercoaccusalchange;
+                SELECT refresh_officer_coaccusals(NULL);
+            ''',
+            reverse_sql=DROP_STATEMENT_TRIGGERS_SQL + coaccusal_change_outbox.REFRESH_FUNCTION_SQL
+        ),
+    ]
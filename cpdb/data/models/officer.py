@@ -6,7 +6,7 @@ import botocore
 from django.apps import apps
 from django.conf import settings
 from django.contrib.gis.db import models
-from django.db.models import Q, Count
+from django.db.models import Q, F
 from django.db.models.functions import ExtractYear
 from django.utils import timezone
 from django.utils.text import slugify
@@ -254,8 +254,8 @@ class Officer(TimeStampsModel, TaggableModel):
     @property
     def coaccusals(self):
         return Officer.objects.filter(
-            officerallegation__allegation__officerallegation__officer=self
-        ).distinct().exclude(id=self.id).annotate(coaccusal_count=Count('id')).order_by('-coaccusal_count')
+            coaccused_edges__officer_1=self
+        ).annotate(coaccusal_count=F('coaccused_edges__coaccusal_count')).order_by('-coaccusal_count')
 
     @property
     def rank_histories(self):
@@ -338,6 +338,13 @@ class Officer(TimeStampsModel, TaggableModel):
         else:
             return True
 
+    def invalidate_zip_files(self):
+        for with_docs in [True, False]:
+            aws.s3.delete_object(
+                Bucket=settings.S3_BUCKET_OFFICER_CONTENT,
+                Key=self.get_zip_filename(with_docs)
+            )
+
     def invoke_create_zip(self, with_docs):
         if not self.check_zip_file_exist(with_docs):
             zip_key = self.get_zip_filename(with_docs=with_docs)
@@ -0,0 +1,96 @@
+from django.contrib.gis.db import models
+from django.db import connection
+from django.db.models import Max
+
+from social_graph import cache as social_graph_cache
+from .officer_allegation import OfficerAllegation
+
+
+class OfficerCoaccusalChange(models.Model):
+    """
+    Outbox row queued by database triggers whenever an officer allegation is written or an allegation's
+    incident date or officer complaint flag changes, see migration 0127_officer_coaccusal_change_outbox.
+    Statement triggers drain the rows queued by each statement, see migration
+    0128_refresh_officer_coaccusals_per_statement. Rows left over while those triggers are disabled are drained by
+    OfficerCoaccusal.refresh_changed.
+    """
+    officer_id = models.IntegerField(null=True)
+    crid = models.CharField(max_length=30, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class OfficerCoaccusal(models.Model):
+    """
+    Coaccusal edge between 2 officers, stored in both directions so that coaccusals of an officer are
+    an indexed lookup on officer_1. Changes are queued as OfficerCoaccusalChange rows and applied once at the end
+    of the statement which queued them, the whole table is rebuilt by the officer coaccusal cache manager.
+
+    Edges only count CRs per pair of officers. The pinboard relevant coaccusals count the distinct CRs an officer
+    shares with any of the pinned officers, which can't be summed from pair counts, so they are out of scope here
+    and read officer allegations directly.
+    """
+    officer_1 = models.ForeignKey('data.Officer', on_delete=models.CASCADE, related_name='coaccusal_edges')
+    officer_2 = models.ForeignKey('data.Officer', on_delete=models.CASCADE, related_name='coaccused_edges')
+    coaccusal_count = models.IntegerField(default=0)
+    civilian_coaccusal_count = models.IntegerField(default=0)
+    officer_complaint_coaccusal_count = models.IntegerField(default=0)
+    first_incident_date = models.DateTimeField(null=True)
+    last_incident_date = models.DateTimeField(null=True)
+
+    class Meta:
+        unique_together = ('officer_1', 'officer_2')
+        indexes = [
+            models.Index(fields=['officer_1', '-coaccusal_count']),
+        ]
+
+    @classmethod
+    def rebuild(cls, officer_ids=None):
+        """
+        Rebuild the coaccusal edges between the given officers with one set-based query, all edges if None
+        """
+        last_change_id = None
+        if officer_ids is None:
+            # Changes queued so far are covered by the full rebuild
+            last_change_id = OfficerCoaccusalChange.objects.aggregate(Max('id'))['id__max']
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT refresh_officer_coaccusals(%s)', [officer_ids])
+
+        if last_change_id is not None:
+            OfficerCoaccusalChange.objects.filter(id__lte=last_change_id).delete()
+
+    @classmethod
+    def refresh_changed(cls):
+        """
+        Rebuild once the edges between the officers of all queued changes: the changed officers and every
+        officer currently accused in a changed allegation. Bulk loads can disable the statement triggers and call
+        this once they are done.
+        """
+        last_change_id = OfficerCoaccusalChange.objects.aggregate(Max('id'))['id__max']
+        if last_change_id is None:
+            return
+
+        # Changes queued while refreshing have greater ids and are kept for the next run
+        changes = OfficerCoaccusalChange.objects.filter(id__lte=last_change_id)
+        officer_ids = set(
+            changes.exclude(officer_id__isnull=True).values_list('officer_id', flat=True)
+        ) | set(
+            OfficerAllegation.objects.filter(
+                allegation_id__in=changes.exclude(crid__isnull=True).values('crid'), officer_id__isnull=False
+            ).values_list('officer_id', flat=True)
+        )
+        if officer_ids:
+            cls.rebuild(officer_ids=sorted(officer_ids))
+            social_graph_cache.invalidate()
+        changes.delete()
+
+
+class OfficerCoaccusalVersion(models.Model):
+    """
+    Single row counter bumped by every refresh of the coaccusal edges, in the same transaction as the refresh
+    """
+    version = models.BigIntegerField(default=0)
+
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(id=1).values_list('version', flat=True).first() or 0
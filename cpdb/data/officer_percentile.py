@@ -1,10 +1,12 @@
 from datetime import datetime
 
 from django.contrib.gis.db import models
+from django.db import connection
 from django.db.models import F, Q, IntegerField, Func
-from django.utils.timezone import now, timedelta
+from django.utils.timezone import now, timedelta, localtime, get_current_timezone_name
 
 from tqdm import tqdm
+import numpy as np
 import pytz
 
 from data.models import Officer, Award
@@ -15,53 +17,228 @@ from data.constants import (
     PERCENTILE_GROUPS, PERCENTILE_ALLEGATION_GROUP, PERCENTILE_ALLEGATION_INTERNAL_CIVILIAN_GROUP, PERCENTILE_TRR_GROUP,
     PERCENTILE_HONORABLE_MENTION_GROUP
 )
-from data.utils.percentile import percentile, merge_metric
+from data.utils.percentile import percentile_ranks, lookup, PercentileMatrix
 from data.utils.round import Round
 
 
+def get_resignation_years():
+    """
+    :return: sorted ids of resigned officers and their resignation years
+    """
+    resignations = Officer.objects.filter(
+        resignation_date__isnull=False
+    ).order_by('id').values_list('id', 'resignation_date__year')
+    resignations = np.array(list(resignations), dtype=np.int64).reshape(-1, 2)
+    return resignations[:, 0], resignations[:, 1]
+
+
+def resignation_years_of(officer_ids, resignation_years):
+    """
+    :return: resignation year of each officer, 0 if the officer has not resigned
+    """
+    resigned_ids, years = resignation_years
+    return lookup(resigned_ids, years, officer_ids, default=0)
+
+
+def percentile_columns(percentile_groups):
+    percentile_types = [
+        percentile_type
+        for percentile_group in percentile_groups
+        for percentile_type in PERCENTILE_MAP[percentile_group]['percentile_funcs'].keys()
+    ]
+    return [f'metric_{percentile_type}' for percentile_type in percentile_types] + \
+        [f'percentile_{percentile_type}' for percentile_type in percentile_types]
+
+
 def latest_year_percentile(percentile_groups=PERCENTILE_GROUPS):
     dates = [date for percentile_group in percentile_groups
              for date in PERCENTILE_MAP[percentile_group]['range']]
     min_year = min(dates).year
     max_year = max(dates).year
 
-    resignation_dates = Officer.objects.filter(
-        resignation_date__isnull=False
-    ).values_list('resignation_date', flat=True).distinct()
-
-    resignation_years = set([resignation_date.year for resignation_date in resignation_dates])
-    calculating_years = [resignation_year for resignation_year in resignation_years
-                         if min_year <= resignation_year <= max_year]
-    percentile_officers = []
+    resignation_years = get_resignation_years()
+    calculating_years = sorted(
+        resignation_year for resignation_year in set(resignation_years[1].tolist())
+        if min_year <= resignation_year <= max_year
+    )
+    percentile_matrices = []
 
     for year in tqdm(calculating_years, 'calculate yearly percentiles'):
-        yearly_percentile_officers = top_percentile(year, percentile_groups)
-        percentile_officers += [officer for officer in yearly_percentile_officers
-                                if officer.resignation_date and officer.resignation_date.year == year]
+        yearly_percentile = top_percentile(year, percentile_groups)
+        officer_resignation_years = resignation_years_of(yearly_percentile.ids, resignation_years)
+        percentile_matrices.append(yearly_percentile.filter(officer_resignation_years == year))
 
     current_year = now().year
-    current_year_percentile_officers = top_percentile(current_year, percentile_groups)
-    percentile_officers += [officer for officer in current_year_percentile_officers
-                            if not officer.resignation_date or officer.resignation_date.year == current_year]
+    current_year_percentile = top_percentile(current_year, percentile_groups)
+    officer_resignation_years = resignation_years_of(current_year_percentile.ids, resignation_years)
+    percentile_matrices.append(current_year_percentile.filter(
+        (officer_resignation_years == 0) | (officer_resignation_years == current_year)
+    ))
 
-    return percentile_officers
+    return PercentileMatrix.concatenate(percentile_matrices, percentile_columns(percentile_groups))
 
 
 def top_percentile(year=now().year, percentile_groups=PERCENTILE_GROUPS):
     """ This is calculate top percentile of top_percentile_value
-    :return: list of (officer_id, percentile_value)
+    :return: PercentileMatrix with metric_{type} and percentile_{type} columns of every officer
     # """
     if any(t not in PERCENTILE_GROUPS for t in percentile_groups):
         raise ValueError("percentile_group is invalid")
-    computed_data = []
+
+    group_metrics = []
     for percentile_group in percentile_groups:
         percentile_types = PERCENTILE_MAP[percentile_group]['percentile_funcs'].keys()
-        new_data = _compute_metric(year, percentile_group)
-        computed_data = merge_metric(computed_data, new_data, percentile_types)
-        for percentile_type in percentile_types:
-            computed_data = percentile(computed_data, percentile_type=percentile_type, decimal_places=4)
+        metric_keys = [f'metric_{percentile_type}' for percentile_type in percentile_types]
+        metrics = np.array(
+            list(_compute_metric(year, percentile_group).values_list('id', *metric_keys)),
+            dtype=np.float64
+        ).reshape(-1, len(metric_keys) + 1)
+        group_metrics.append(metrics)
+
+    officer_ids = np.unique(np.concatenate([np.empty(0)] + [metrics[:, 0] for metrics in group_metrics]))
+    officer_ids = officer_ids.astype(np.int64)
+    columns = percentile_columns(percentile_groups)
+    metric_matrix = np.full((len(officer_ids), len(columns) // 2), np.nan)
+
+    column_index = 0
+    for metrics in group_metrics:
+        num_metrics = metrics.shape[1] - 1
+        rows = np.searchsorted(officer_ids, metrics[:, 0].astype(np.int64))
+        metric_matrix[rows, column_index:column_index + num_metrics] = metrics[:, 1:]
+        column_index += num_metrics
+
+    return PercentileMatrix(
+        officer_ids,
+        np.full(len(officer_ids), year),
+        columns,
+        np.hstack([metric_matrix, percentile_ranks(metric_matrix, decimal_places=4)])
+    )
+
 
-    return computed_data
+def yearly_percentiles(min_year, max_year, percentile_groups=PERCENTILE_GROUPS):
+    """
+    Compute the metrics and percentiles of every officer for every year from min_year to max_year in one query.
+    Events are bucketed by the first year they are counted in and accumulated per officer with window
+    functions, then ranked per year, instead of running one aggregate query per year and percentile group.
+    :return: PercentileMatrix of officers who have not resigned before the year
+    """
+    if any(t not in PERCENTILE_GROUPS for t in percentile_groups):
+        raise ValueError("percentile_group is invalid")
+
+    columns = percentile_columns(percentile_groups)
+    percentile_types = [column[len('metric_'):] for column in columns[:len(columns) // 2]]
+    yearly_rows_queries = []
+    params = []
+    metric_expressions = []
+
+    for group_index, percentile_group in enumerate(percentile_groups):
+        group_percentile_types = PERCENTILE_MAP[percentile_group]['percentile_funcs'].keys()
+        metric_expressions += [
+            f'MAX(CASE WHEN group_index = {group_index} '
+            f'THEN ROUND(CAST(num_{percentile_type} / service_year AS numeric), 4) END) AS metric_{percentile_type}'
+            for percentile_type in group_percentile_types
+        ]
+
+        data_range = PERCENTILE_MAP[percentile_group]['range']
+        if not data_range:
+            continue
+        min_datetime, max_datetime = data_range
+        years, max_dates = _year_windows(min_datetime, max_datetime, min_year, max_year)
+        if not years:
+            continue
+
+        for percentile_type, events_query in PERCENTILE_MAP[percentile_group]['event_queries'].items():
+            query, query_params = events_query(min_datetime, max_datetime)
+            counts = ', '.join('1' if t == percentile_type else '0' for t in percentile_types)
+            yearly_rows_queries.append(f"""
+                SELECT events.officer_id, GREATEST(events.year::int, %s), NULL::int, NULL::numeric, {counts}
+                FROM ({query}) AS events (officer_id, year)
+                WHERE events.officer_id IS NOT NULL
+            """)
+            params += [min_year] + query_params
+
+        zero_counts = ', '.join('0' for _ in percentile_types)
+        yearly_rows_queries.append(f"""
+            SELECT
+                data_officer.id, windows.year, {group_index},
+                ROUND(CAST((service.end_date - service.start_date) / 365.0 AS numeric), 4), {zero_counts}
+            FROM data_officer
+            CROSS JOIN unnest(%s::int[], %s::date[]) AS windows (year, max_date)
+            CROSS JOIN LATERAL (
+                SELECT
+                    CASE WHEN data_officer.resignation_date < windows.max_date
+                        THEN data_officer.resignation_date ELSE windows.max_date END AS end_date,
+                    CASE WHEN data_officer.appointed_date < %s
+                        THEN %s::date ELSE data_officer.appointed_date END AS start_date
+            ) AS service
+            WHERE data_officer.appointed_date IS NOT NULL
+            AND service.end_date >= service.start_date + INTERVAL '365 days'
+        """)
+        params += [years, max_dates, min_datetime.date(), min_datetime.date()]
+
+    if not yearly_rows_queries:
+        return PercentileMatrix([], [], columns, [])
+
+    num_columns = ', '.join(f'num_{percentile_type}' for percentile_type in percentile_types)
+    cumulative_counts = ', '.join(
+        f'SUM(num_{percentile_type}) OVER officer_years AS num_{percentile_type}'
+        for percentile_type in percentile_types
+    )
+    metric_columns = ', '.join(f'metric_{percentile_type}' for percentile_type in percentile_types)
+    percentile_expressions = ', '.join(
+        f"""CASE WHEN metric_{percentile_type} IS NOT NULL THEN ROUND(CAST(
+            100.0 * (RANK() OVER (PARTITION BY year, metric_{percentile_type} IS NULL
+                ORDER BY metric_{percentile_type}) - 1)
+            / COUNT(*) OVER (PARTITION BY year, metric_{percentile_type} IS NULL) AS numeric
+        ), 4) END AS percentile_{percentile_type}"""
+        for percentile_type in percentile_types
+    )
+    union_all = ' UNION ALL '.join(yearly_rows_queries)
+
+    query = f"""
+        WITH yearly_rows (officer_id, year, group_index, service_year, {num_columns}) AS ({union_all}),
+        cumulative_rows AS (
+            SELECT officer_id, year, group_index, service_year, {cumulative_counts}
+            FROM yearly_rows
+            WINDOW officer_years AS (PARTITION BY officer_id ORDER BY year)
+        ),
+        metrics AS (
+            SELECT officer_id, year, {', '.join(metric_expressions)}
+            FROM cumulative_rows
+            WHERE group_index IS NOT NULL
+            GROUP BY officer_id, year
+        ),
+        percentiles AS (
+            SELECT officer_id, year, {metric_columns}, {percentile_expressions}
+            FROM metrics
+        )
+        SELECT percentiles.*
+        FROM percentiles
+        INNER JOIN data_officer ON data_officer.id = percentiles.officer_id
+        WHERE data_officer.resignation_date IS NULL
+        OR percentiles.year <= EXTRACT(YEAR FROM data_officer.resignation_date)
+        ORDER BY percentiles.year, percentiles.officer_id
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        rows = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, len(columns) + 2)
+
+    return PercentileMatrix(rows[:, 0].astype(np.int64), rows[:, 1].astype(np.int64), columns, rows[:, 2:])
+
+
+def _year_windows(min_datetime, max_datetime, min_year, max_year):
+    """
+    :return: the years which have at least one year of data since min_datetime and the last date counted in each
+    """
+    years = []
+    max_dates = []
+    for year in range(min_year, max_year + 1):
+        year_max_datetime = min(max_datetime, datetime(year, 12, 31, tzinfo=pytz.utc))
+        if min_datetime + timedelta(days=365) <= year_max_datetime:
+            years.append(year)
+            max_dates.append(year_max_datetime.date())
+    return years, max_dates
 
 
 def _allegation_count_query(min_datetime, max_datetime):
@@ -131,6 +308,52 @@ def _honorable_mention_count_query(_, max_datetime):
     )
 
 
+def _allegation_events_query(min_datetime, max_datetime, condition=''):
+    # an allegation is first counted in the year whose Dec 31 00:00 UTC cut-off is not before its incident date
+    return f"""
+        SELECT
+            data_officerallegation.officer_id,
+            EXTRACT(YEAR FROM (
+                data_allegation.incident_date AT TIME ZONE 'UTC') + INTERVAL '1 day' - INTERVAL '1 microsecond'
+            )
+        FROM data_officerallegation
+        INNER JOIN data_allegation ON data_allegation.crid = data_officerallegation.allegation_id
+        WHERE data_allegation.incident_date >= %s AND data_allegation.incident_date <= %s {condition}
+    """, [min_datetime, max_datetime]
+
+
+def _allegation_civilian_events_query(min_datetime, max_datetime):
+    return _allegation_events_query(min_datetime, max_datetime, 'AND data_allegation.is_officer_complaint IS FALSE')
+
+
+def _allegation_internal_events_query(min_datetime, max_datetime):
+    return _allegation_events_query(min_datetime, max_datetime, 'AND data_allegation.is_officer_complaint IS TRUE')
+
+
+def _trr_events_query(min_datetime, max_datetime):
+    # trr dates are compared in local time, where the Dec 31 00:00 UTC cut-off can fall on Dec 30
+    year_end = datetime(max_datetime.year, 12, 31, tzinfo=pytz.utc)
+    cut_off_days = (year_end.date() - localtime(year_end).date()).days
+    trr_date = '(trr_trr.trr_datetime AT TIME ZONE %s)::date'
+    return f"""
+        SELECT trr_trr.officer_id, EXTRACT(YEAR FROM {trr_date} + %s)
+        FROM trr_trr
+        WHERE {trr_date} >= %s AND {trr_date} <= %s
+    """, [
+        get_current_timezone_name(), cut_off_days,
+        get_current_timezone_name(), localtime(min_datetime).date(),
+        get_current_timezone_name(), localtime(max_datetime).date(),
+    ]
+
+
+def _honorable_mention_events_query(_, max_datetime):
+    return """
+        SELECT data_award.officer_id, EXTRACT(YEAR FROM data_award.start_date)
+        FROM data_award
+        WHERE data_award.award_type = 'Honorable Mention' AND data_award.start_date <= %s
+    """, [max_datetime.date()]
+
+
 def _to_datetime(date):
     return datetime(year=date.year, month=date.month, day=date.day, tzinfo=pytz.utc)
 
@@ -153,6 +376,9 @@ def create_percentile_map():
             'percentile_funcs': {
                 'allegation': _allegation_count_query,
             },
+            'event_queries': {
+                'allegation': _allegation_events_query,
+            },
             'range': (ALLEGATION_MIN_DATETIME, ALLEGATION_MAX_DATETIME)
         },
         PERCENTILE_ALLEGATION_INTERNAL_CIVILIAN_GROUP: {
@@ -160,18 +386,28 @@ def create_percentile_map():
                 'allegation_civilian': _allegation_civilian_count_query,
                 'allegation_internal': _allegation_internal_count_query
             },
+            'event_queries': {
+                'allegation_civilian': _allegation_civilian_events_query,
+                'allegation_internal': _allegation_internal_events_query
+            },
             'range': (INTERNAL_CIVILIAN_ALLEGATION_MIN_DATETIME, INTERNAL_CIVILIAN_ALLEGATION_MAX_DATETIME)
         },
         PERCENTILE_TRR_GROUP: {
             'percentile_funcs': {
                 'trr': _trr_count_query,
             },
+            'event_queries': {
+                'trr': _trr_events_query,
+            },
             'range': (TRR_MIN_DATETIME, TRR_MAX_DATETIME)
         },
         PERCENTILE_HONORABLE_MENTION_GROUP: {
             'percentile_funcs': {
                 'honorable_mention': _honorable_mention_count_query,
             },
+            'event_queries': {
+                'honorable_mention': _honorable_mention_events_query,
+            },
             'range': _get_award_dataset_range()
         }
     }
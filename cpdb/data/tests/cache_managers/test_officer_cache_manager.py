@@ -7,6 +7,7 @@ from django.test.testcases import TestCase
 from mock import patch, Mock
 from robber import expect
 from decimal import Decimal
+from math import nan
 
 from data.factories import (
     OfficerFactory,
@@ -18,8 +19,8 @@ from data.factories import (
     SalaryFactory
 )
 from data.cache_managers import officer_cache_manager
+from data.utils.percentile import PercentileMatrix
 from data.models import Officer, OfficerYearlyPercentile
-from shared.tests.utils import create_object
 from trr.factories import TRRFactory
 
 
@@ -198,41 +199,52 @@ class OfficerCacheManagerTestCase(TestCase):
         expect(officer_4.has_unique_name).to.be.true()
         expect(officer_5.has_unique_name).to.be.true()
 
+    def test_build_cached_columns_in_one_write(self):
+        officer = OfficerFactory(first_name='Jerome', last_name='Finnigan')
+        OfficerAllegationFactory(officer=officer, final_finding='SU')
+        AwardFactory(officer=officer, award_type='Honorable Mention')
+        TRRFactory(officer=officer)
+        OfficerBadgeNumberFactory(officer=officer, star='123', current=True)
+        unit = PoliceUnitFactory(unit_name='BDCH')
+        OfficerHistoryFactory(officer=officer, unit=unit, end_date=date(2002, 1, 1))
+        SalaryFactory(officer=officer, year=2017, salary=20000)
+
+        with patch(
+            'data.cache_managers.officer_cache_manager.bulk_update', wraps=officer_cache_manager.bulk_update
+        ) as bulk_update_mock:
+            officer_cache_manager.build_cached_columns()
+
+        expect(bulk_update_mock).to.be.called_once()
+        officer.refresh_from_db()
+        expect(officer.allegation_count).to.eq(1)
+        expect(officer.sustained_count).to.eq(1)
+        expect(officer.unsustained_count).to.eq(0)
+        expect(officer.honorable_mention_count).to.eq(1)
+        expect(officer.trr_count).to.eq(1)
+        expect(officer.current_badge).to.eq('123')
+        expect(officer.last_unit).to.eq(unit)
+        expect(officer.current_salary).to.eq(20000)
+        expect(officer.has_unique_name).to.be.true()
+
     @patch(
         'data.cache_managers.officer_cache_manager.officer_percentile.latest_year_percentile',
-        Mock(return_value=[
-            create_object({
-                'officer_id': 2,
-                'year': 2014,
-                'percentile_allegation': '66.6667',
-                'percentile_trr': '0.0000',
-                'percentile_honorable_mention': 66.6667
-            }),
-            create_object({
-                'officer_id': 1,
-                'year': 2017,
-                'percentile_allegation_civilian': '66.6667',
-                'percentile_allegation_internal': '66.6667',
-                'percentile_trr': '33.3333',
-                'percentile_honorable_mention': 33.3333,
-            }),
-            create_object({
-                'officer_id': 3,
-                'year': 2017,
-                'percentile_allegation': '0.0000',
-                'percentile_allegation_civilian': '0.0000',
-                'percentile_allegation_internal': '0.0000',
-                'percentile_honorable_mention': 0.0
-            }),
-            create_object({
-                'officer_id': 4,
-                'year': 2017,
-                'percentile_allegation': '0.0000',
-                'percentile_allegation_civilian': '0.0000',
-                'percentile_allegation_internal': '0.0000',
-                'percentile_trr': '66.6667',
-            })
-        ])
+        Mock(return_value=PercentileMatrix(
+            ids=[2, 1, 3, 4],
+            years=[2014, 2017, 2017, 2017],
+            columns=[
+                'percentile_allegation',
+                'percentile_allegation_civilian',
+                'percentile_allegation_internal',
+                'percentile_trr',
+                'percentile_honorable_mention',
+            ],
+            values=[
+                [66.6667, nan, nan, 0.0, 66.6667],
+                [nan, 66.6667, 66.6667, 33.3333, 33.3333],
+                [0.0, 0.0, 0.0, nan, 0.0],
+                [0.0, 0.0, 0.0, 66.6667, nan],
+            ]
+        ))
     )
     def test_build_cached_percentiles(self):
         OfficerFactory(id=1, appointed_date=date.today() - timedelta(days=60), resignation_date=None)
@@ -0,0 +1,26 @@
+from django.test.testcases import TestCase
+
+from mock import patch
+from robber import expect
+
+from data.cache_managers import officer_coaccusal_cache_manager
+from data.factories import OfficerFactory, AllegationFactory, OfficerAllegationFactory
+from data.models import OfficerCoaccusal
+
+
+class OfficerCoaccusalCacheManagerTestCase(TestCase):
+    @patch('data.cache_managers.officer_coaccusal_cache_manager.social_graph_cache.invalidate')
+    def test_cache_data(self, invalidate_mock):
+        officer_1 = OfficerFactory(id=1)
+        officer_2 = OfficerFactory(id=2)
+        allegation = AllegationFactory()
+        OfficerAllegationFactory(allegation=allegation, officer=officer_1)
+        OfficerAllegationFactory(allegation=allegation, officer=officer_2)
+        OfficerCoaccusal.objects.all().delete()
+
+        officer_coaccusal_cache_manager.cache_data()
+
+        expect(list(OfficerCoaccusal.objects.order_by('officer_1_id').values_list(
+            'officer_1_id', 'officer_2_id', 'coaccusal_count'
+        ))).to.eq([(1, 2, 1), (2, 1, 1)])
+        expect(invalidate_mock).to.be.called_once()
@@ -517,6 +517,23 @@ class OfficerTestCase(TestCase):
         expect(lambda: officer.check_zip_file_exist(with_docs=False)).to.throw(botocore.exceptions.ClientError)
         expect(lambda: officer.check_zip_file_exist(with_docs=True)).to.throw(Exception)
 
+    @override_settings(S3_BUCKET_ZIP_DIRECTORY='zip', S3_BUCKET_OFFICER_CONTENT='officer_content_bucket')
+    @patch('data.models.officer.aws')
+    def test_invalidate_zip_files(self, aws_mock):
+        officer = OfficerFactory(first_name='Jerome', last_name='Finnigan')
+
+        officer.invalidate_zip_files()
+
+        expect(aws_mock.s3.delete_object.call_count).to.eq(2)
+        expect(aws_mock.s3.delete_object).to.be.any_call(
+            Bucket='officer_content_bucket',
+            Key='zip/Jerome_Finnigan.zip'
+        )
+        expect(aws_mock.s3.delete_object).to.be.any_call(
+            Bucket='officer_content_bucket',
+            Key='zip_with_docs/Jerome_Finnigan_with_docs.zip'
+        )
+
     @override_settings(
         S3_BUCKET_OFFICER_CONTENT='officer_content_bucket',
         S3_BUCKET_ZIP_DIRECTORY='zip',
@@ -0,0 +1,140 @@
+from datetime import datetime
+
+from django.test.testcases import TestCase
+
+from mock import patch
+from robber import expect
+import pytz
+
+from data.factories import OfficerFactory, AllegationFactory, OfficerAllegationFactory
+from data.models import OfficerAllegation, OfficerCoaccusal, OfficerCoaccusalChange, OfficerCoaccusalVersion
+
+
+class OfficerCoaccusalTestCase(TestCase):
+    def coaccusal_edges(self):
+        return list(OfficerCoaccusal.objects.order_by('officer_1_id', 'officer_2_id').values(
+            'officer_1_id',
+            'officer_2_id',
+            'coaccusal_count',
+            'civilian_coaccusal_count',
+            'officer_complaint_coaccusal_count',
+            'first_incident_date',
+            'last_incident_date',
+        ))
+
+    def test_edges_kept_current_on_officer_allegation_insert(self):
+        officer_1 = OfficerFactory(id=1)
+        officer_2 = OfficerFactory(id=2)
+        officer_3 = OfficerFactory(id=3)
+        allegation_1 = AllegationFactory(
+            incident_date=datetime(2002, 1, 1, tzinfo=pytz.utc), is_officer_complaint=False
+        )
+        allegation_2 = AllegationFactory(
+            incident_date=datetime(2005, 1, 1, tzinfo=pytz.utc), is_officer_complaint=True
+        )
+        OfficerAllegationFactory(allegation=allegation_1, officer=officer_1)
+        OfficerAllegationFactory(allegation=allegation_1, officer=officer_2)
+        OfficerAllegationFactory(allegation=allegation_2, officer=officer_1)
+        OfficerAllegationFactory(allegation=allegation_2, officer=officer_2)
+        OfficerAllegationFactory(officer=officer_3)
+
+        edge = {
+            'coaccusal_count': 2,
+            'civilian_coaccusal_count': 1,
+            'officer_complaint_coaccusal_count': 1,
+            'first_incident_date': datetime(2002, 1, 1, tzinfo=pytz.utc),
+            'last_incident_date': datetime(2005, 1, 1, tzinfo=pytz.utc),
+        }
+        expect(self.coaccusal_edges()).to.eq([
+            dict(edge, officer_1_id=1, officer_2_id=2),
+            dict(edge, officer_1_id=2, officer_2_id=1),
+        ])
+        expect(OfficerCoaccusalChange.objects.exists()).to.be.false()
+
+    def test_edges_kept_current_on_officer_allegation_update_and_delete(self):
+        officer_1 = OfficerFactory(id=1)
+        officer_2 = OfficerFactory(id=2)
+        officer_3 = OfficerFactory(id=3)
+        allegation = AllegationFactory()
+        OfficerAllegationFactory(allegation=allegation, officer=officer_1)
+        officer_allegation = OfficerAllegationFactory(allegation=allegation, officer=officer_2)
+
+        officer_allegation.officer = officer_3
+        officer_allegation.save()
+        expect(list(OfficerCoaccusal.objects.order_by('officer_1_id').values_list(
+            'officer_1_id', 'officer_2_id'
+        ))).to.eq([(1, 3), (3, 1)])
+
+        officer_allegation.delete()
+        expect(OfficerCoaccusal.objects.exists()).to.be.false()
+
+    def test_edges_kept_current_on_allegation_update(self):
+        officer_1 = OfficerFactory(id=1)
+        officer_2 = OfficerFactory(id=2)
+        allegation = AllegationFactory(is_officer_complaint=False)
+        OfficerAllegationFactory(allegation=allegation, officer=officer_1)
+        OfficerAllegationFactory(allegation=allegation, officer=officer_2)
+
+        allegation.is_officer_complaint = True
+        allegation.save()
+
+        expect(list(OfficerCoaccusal.objects.values_list(
+            'civilian_coaccusal_count', 'officer_complaint_coaccusal_count'
+        ))).to.eq([(0, 1), (0, 1)])
+
+    def test_edges_refreshed_once_per_statement(self):
+        officers = [OfficerFactory(id=officer_id) for officer_id in range(1, 5)]
+        allegation = AllegationFactory()
+        version = OfficerCoaccusalVersion.current()
+
+        OfficerAllegation.objects.bulk_create([
+            OfficerAllegationFactory.build(allegation=allegation, officer=officer) for officer in officers
+        ])
+
+        expect(OfficerCoaccusal.objects.count()).to.eq(12)
+        expect(OfficerCoaccusalVersion.current()).to.eq(version + 1)
+
+    @patch('data.models.officer_coaccusal.social_graph_cache.invalidate')
+    def test_refresh_changed(self, invalidate_mock):
+        officer_1 = OfficerFactory(id=1)
+        officer_2 = OfficerFactory(id=2)
+        officer_3 = OfficerFactory(id=3)
+        allegation = AllegationFactory()
+        OfficerAllegationFactory(allegation=allegation, officer=officer_1)
+        OfficerAllegationFactory(allegation=allegation, officer=officer_2)
+        OfficerAllegationFactory(officer=officer_3)
+        OfficerCoaccusal.objects.all().delete()
+        OfficerCoaccusalChange.objects.create(crid=allegation.crid)
+        OfficerCoaccusalChange.objects.create(officer_id=3)
+
+        OfficerCoaccusal.refresh_changed()
+
+        expect(list(OfficerCoaccusal.objects.order_by('officer_1_id').values_list(
+            'officer_1_id', 'officer_2_id'
+        ))).to.eq([(1, 2), (2, 1)])
+        expect(OfficerCoaccusalChange.objects.exists()).to.be.false()
+        expect(invalidate_mock).to.be.called_once()
+
+    @patch('data.models.officer_coaccusal.social_graph_cache.invalidate')
+    def test_refresh_changed_without_changes(self, invalidate_mock):
+        with self.assertNumQueries(1):
+            OfficerCoaccusal.refresh_changed()
+        expect(invalidate_mock).not_to.be.called()
+
+    def test_rebuild(self):
+        officer_1 = OfficerFactory(id=1)
+        officer_2 = OfficerFactory(id=2)
+        officer_3 = OfficerFactory(id=3)
+        allegation = AllegationFactory()
+        OfficerAllegationFactory(allegation=allegation, officer=officer_1)
+        OfficerAllegationFactory(allegation=allegation, officer=officer_2)
+        OfficerAllegationFactory(allegation=allegation, officer=officer_3)
+        OfficerCoaccusal.objects.all().delete()
+
+        OfficerCoaccusal.rebuild(officer_ids=[1, 2])
+        expect(list(OfficerCoaccusal.objects.order_by('officer_1_id').values_list(
+            'officer_1_id', 'officer_2_id'
+        ))).to.eq([(1, 2), (2, 1)])
+
+        OfficerCoaccusal.rebuild()
+        expect(OfficerCoaccusal.objects.count()).to.eq(6)
@@ -381,7 +381,7 @@ class OfficerPercentileTestCase(TestCase):
         }
 
         officers = officer_percentile.top_percentile(2016)
-        for officer in officers:
+        for officer in officers.rows():
             validate_object(officer, expected_dict[officer.id])
 
     @mock_percentile_map_range(
@@ -521,7 +521,7 @@ class OfficerPercentileTestCase(TestCase):
             PERCENTILE_TRR_GROUP
         ]
         officers = officer_percentile.top_percentile(2016, percentile_groups=visual_token_percentile_groups)
-        for officer in officers:
+        for officer in officers.rows():
             validate_object(officer, expected_dict[officer.id])
 
     @mock_percentile_map_range(
@@ -661,7 +661,7 @@ class OfficerPercentileTestCase(TestCase):
         }
 
         officers = officer_percentile.top_percentile(2016)
-        for officer in officers:
+        for officer in officers.rows():
             validate_object(officer, expected_dict[officer.id])
 
     def test_top_percentile_type_not_found(self):
@@ -804,7 +804,7 @@ class OfficerPercentileTestCase(TestCase):
                     'percentile_honorable_mention': 0,
                 },
             }
-            for officer in annotated_officers:
+            for officer in annotated_officers.rows():
                 validate_object(officer, expected_result[officer.officer_id])
 
     @mock_percentile_map_range(
@@ -964,5 +964,69 @@ class OfficerPercentileTestCase(TestCase):
 
         officers = officer_percentile.latest_year_percentile()
         expect(officers).to.have.length(3)
-        for officer in officers:
+        for officer in officers.rows():
             validate_object(officer, expected_dict[officer.id])
+
+    @mock_percentile_map_range(
+        allegation_min=datetime(2010, 1, 1, tzinfo=pytz.utc),
+        allegation_max=datetime(2016, 7, 1, tzinfo=pytz.utc),
+        internal_civilian_min=datetime(2012, 1, 1, tzinfo=pytz.utc),
+        internal_civilian_max=datetime(2016, 7, 1, tzinfo=pytz.utc),
+        trr_min=datetime(2013, 1, 1, tzinfo=pytz.utc),
+        trr_max=datetime(2016, 4, 12, tzinfo=pytz.utc)
+    )
+    def test_yearly_percentiles(self):
+        officer1 = OfficerFactory(id=1, appointed_date=date(2005, 1, 1))
+        officer2 = OfficerFactory(id=2, appointed_date=date(2012, 6, 1))
+        officer3 = OfficerFactory(id=3, appointed_date=date(2008, 3, 1), resignation_date=date(2014, 4, 14))
+        OfficerFactory(id=4, appointed_date=date(2011, 1, 1))
+        OfficerFactory(id=5, appointed_date=None)
+
+        OfficerAllegationFactory(
+            officer=officer1,
+            allegation__incident_date=datetime(2009, 5, 1, tzinfo=pytz.utc),
+            allegation__is_officer_complaint=False
+        )
+        OfficerAllegationFactory.create_batch(
+            2,
+            officer=officer1,
+            allegation__incident_date=datetime(2012, 12, 31, tzinfo=pytz.utc),
+            allegation__is_officer_complaint=False
+        )
+        OfficerAllegationFactory(
+            officer=officer1,
+            allegation__incident_date=datetime(2013, 12, 31, 12, tzinfo=pytz.utc),
+            allegation__is_officer_complaint=True
+        )
+        OfficerAllegationFactory(
+            officer=officer2,
+            allegation__incident_date=datetime(2015, 7, 2, tzinfo=pytz.utc),
+            allegation__is_officer_complaint=True
+        )
+        OfficerAllegationFactory.create_batch(
+            3,
+            officer=officer3,
+            allegation__incident_date=datetime(2011, 3, 2, tzinfo=pytz.utc),
+            allegation__is_officer_complaint=False
+        )
+        TRRFactory(officer=officer1, trr_datetime=datetime(2014, 12, 31, 3, tzinfo=pytz.utc))
+        TRRFactory.create_batch(2, officer=officer2, trr_datetime=datetime(2015, 2, 1, tzinfo=pytz.utc))
+        TRRFactory(officer=officer3, trr_datetime=datetime(2013, 8, 1, tzinfo=pytz.utc))
+
+        yearly_percentiles = list(officer_percentile.yearly_percentiles(2011, 2016).rows())
+
+        resignation_years = officer_percentile.get_resignation_years()
+        expected_percentiles = []
+        for year in range(2011, 2017):
+            top_percentile = officer_percentile.top_percentile(year)
+            resignation_years_of = officer_percentile.resignation_years_of(top_percentile.ids, resignation_years)
+            expected_percentiles += top_percentile.filter(
+                (resignation_years_of == 0) | (year <= resignation_years_of)
+            ).rows()
+
+        expect([vars(row) for row in yearly_percentiles]).to.eq([vars(row) for row in expected_percentiles])
+        expect({row.officer_id for row in yearly_percentiles if row.year == 2016}).to.eq({1, 2, 4})
+
+    def test_yearly_percentiles_type_not_found(self):
+        with self.assertRaisesRegex(ValueError, 'group is invalid'):
+            officer_percentile.yearly_percentiles(2015, 2016, percentile_groups=['not_exist'])
@@ -1,9 +1,9 @@
 from django.test import SimpleTestCase
 
 from robber import expect
-from mock import Mock
+import numpy as np
 
-from data.utils.percentile import percentile, merge_metric
+from data.utils.percentile import percentile, percentile_ranks, lookup, PercentileMatrix
 from shared.tests.utils import create_object, validate_object
 
 
@@ -67,51 +67,92 @@ class PercentileTestCase(SimpleTestCase):
         expect(hasattr(object2, 'percentile_custom_value')).to.be.false()
         expect(hasattr(object3, 'percentile_custom_value')).to.be.false()
 
-    def test_merge_percentile(self):
-        objects = [
-            create_object({'id': 1, 'value_a': 0.1, 'metric_value_a': 0.1}),
-            create_object({'id': 2, 'value_a': 0.2, 'metric_value_a': 0.1}),
-            create_object({'id': 3, 'value_a': 0.4, 'metric_value_a': 0.3}),
-        ]
-
-        new_metric_query_set = Mock(
-            exclude=Mock(return_value=[
-                create_object({'id': 4, 'value_b': 0.3, 'value_c': 0.4, 'metric_value_b': 0.3, 'metric_value_c': 0.4}),
-            ]),
-            filter=Mock(
-                return_value=Mock(
-                    in_bulk=Mock(return_value={
-                        2: create_object({'id': 2, 'metric_value_b': 0.3, 'metric_value_c': 0.4}),
-                        3: create_object({'id': 3, 'metric_value_b': 0.6, 'metric_value_c': 0.8}),
-                    })
-                )
-            )
+
+class PercentileRanksTestCase(SimpleTestCase):
+    def test_percentile_ranks(self):
+        ranks = percentile_ranks([
+            [0.2, 0.1],
+            [0.5, 0.1],
+            [0.4, 0.3],
+            [0.1, 0.4],
+        ])
+
+        expect(ranks.dtype).to.eq(np.float32)
+        expect(ranks.tolist()).to.eq([
+            [25.0, 0.0],
+            [75.0, 0.0],
+            [50.0, 50.0],
+            [0.0, 75.0],
+        ])
+
+    def test_percentile_ranks_with_missing_value(self):
+        ranks = percentile_ranks([
+            [0.1, np.nan],
+            [0.2, 0.2],
+            [np.nan, 0.1],
+        ], decimal_places=4)
+
+        expect(ranks[:, 0].tolist()[:2]).to.eq([0.0, 50.0])
+        expect(bool(np.isnan(ranks[2, 0]))).to.be.true()
+        expect(bool(np.isnan(ranks[0, 1]))).to.be.true()
+        expect(ranks[1:, 1].tolist()).to.eq([50.0, 0.0])
+
+    def test_percentile_ranks_round(self):
+        ranks = percentile_ranks([[1], [2], [3]], decimal_places=4)
+        expect([round(rank, 4) for rank in ranks[:, 0].tolist()]).to.eq([0.0, 33.3333, 66.6667])
+
+    def test_lookup(self):
+        result = lookup(np.array([1, 3, 5]), np.array([10, 30, 50]), np.array([5, 2, 1, 6]), default=0)
+        expect(result.tolist()).to.eq([50, 0, 10, 0])
+
+    def test_lookup_with_empty_keys(self):
+        result = lookup(np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([1, 2]), default=0)
+        expect(result.tolist()).to.eq([0, 0])
+
+
+class PercentileMatrixTestCase(SimpleTestCase):
+    def setUp(self):
+        self.matrix = PercentileMatrix(
+            ids=[1, 2, 3],
+            years=[2016, 2016, 2016],
+            columns=['metric_trr', 'percentile_trr'],
+            values=[[1.5, 0.0], [np.nan, np.nan], [2.25, 50.0]]
         )
 
-        results = merge_metric(objects, new_metric_query_set, ['value_b', 'value_c'])
-        validate_object(results[0], {
-            'id': 1,
-            'value_a': 0.1,
-            'metric_value_a': 0.1,
-        })
-        validate_object(results[1], {
-            'id': 2,
-            'value_a': 0.2,
-            'metric_value_a': 0.1,
-            'metric_value_b': 0.3,
-            'metric_value_c': 0.4
-        })
-        validate_object(results[2], {
-            'id': 3,
-            'value_a': 0.4,
-            'metric_value_a': 0.3,
-            'metric_value_b': 0.6,
-            'metric_value_c': 0.8
+    def test_len(self):
+        expect(len(self.matrix)).to.eq(3)
+        expect(len(PercentileMatrix([], [], ['metric_trr'], []))).to.eq(0)
+
+    def test_column(self):
+        expect(self.matrix.column('metric_trr')[[0, 2]].tolist()).to.eq([1.5, 2.25])
+        expect(bool(np.isnan(self.matrix.column('percentile_allegation')).all())).to.be.true()
+
+    def test_filter(self):
+        filtered_matrix = self.matrix.filter(np.array([True, False, True]))
+        expect(filtered_matrix.ids.tolist()).to.eq([1, 3])
+        expect(filtered_matrix.values.tolist()).to.eq([[1.5, 0.0], [2.25, 50.0]])
+
+    def test_concatenate(self):
+        other_matrix = PercentileMatrix([4], [2017], ['metric_trr', 'percentile_trr'], [[1.0, 100.0]])
+        matrix = PercentileMatrix.concatenate([self.matrix, other_matrix], ['metric_trr', 'percentile_trr'])
+
+        expect(matrix.ids.tolist()).to.eq([1, 2, 3, 4])
+        expect(matrix.years.tolist()).to.eq([2016, 2016, 2016, 2017])
+
+    def test_concatenate_empty(self):
+        matrix = PercentileMatrix.concatenate([], ['metric_trr'])
+        expect(len(matrix)).to.eq(0)
+        expect(matrix.columns).to.eq(['metric_trr'])
+
+    def test_rows(self):
+        rows = list(self.matrix.rows())
+
+        expect(rows).to.have.length(3)
+        validate_object(rows[0], {
+            'id': 1, 'officer_id': 1, 'year': 2016, 'metric_trr': 1.5, 'percentile_trr': 0.0
         })
-        validate_object(results[3], {
-            'id': 4,
-            'value_b': 0.3,
-            'value_c': 0.4,
-            'metric_value_b': 0.3,
-            'metric_value_c': 0.4
+        expect(hasattr(rows[1], 'metric_trr')).to.be.false()
+        expect(hasattr(rows[1], 'percentile_trr')).to.be.false()
+        validate_object(rows[2], {
+            'id': 3, 'officer_id': 3, 'year': 2016, 'metric_trr': 2.25, 'percentile_trr': 50.0
         })
@@ -1,3 +1,8 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+
 def percentile(objects, percentile_type='', key=None, percentile_rank=0.0, decimal_places=0):
     """
     :param objects: list of objects which have metric_{key} attribute
@@ -31,19 +36,88 @@ def percentile(objects, percentile_type='', key=None, percentile_rank=0.0, decim
     return objects
 
 
-def merge_metric(objects, new_metric_query_set, percentile_types):
-    attr_names = [f'metric_{percentile_type}' for percentile_type in percentile_types]
+def percentile_ranks(values, decimal_places=0):
+    """
+    Vectorized, tie-aware version of `percentile` for every column of a metric matrix
+    :param values: 2D array, one row per object and one column per metric. NaN means the object is not ranked
+    :param decimal_places: how much we will round the rank, 0 means no round
+    :return: float32 matrix of ranks with the same shape, NaN where the object is not ranked
+    """
+    values = np.asarray(values, dtype=np.float64)
+    ranks = np.full(values.shape, np.nan)
+
+    for column in range(values.shape[1]):
+        ranked = ~np.isnan(values[:, column])
+        scores = values[ranked, column]
+        if scores.size:
+            # rank of a score is the share of scores strictly smaller than it, so ties share the same rank
+            ranks[ranked, column] = 100.0 * np.searchsorted(np.sort(scores), scores, side='left') / scores.size
+
+    if decimal_places > 0:
+        ranks = np.round(ranks, decimal_places)
+    return ranks.astype(np.float32)
+
+
+def lookup(keys, values, query_keys, default):
+    """
+    Vectorized dict lookup
+    :param keys: sorted array of keys
+    :param values: array of values matching keys
+    :param query_keys: array of keys to look up
+    :param default: value for keys which are not found
+    """
+    keys = np.asarray(keys)
+    query_keys = np.asarray(query_keys)
+    result = np.full(query_keys.shape, default, dtype=np.asarray(values).dtype)
+    if not keys.size or not query_keys.size:
+        return result
+
+    indices = np.minimum(np.searchsorted(keys, query_keys), keys.size - 1)
+    found = keys[indices] == query_keys
+    result[found] = np.asarray(values)[indices[found]]
+    return result
+
+
+class PercentileMatrix(object):
+    """
+    Compact percentile result: object ids, the year each row is computed for and a float32 matrix with
+    one column per metric/percentile. NaN means the object has no value for that column.
+    """
+    def __init__(self, ids, years, columns, values):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.years = np.asarray(years, dtype=np.int32)
+        self.columns = list(columns)
+        self.values = np.asarray(values, dtype=np.float32).reshape(len(self.ids), len(self.columns))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def column(self, name):
+        if name not in self.columns:
+            return np.full(len(self.ids), np.nan, dtype=np.float32)
+        return self.values[:, self.columns.index(name)]
 
-    existing_ids = [obj.id for obj in objects]
-    new_objects = list(new_metric_query_set.exclude(id__in=existing_ids))
-    old_object_dict = new_metric_query_set.filter(id__in=existing_ids).in_bulk()
+    def filter(self, mask):
+        return PercentileMatrix(self.ids[mask], self.years[mask], self.columns, self.values[mask])
 
-    for obj in objects:
-        for attr_name in attr_names:
-            try:
-                value = getattr(old_object_dict[obj.id], attr_name)
-                setattr(obj, attr_name, value)
-            except KeyError:
-                pass
+    @classmethod
+    def concatenate(cls, matrices, columns):
+        if not matrices:
+            return cls([], [], columns, [])
+        return cls(
+            np.concatenate([matrix.ids for matrix in matrices]),
+            np.concatenate([matrix.years for matrix in matrices]),
+            columns,
+            np.concatenate([matrix.values for matrix in matrices])
+        )
 
-    return objects + new_objects
+    def rows(self, decimal_places=4):
+        """
+        Light weight row objects with `id`, `officer_id`, `year` and every column which has a value
+        """
+        for object_id, year, values in zip(self.ids.tolist(), self.years.tolist(), self.values.tolist()):
+            row = SimpleNamespace(id=object_id, officer_id=object_id, year=year)
+            for column, value in zip(self.columns, values):
+                if not np.isnan(value):
+                    setattr(row, column, round(value, decimal_places))
+            yield row
@@ -8,6 +8,7 @@ from django.core.management import BaseCommand
 from django.db.models import Prefetch
 
 from data.models import AttachmentFile, AttachmentOCR
+from utils.bulk_db import bulk_update
 
 
 BATCH_SIZE = 1000
@@ -56,14 +57,14 @@ class Command(BaseCommand):
         attachments = AttachmentFile.objects.filter(id__in=attachment_ids).prefetch_related(
             Prefetch('attachment_ocrs', queryset=AttachmentOCR.objects.order_by('page_num')))
 
-        for attachment in tqdm(attachments):
-            attachment.text_content = '\n'.join(
-                [attachment_ocr.ocr_text for attachment_ocr in attachment.attachment_ocrs.all()])
-            attachment.is_external_ocr = True
+        data = [{
+            'id': attachment.id,
+            'text_content': '\n'.join(
+                [attachment_ocr.ocr_text for attachment_ocr in attachment.attachment_ocrs.all()]),
+            'is_external_ocr': True,
+        } for attachment in tqdm(attachments)]
 
-        AttachmentFile.objects.bulk_update(
-            attachments, update_fields=['is_external_ocr', 'text_content'], batch_size=BATCH_SIZE
-        )
+        bulk_update(AttachmentFile._meta.db_table, 'id', ['is_external_ocr', 'text_content'], data)
         print(f'Updated attachment OCRs: {len(attachment_ids)}')
 
     def handle(self, *args, **options):
@@ -4,7 +4,7 @@ from django.conf import settings
 
 from . import es_client
 from .indices import Index
-from .utils import per_run_uuid, timing_validate
+from .utils import per_run_uuid, timing_validate, bump_index_version
 
 
 class IndexAlias:
@@ -47,3 +47,4 @@ class IndexAlias:
         self.read_index.delete(ignore=404)
         es_client.indices.put_alias(index=self.new_index_name, name=self.name)
         self.write_index.refresh()
+        bump_index_version()
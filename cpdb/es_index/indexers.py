@@ -1,11 +1,26 @@
 import copy
 import types
+from multiprocessing import get_context
+from time import time
 
+from django.db import connections
+from django.db.models.query import QuerySet
 from django.utils.module_loading import autodiscover_modules
-from elasticsearch.helpers import bulk
+from elasticsearch.helpers import bulk, parallel_bulk
 from tqdm import tqdm
 
 from es_index import es_client, indexer_klasses
+from es_index.utils import report_indexing_rate
+
+
+# Indexer and queryset shared with forked shard workers, set right before the pool is created
+_shard_context = None
+
+
+def _extract_shard_docs(pk_range):
+    indexer, queryset = _shard_context
+    start_pk, end_pk = pk_range
+    return list(indexer.extract_docs(queryset.filter(pk__gte=start_pk, pk__lte=end_pk)))
 
 
 class BaseIndexer(object):
@@ -13,6 +28,8 @@ class BaseIndexer(object):
     index_alias = None
     parent_doc_type_property = None
     op_type = 'index'
+    shard_size = 2000
+    doc_count = 0
 
     def get_queryset(self):
         raise NotImplementedError
@@ -55,18 +72,63 @@ class BaseIndexer(object):
             doc = self._embed_update_script(doc)
         return doc
 
-    def docs(self):
-        for datum in tqdm(
-            self.get_queryset(),
-            desc=f'Indexing {self.doc_type_klass._doc_type.name}({self.__class__.__name__})'
-        ):
+    @property
+    def indexing_description(self):
+        return f'{self.doc_type_klass._doc_type.name}({self.__class__.__name__})'
+
+    def extract_docs(self, data):
+        for datum in data:
             result = self.extract_datum(datum)
             if isinstance(result, types.GeneratorType):
                 for obj in result:
+                    self.doc_count += 1
                     yield self.doc_dict(obj)
             else:
+                self.doc_count += 1
                 yield self.doc_dict(result)
 
+    def docs(self):
+        yield from self.extract_docs(tqdm(self.get_queryset(), desc=f'Indexing {self.indexing_description}'))
+
+    def get_pk_ranges(self, queryset):
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+        for i in range(0, len(pks), self.shard_size):
+            shard_pks = pks[i:i + self.shard_size]
+            yield shard_pks[0], shard_pks[-1]
+
+    def parallel_docs(self, workers):
+        """
+        parallel_bulk consumes the returned iterator from one of its own threads, so the pool is forked here in the
+        calling thread instead, where closing the connections covers every connection the workers inherit.
+        """
+        global _shard_context
+
+        queryset = self.get_queryset()
+        if not isinstance(queryset, QuerySet):
+            return self.extract_docs(tqdm(queryset, desc=f'Indexing {self.indexing_description}'))
+
+        pk_ranges = list(self.get_pk_ranges(queryset))
+        _shard_context = (self, queryset)
+        # Forked workers must open their own database connections instead of sharing the parent's sockets
+        connections.close_all()
+        pool = get_context('fork').Pool(workers)
+        return self._pool_docs(pool, pk_ranges, workers)
+
+    def _pool_docs(self, pool, pk_ranges, workers):
+        global _shard_context
+
+        try:
+            with pool as shard_pool:
+                for shard_docs in tqdm(
+                    shard_pool.imap_unordered(_extract_shard_docs, pk_ranges),
+                    total=len(pk_ranges),
+                    desc=f'Indexing {self.indexing_description} in {workers} processes'
+                ):
+                    self.doc_count += len(shard_docs)
+                    yield from shard_docs
+        finally:
+            _shard_context = None
+
     @classmethod
     def create_mapping(cls):
         cls.index_alias.write_index.close()
@@ -76,7 +138,25 @@ class BaseIndexer(object):
     def add_new_data(self):
         self.index_alias.write_index.settings(refresh_interval='-1')
         self.index_alias.write_index.open()
+        start_time = time()
         bulk(es_client, self.docs())
+        report_indexing_rate(self.indexing_description, self.doc_count, time() - start_time)
+        self.index_alias.write_index.settings(refresh_interval='1s')
+        self.index_alias.write_index.refresh()
+
+    def add_new_data_parallel(self, workers=4, chunk_size=500, max_inflight_requests=4):
+        self.index_alias.write_index.settings(refresh_interval='-1')
+        self.index_alias.write_index.open()
+        start_time = time()
+        for _ in parallel_bulk(
+            es_client,
+            self.parallel_docs(workers),
+            thread_count=max_inflight_requests,
+            chunk_size=chunk_size,
+            queue_size=max_inflight_requests
+        ):
+            pass
+        report_indexing_rate(self.indexing_description, self.doc_count, time() - start_time)
         self.index_alias.write_index.settings(refresh_interval='1s')
         self.index_alias.write_index.refresh()
 
@@ -17,6 +17,15 @@ class Command(BaseCommand):
             dest='from_file',
             help='Read config json and choose which indexer to rebuild'
         )
+        parser.add_argument(
+            '--parallel',
+            dest='parallel',
+            action='store_true',
+            help='Extract docs in a process pool by primary key ranges and send them with parallel bulk requests'
+        )
+        parser.add_argument('--workers', dest='workers', type=int, default=4)
+        parser.add_argument('--chunk-size', dest='chunk_size', type=int, default=500)
+        parser.add_argument('--max-inflight-requests', dest='max_inflight_requests', type=int, default=4)
 
     def _get_indexer_names_from_json(self, file_name):
         with open(file_name) as f:
@@ -101,4 +110,11 @@ class Command(BaseCommand):
 
                 for indexer_klass in indexers:
                     indexer_instance = indexer_klass()
-                    indexer_instance.add_new_data()
+                    if options['parallel']:
+                        indexer_instance.add_new_data_parallel(
+                            workers=options['workers'],
+                            chunk_size=options['chunk_size'],
+                            max_inflight_requests=options['max_inflight_requests']
+                        )
+                    else:
+                        indexer_instance.add_new_data()
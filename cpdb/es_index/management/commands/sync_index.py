@@ -0,0 +1,85 @@
+from django.core.management import BaseCommand
+from django.db.models import Max
+
+from cr.indexers import CRPartialIndexer
+from data.models import OfficerAllegation, PoliceWitness, InvestigatorAllegation
+from es_index.models import IndexChange
+from officers.indexers import OfficersPartialIndexer, OfficerCoaccusalsPartialIndexer
+from tracker.indexers import AttachmentFilePartialIndexer
+from trr.indexers import TRRPartialIndexer
+from trr.models import TRR
+
+
+class Command(BaseCommand):
+    help = 'Drain captured data changes and update only the affected officer, CR, TRR and attachment docs'
+
+    def _values_set(self, queryset, field):
+        return set(queryset.exclude(**{f'{field}__isnull': True}).values_list(field, flat=True))
+
+    def get_affected_officer_ids(self, changes):
+        changed_officer_ids = changes.values('officer_id')
+        changed_crids = changes.values('crid')
+        # Officer docs embed their allegations and coaccusals, so every officer on a changed allegation
+        # and every coaccused of a changed officer is affected too
+        coaccused_crids = OfficerAllegation.objects.filter(officer_id__in=changed_officer_ids).values('allegation_id')
+        return self._values_set(changes, 'officer_id') | self._values_set(
+            OfficerAllegation.objects.filter(allegation_id__in=changed_crids), 'officer_id'
+        ) | self._values_set(
+            OfficerAllegation.objects.filter(allegation_id__in=coaccused_crids), 'officer_id'
+        )
+
+    def get_affected_crids(self, changes):
+        changed_officer_ids = changes.values('officer_id')
+        return self._values_set(changes, 'crid') | self._values_set(
+            OfficerAllegation.objects.filter(officer_id__in=changed_officer_ids), 'allegation_id'
+        ) | self._values_set(
+            PoliceWitness.objects.filter(officer_id__in=changed_officer_ids), 'allegation_id'
+        ) | self._values_set(
+            InvestigatorAllegation.objects.filter(investigator__officer_id__in=changed_officer_ids), 'allegation_id'
+        )
+
+    def get_affected_trr_ids(self, changes):
+        return self._values_set(changes, 'trr_id') | self._values_set(
+            TRR.objects.filter(officer_id__in=changes.values('officer_id')), 'id'
+        )
+
+    def get_partial_indexers(self, changes):
+        officer_ids = self.get_affected_officer_ids(changes)
+        crids = self.get_affected_crids(changes)
+        trr_ids = self.get_affected_trr_ids(changes)
+
+        indexer_keys = [
+            (OfficersPartialIndexer, officer_ids),
+            (OfficerCoaccusalsPartialIndexer, officer_ids),
+            (CRPartialIndexer, crids),
+            (TRRPartialIndexer, trr_ids),
+            # Tracker docs carry the documents count of their allegation, so all its attachments are rewritten
+            (AttachmentFilePartialIndexer, self._values_set(changes, 'crid')),
+        ]
+        return [indexer_klass(updating_keys=keys) for indexer_klass, keys in indexer_keys if keys]
+
+    def categorize_indexers_by_index_alias(self, indexers):
+        indexers_map = dict()
+        for indexer in indexers:
+            indexers_map.setdefault(indexer.index_alias, []).append(indexer)
+        return indexers_map.items()
+
+    def handle(self, *args, **options):
+        last_change_id = IndexChange.objects.aggregate(Max('id'))['id__max']
+        if last_change_id is None:
+            self.stdout.write('No changes to sync')
+            return
+
+        # Changes captured while syncing have greater ids and are kept for the next run
+        changes = IndexChange.objects.filter(id__lte=last_change_id)
+        indexers = self.get_partial_indexers(changes)
+
+        for alias, alias_indexers in self.categorize_indexers_by_index_alias(indexers):
+            with alias.indexing():
+                alias_indexers[0].create_mapping()
+                alias.migrate()
+                for indexer in alias_indexers:
+                    indexer.delete_existing_docs()
+                    indexer.add_new_data()
+
+        changes.delete()
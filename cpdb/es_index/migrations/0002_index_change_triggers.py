@@ -0,0 +1,83 @@
+from django.db import migrations
+
+
+# (table, trigger name, officer_id column, crid column, trr_id column, columns watched on update)
+# Attachment counters are updated by analytics jobs all the time, so only columns which end up in docs are watched.
+CAPTURED_TABLES = [
+    ('data_officer', 'officer', 'id', None, None, None),
+    ('data_allegation', 'allegation', None, 'crid', None, None),
+    ('data_officerallegation', 'officerallegation', 'officer_id', 'allegation_id', None, None),
+    ('trr_trr', 'trr', 'officer_id', None, 'id', None),
+    (
+        'data_attachmentfile', 'attachmentfile', None, 'allegation_id', None,
+        ['allegation_id', 'title', 'url', 'preview_image_url', 'file_type', 'show']
+    ),
+]
+
+
+def _insert_change_sql(row, officer_id_column, crid_column, trr_id_column):
+    values = [
+        f'{row}.{column}' if column else 'NULL'
+        for column in [officer_id_column, crid_column, trr_id_column]
+    ]
+    return (
+        'INSERT INTO es_index_indexchange (officer_id, crid, trr_id, created_at) '
+        f'VALUES ({", ".join(values)}, now());'
+    )
+
+
+def _update_condition_sql(watched_columns):
+    if not watched_columns:
+        return 'OLD.* IS DISTINCT FROM NEW.*'
+    old_columns = ', '.join(f'OLD.{column}' for column in watched_columns)
+    new_columns = ', '.join(f'NEW.{column}' for column in watched_columns)
+    return f'({old_columns}) IS DISTINCT FROM ({new_columns})'
+
+
+def _create_trigger_sql(table, name, officer_id_column, crid_column, trr_id_column, watched_columns):
+    columns = (officer_id_column, crid_column, trr_id_column)
+    return f'''
+        CREATE OR REPLACE FUNCTION es_index_capture_{name}_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                {_insert_change_sql('NEW', *columns)}
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                {_insert_change_sql('OLD', *columns)}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER es_index_capture_{name}_insert_delete
+        AFTER INSERT OR DELETE ON {table}
+        FOR EACH ROW EXECUTE PROCEDURE es_index_capture_{name}_change();
+
+        CREATE TRIGGER es_index_capture_{name}_update
+        AFTER UPDATE ON {table}
+        FOR EACH ROW WHEN ({_update_condition_sql(watched_columns)}) EXECUTE PROCEDURE es_index_capture_{name}_change();
+    '''
+
+
+def _drop_trigger_sql(table, name, *_):
+    return f'''
+        DROP TRIGGER IF EXISTS es_index_capture_{name}_insert_delete ON {table};
+        DROP TRIGGER IF EXISTS es_index_capture_{name}_update ON {table};
+        DROP FUNCTION IF EXISTS es_index_capture_{name}_change();
+    '''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('es_index', '0001_initial'),
+        ('data', '0124_attachmentnarrative'),
+        ('trr', '0017_add_created_at_and_updated_at_columns'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=_create_trigger_sql(*captured_table),
+            reverse_sql=_drop_trigger_sql(*captured_table)
+        ) for captured_table in CAPTURED_TABLES
+    ]
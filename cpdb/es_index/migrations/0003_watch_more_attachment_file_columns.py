@@ -0,0 +1,31 @@
+from importlib import import_module
+
+from django.db import migrations
+
+index_change_triggers = import_module('es_index.migrations.0002_index_change_triggers')
+
+# The tracker docs also render created_at, source_type and text_content. An update that moves an attachment to
+# another allegation already queues both the OLD and NEW crid.
+ATTACHMENT_FILE_COLUMNS = ('data_attachmentfile', 'attachmentfile', None, 'allegation_id', None)
+OLD_WATCHED_COLUMNS = ['allegation_id', 'title', 'url', 'preview_image_url', 'file_type', 'show']
+WATCHED_COLUMNS = OLD_WATCHED_COLUMNS + ['created_at', 'source_type', 'text_content']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('es_index', '0002_index_change_triggers'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                index_change_triggers._drop_trigger_sql(*ATTACHMENT_FILE_COLUMNS) +
+                index_change_triggers._create_trigger_sql(*ATTACHMENT_FILE_COLUMNS, WATCHED_COLUMNS)
+            ),
+            reverse_sql=(
+                index_change_triggers._drop_trigger_sql(*ATTACHMENT_FILE_COLUMNS) +
+                index_change_triggers._create_trigger_sql(*ATTACHMENT_FILE_COLUMNS, OLD_WATCHED_COLUMNS)
+            )
+        )
+    ]
@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class IndexChange(models.Model):
+    """
+    Outbox row written by database triggers whenever an officer, allegation, officer allegation, TRR or
+    attachment file changes. Rows are drained by the `sync_index` command.
+    """
+    officer_id = models.IntegerField(null=True)
+    crid = models.CharField(max_length=30, null=True)
+    trr_id = models.IntegerField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
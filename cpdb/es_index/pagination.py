@@ -1,20 +1,79 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
 from django.db.models import Case, When
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def encode_cursor(cursor):
+    return urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+
+def decode_cursor(token):
+    try:
+        cursor = json.loads(urlsafe_b64decode(token.encode()).decode())
+        return {'after': list(cursor['after']), 'offset': int(cursor['offset'])}
+    except (BinasciiError, UnicodeDecodeError, ValueError, TypeError, KeyError):
+        raise NotFound('Invalid cursor')
 
 
 class ESBasePagination(LimitOffsetPagination):
+    """
+    Shallow pages are fetched with from/size. Once the next page starts at `cursor_offset` or deeper, the
+    `next` link carries an opaque cursor instead, and that page is fetched with search_after on the query sort
+    plus _uid as a tie breaker, so deep pages cost the same as the first one and are not capped by
+    max_result_window.
+    """
+    cursor_query_param = 'cursor'
+    cursor_offset = 1000
+    tiebreaker = '_uid'
+
+    def sort_with_tiebreaker(self, query):
+        sort = query.to_dict().get('sort') or ['_score']
+        return query.sort(*sort, self.tiebreaker)
+
     def paginate_es_query(self, query, request, queryset=None, view=None):
         self.limit = self.get_limit(request)
-        self.offset = self.get_offset(request)
-        response = query[self.offset: self.offset + self.limit].execute()
-        self.count = response.hits.total
         self.request = request
         self.queryset = queryset
+        self.next_cursor = None
+
+        token = request.query_params.get(self.cursor_query_param)
+        cursor = decode_cursor(token) if token else None
+        self.offset = cursor['offset'] if cursor else self.get_offset(request)
+        use_cursor = cursor is not None or self.offset + self.limit >= self.cursor_offset
+
+        if use_cursor:
+            query = self.sort_with_tiebreaker(query)
+        if cursor:
+            response = query.extra(search_after=cursor['after'])[:self.limit].execute()
+        else:
+            response = query[self.offset: self.offset + self.limit].execute()
+        self.count = response.hits.total
 
         if self.count == 0 or self.offset > self.count:
             return []
+
+        hits = response.hits.hits
+        if use_cursor and hits and self.offset + self.limit < self.count:
+            self.next_cursor = encode_cursor({'after': hits[-1]['sort'], 'offset': self.offset + self.limit})
         return self.get_response(response)
 
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return super(ESBasePagination, self).get_next_link()
+
+        url = remove_query_param(self.request.build_absolute_uri(), self.offset_query_param)
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_previous_link(self):
+        url = super(ESBasePagination, self).get_previous_link()
+        return remove_query_param(url, self.cursor_query_param) if url else url
+
     def get_response(self, response):
         raise NotImplementedError()
 
@@ -200,3 +200,15 @@ class RebuildIndexCommandTestCase(TestCase):
             call_command('rebuild_index', '--daily')
             daily_index.create_mapping.assert_called_once()
             daily_index.add_new_data.assert_called_once()
+
+    def test_handle_called_with_parallel_option(self):
+        Indexer = self._prepare_data()
+        Indexer.add_new_data_parallel = Mock()
+
+        with patch('es_index.management.commands.rebuild_index.autodiscover_modules'):
+            call_command('rebuild_index', 'test', '--parallel', '--workers=8', '--chunk-size=1000')
+
+        Indexer.add_new_data.assert_not_called()
+        Indexer.add_new_data_parallel.assert_called_once_with(
+            workers=8, chunk_size=1000, max_inflight_requests=4
+        )
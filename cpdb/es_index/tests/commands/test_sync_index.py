@@ -0,0 +1,114 @@
+from django.core.management import call_command
+from django.test import TestCase
+
+from mock import Mock, patch
+from robber import expect
+
+from data.factories import (
+    OfficerFactory, AllegationFactory, OfficerAllegationFactory, PoliceWitnessFactory,
+    InvestigatorFactory, InvestigatorAllegationFactory
+)
+from es_index.management.commands.sync_index import Command
+from es_index.models import IndexChange
+from trr.factories import TRRFactory
+
+
+class SyncIndexCommandTestCase(TestCase):
+    def setUp(self):
+        officer_1 = OfficerFactory(id=1)
+        officer_2 = OfficerFactory(id=2)
+        officer_3 = OfficerFactory(id=3)
+        OfficerFactory(id=4)
+        allegation_1 = AllegationFactory(crid='111')
+        allegation_2 = AllegationFactory(crid='222')
+        allegation_3 = AllegationFactory(crid='333')
+        allegation_4 = AllegationFactory(crid='444')
+        OfficerAllegationFactory(officer=officer_1, allegation=allegation_1)
+        OfficerAllegationFactory(officer=officer_2, allegation=allegation_1)
+        OfficerAllegationFactory(officer=officer_3, allegation=allegation_2)
+        PoliceWitnessFactory(officer=officer_1, allegation=allegation_3)
+        InvestigatorAllegationFactory(
+            investigator=InvestigatorFactory(officer=officer_1), allegation=allegation_4
+        )
+        TRRFactory(id=10, officer=officer_1)
+        TRRFactory(id=11, officer=officer_3)
+        IndexChange.objects.all().delete()
+
+    def test_get_affected_keys_of_changed_officer(self):
+        IndexChange.objects.create(officer_id=1)
+        changes = IndexChange.objects.all()
+        command = Command()
+
+        expect(command.get_affected_officer_ids(changes)).to.eq({1, 2})
+        expect(command.get_affected_crids(changes)).to.eq({'111', '333', '444'})
+        expect(command.get_affected_trr_ids(changes)).to.eq({10})
+
+    def test_get_affected_keys_of_changed_allegation(self):
+        IndexChange.objects.create(crid='222')
+        changes = IndexChange.objects.all()
+        command = Command()
+
+        expect(command.get_affected_officer_ids(changes)).to.eq({3})
+        expect(command.get_affected_crids(changes)).to.eq({'222'})
+        expect(command.get_affected_trr_ids(changes)).to.eq(set())
+
+    def test_get_affected_keys_of_changed_trr(self):
+        IndexChange.objects.create(trr_id=11, officer_id=None)
+        changes = IndexChange.objects.all()
+        command = Command()
+
+        expect(command.get_affected_officer_ids(changes)).to.eq(set())
+        expect(command.get_affected_crids(changes)).to.eq(set())
+        expect(command.get_affected_trr_ids(changes)).to.eq({11})
+
+    def test_handle_without_changes(self):
+        with patch('es_index.management.commands.sync_index.Command.get_partial_indexers') as get_indexers_mock:
+            call_command('sync_index')
+            expect(get_indexers_mock).not_to.be.called()
+
+    def test_handle(self):
+        alias = Mock()
+        alias.indexing.return_value.__enter__ = Mock()
+        alias.indexing.return_value.__exit__ = Mock()
+        indexer_1 = Mock(index_alias=alias)
+        indexer_2 = Mock(index_alias=alias)
+        IndexChange.objects.create(officer_id=1)
+
+        with patch(
+            'es_index.management.commands.sync_index.Command.get_partial_indexers',
+            return_value=[indexer_1, indexer_2]
+        ):
+            call_command('sync_index')
+
+        alias.indexing.return_value.__enter__.assert_called_once()
+        alias.migrate.assert_called_once()
+        indexer_1.create_mapping.assert_called_once()
+        for indexer in [indexer_1, indexer_2]:
+            indexer.delete_existing_docs.assert_called_once()
+            indexer.add_new_data.assert_called_once()
+        expect(IndexChange.objects.count()).to.eq(0)
+
+    @patch('es_index.management.commands.sync_index.AttachmentFilePartialIndexer')
+    @patch('es_index.management.commands.sync_index.TRRPartialIndexer')
+    @patch('es_index.management.commands.sync_index.CRPartialIndexer')
+    @patch('es_index.management.commands.sync_index.OfficerCoaccusalsPartialIndexer')
+    @patch('es_index.management.commands.sync_index.OfficersPartialIndexer')
+    def test_get_partial_indexers(
+        self, officers_indexer_mock, coaccusals_indexer_mock, cr_indexer_mock, trr_indexer_mock,
+        attachment_indexer_mock
+    ):
+        IndexChange.objects.create(crid='222')
+
+        indexers = Command().get_partial_indexers(IndexChange.objects.all())
+
+        officers_indexer_mock.assert_called_with(updating_keys={3})
+        coaccusals_indexer_mock.assert_called_with(updating_keys={3})
+        cr_indexer_mock.assert_called_with(updating_keys={'222'})
+        trr_indexer_mock.assert_not_called()
+        attachment_indexer_mock.assert_called_with(updating_keys={'222'})
+        expect(indexers).to.eq([
+            officers_indexer_mock.return_value,
+            coaccusals_indexer_mock.return_value,
+            cr_indexer_mock.return_value,
+            attachment_indexer_mock.return_value,
+        ])
@@ -43,6 +43,13 @@ class IndexAliasTestCase(TestCase):
         expect(self.TestDocType.search().count()).to.eq(1)
         expect(self.alias.write_index.search().count()).to.eq(1)
 
+    @patch('es_index.index_aliases.bump_index_version')
+    def test_indexing_bump_index_version(self, bump_index_version_mock):
+        with self.alias.indexing():
+            expect(bump_index_version_mock).not_to.be.called()
+
+        expect(bump_index_version_mock).to.be.called_once()
+
     def test_querying(self):
         self.TestDocType(c='d').save()
         self.old_read_index.refresh()
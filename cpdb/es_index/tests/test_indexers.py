@@ -1,10 +1,11 @@
+from django.db.models.query import QuerySet
 from django.test import SimpleTestCase, TestCase
 
 from elasticsearch_dsl import DocType, Keyword, Float, Mapping
 from robber import expect
 from mock import Mock, patch
 
-from es_index.indexers import BaseIndexer, es_client, PartialIndexer
+from es_index.indexers import BaseIndexer, es_client, PartialIndexer, _extract_shard_docs
 from es_index.index_aliases import IndexAlias
 from es_index import register_indexer
 
@@ -178,6 +179,93 @@ class IndexersTestCase(SimpleTestCase):
         expect(mock_init.called).to.be.true()
         expect(mock_bulk).to.be.called_with(es_client, [1])
 
+    def test_get_pk_ranges(self):
+        class ConcreteIndexer(BaseIndexer):
+            shard_size = 2
+
+        queryset = Mock()
+        queryset.order_by.return_value.values_list.return_value = [1, 3, 4, 7, 9]
+
+        expect(list(ConcreteIndexer().get_pk_ranges(queryset))).to.eq([(1, 3), (4, 7), (9, 9)])
+        queryset.order_by.assert_called_with('pk')
+
+    def test_parallel_docs_fallback_to_serial_when_queryset_is_not_queryset(self):
+        class MyDocType(DocType):
+            pass
+
+        class ConcreteIndexer(BaseIndexer):
+            doc_type_klass = MyDocType
+            index_alias = Mock(new_index_name='new_index_name')
+
+            def get_queryset(self):
+                return [1, 2]
+
+            def extract_datum(self, datum):
+                return {'a': datum}
+
+        indexer = ConcreteIndexer()
+        with patch('es_index.indexers.get_context') as get_context_mock:
+            docs = list(indexer.parallel_docs(2))
+
+        expect(get_context_mock).not_to.be.called()
+        expect(docs).to.eq([{
+            '_type': 'my_doc_type',
+            '_source': {'a': 1},
+            '_index': 'new_index_name',
+            '_op_type': 'index'
+        }, {
+            '_type': 'my_doc_type',
+            '_source': {'a': 2},
+            '_index': 'new_index_name',
+            '_op_type': 'index'
+        }])
+        expect(indexer.doc_count).to.eq(2)
+
+    @patch('es_index.indexers.connections')
+    @patch('es_index.indexers.get_context')
+    def test_parallel_docs(self, get_context_mock, connections_mock):
+        class ConcreteIndexer(BaseIndexer):
+            doc_type_klass = Mock()
+            shard_size = 2
+
+        queryset = Mock(spec=QuerySet)
+        queryset.order_by.return_value.values_list.return_value = [1, 2, 3]
+        pool = get_context_mock.return_value.Pool.return_value.__enter__.return_value
+        pool.imap_unordered.return_value = iter([['doc 1', 'doc 2'], ['doc 3']])
+
+        indexer = ConcreteIndexer()
+        indexer.get_queryset = Mock(return_value=queryset)
+
+        docs = indexer.parallel_docs(3)
+
+        expect(connections_mock.close_all).to.be.called()
+        get_context_mock.assert_called_with('fork')
+        get_context_mock.return_value.Pool.assert_called_with(3)
+        expect(pool.imap_unordered).not_to.be.called()
+
+        expect(list(docs)).to.eq(['doc 1', 'doc 2', 'doc 3'])
+        expect(indexer.doc_count).to.eq(3)
+        pool.imap_unordered.assert_called_with(_extract_shard_docs, [(1, 2), (3, 3)])
+
+    @patch('es_index.indexers.parallel_bulk')
+    def test_add_new_data_parallel(self, mock_parallel_bulk):
+        mock_write_index = Mock()
+
+        class TestIndexer(BaseIndexer):
+            index_alias = Mock(write_index=mock_write_index, new_index_name='new_index_name')
+            doc_type_klass = Mock()
+
+        indexer = TestIndexer()
+        indexer.parallel_docs = Mock(return_value=[1])
+        mock_parallel_bulk.return_value = iter([(True, {})])
+
+        indexer.add_new_data_parallel(workers=2, chunk_size=100, max_inflight_requests=3)
+
+        indexer.parallel_docs.assert_called_with(2)
+        expect(mock_parallel_bulk).to.be.called_with(es_client, [1], thread_count=3, chunk_size=100, queue_size=3)
+        expect(mock_write_index.open.called).to.be.true()
+        expect(mock_write_index.refresh.called).to.be.true()
+
 
 my_index_alias = IndexAlias('my_alias')
 
@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from django.test import TestCase
+
+import pytz
+from robber import expect
+
+from data.factories import OfficerFactory, AllegationFactory, OfficerAllegationFactory, AttachmentFileFactory
+from es_index.models import IndexChange
+from trr.factories import TRRFactory
+
+
+class IndexChangeTestCase(TestCase):
+    def _changes(self):
+        return set(IndexChange.objects.values_list('officer_id', 'crid', 'trr_id'))
+
+    def test_capture_officer_changes(self):
+        officer = OfficerFactory(id=1)
+        expect(self._changes()).to.eq({(1, None, None)})
+
+        IndexChange.objects.all().delete()
+        officer.save()
+        expect(self._changes()).to.eq(set())
+
+        officer.first_name = 'Jerome'
+        officer.save()
+        expect(self._changes()).to.eq({(1, None, None)})
+
+    def test_capture_officer_allegation_changes(self):
+        officer = OfficerFactory(id=1)
+        allegation = AllegationFactory(crid='123')
+        IndexChange.objects.all().delete()
+
+        officer_allegation = OfficerAllegationFactory(officer=officer, allegation=allegation)
+        expect(self._changes()).to.eq({(1, '123', None)})
+
+        IndexChange.objects.all().delete()
+        officer_allegation.delete()
+        expect(self._changes()).to.eq({(1, '123', None)})
+
+    def test_capture_trr_changes(self):
+        officer = OfficerFactory(id=1)
+        IndexChange.objects.all().delete()
+
+        TRRFactory(id=2, officer=officer)
+        expect(self._changes()).to.eq({(1, None, 2)})
+
+    def test_capture_attachment_file_changes_on_indexed_columns_only(self):
+        allegation = AllegationFactory(crid='123')
+        attachment = AttachmentFileFactory(allegation=allegation)
+        expect(self._changes()).to.eq({(None, '123', None)})
+
+        IndexChange.objects.all().delete()
+        attachment.views_count = 10
+        attachment.save()
+        expect(self._changes()).to.eq(set())
+
+        attachment.title = 'New title'
+        attachment.save()
+        expect(self._changes()).to.eq({(None, '123', None)})
+
+        indexed_values = [
+            ('text_content', 'New text'),
+            ('source_type', 'COPA'),
+            ('created_at', datetime(2019, 1, 1, tzinfo=pytz.utc)),
+        ]
+        for field, value in indexed_values:
+            IndexChange.objects.all().delete()
+            setattr(attachment, field, value)
+            attachment.save()
+            expect(self._changes()).to.eq({(None, '123', None)})
+
+    def test_capture_attachment_file_changes_on_old_and_new_allegation(self):
+        attachment = AttachmentFileFactory(allegation=AllegationFactory(crid='123'))
+        new_allegation = AllegationFactory(crid='456')
+        IndexChange.objects.all().delete()
+
+        attachment.allegation = new_allegation
+        attachment.save()
+        expect(self._changes()).to.eq({(None, '123', None), (None, '456', None)})
@@ -1,11 +1,16 @@
+from urllib.parse import urlparse, parse_qs
+
 from django.test import SimpleTestCase, TestCase
 
 from mock import Mock
+from rest_framework.exceptions import NotFound
 from robber import expect
 
 from data.factories import AttachmentFileFactory, AllegationFactory
 from data.models import AttachmentFile
-from es_index.pagination import ESBasePagination, ESQueryPagination, ESQuerysetPagination
+from es_index.pagination import (
+    ESBasePagination, ESQueryPagination, ESQuerysetPagination, encode_cursor, decode_cursor
+)
 
 
 class ESBasePaginationTestCase(SimpleTestCase):
@@ -53,6 +58,68 @@ class ESQueryPaginationTestCase(SimpleTestCase):
         expect(paginated_query).to.eq([])
 
 
+class ESCursorPaginationTestCase(SimpleTestCase):
+    def _search_result(self, total, sort_values):
+        search_result = Mock()
+        search_result.hits = Mock()
+        search_result.hits.total = total
+        search_result.hits.hits = [{'_id': str(index), 'sort': sort} for index, sort in enumerate(sort_values)]
+        search_result.__iter__ = Mock(return_value=iter(range(len(sort_values))))
+        return search_result
+
+    def test_paginate_deep_offset_with_next_cursor(self):
+        request = Mock()
+        request.query_params = {'limit': 20, 'offset': 990}
+        request.build_absolute_uri.return_value = 'http://testserver/api/?term=a&offset=990&limit=20'
+        sorted_query = Mock()
+        sorted_query.__getitem__ = Mock(return_value=sorted_query)
+        sorted_query.execute.return_value = self._search_result(2000, [[1.5, 'doc#1'], [1.2, 'doc#2']])
+        query = Mock()
+        query.to_dict.return_value = {'sort': [{'allegation_count': {'order': 'desc'}}]}
+        query.sort.return_value = sorted_query
+
+        pagination = ESQueryPagination()
+        paginated_query = pagination.paginate_es_query(query, request)
+
+        query.sort.assert_called_with({'allegation_count': {'order': 'desc'}}, '_uid')
+        sorted_query.__getitem__.assert_called_with(slice(990, 1010))
+        expect(paginated_query).to.eq([0, 1])
+        expect(decode_cursor(pagination.next_cursor)).to.eq({'after': [1.2, 'doc#2'], 'offset': 1010})
+        next_link = urlparse(pagination.get_next_link())
+        expect(next_link.path).to.eq('/api/')
+        expect(parse_qs(next_link.query)).to.eq({'term': ['a'], 'limit': ['20'], 'cursor': [pagination.next_cursor]})
+
+    def test_paginate_with_cursor(self):
+        request = Mock()
+        request.query_params = {'limit': 20, 'cursor': encode_cursor({'after': [1.2, 'doc#2'], 'offset': 1010})}
+        after_query = Mock()
+        after_query.__getitem__ = Mock(return_value=after_query)
+        after_query.execute.return_value = self._search_result(1020, [[1.1, 'doc#3']])
+        sorted_query = Mock()
+        sorted_query.extra.return_value = after_query
+        query = Mock()
+        query.to_dict.return_value = {}
+        query.sort.return_value = sorted_query
+
+        pagination = ESQueryPagination()
+        paginated_query = pagination.paginate_es_query(query, request)
+
+        query.sort.assert_called_with('_score', '_uid')
+        sorted_query.extra.assert_called_with(search_after=[1.2, 'doc#2'])
+        after_query.__getitem__.assert_called_with(slice(None, 20))
+        expect(paginated_query).to.eq([0])
+        expect(pagination.offset).to.eq(1010)
+        expect(pagination.count).to.eq(1020)
+        expect(pagination.next_cursor).to.be.none()
+        expect(pagination.get_next_link()).to.be.none()
+
+    def test_paginate_with_invalid_cursor(self):
+        request = Mock()
+        request.query_params = {'cursor': 'invalid'}
+
+        expect(lambda: ESQueryPagination().paginate_es_query(Mock(), request)).to.throw(NotFound)
+
+
 class ESQuerysetPaginationTestCase(TestCase):
     def test_paginate_es_query(self):
         allegation = AllegationFactory(crid=123456)
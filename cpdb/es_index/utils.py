@@ -1,9 +1,13 @@
 import uuid
 from time import time
 
+from django.core.cache import cache
+
 
 per_run_uuid = str(uuid.uuid4())
 
+INDEX_VERSION_CACHE_KEY = 'es-index:version'
+
 
 def timing_validate(message):
     def real_decorator(func):
@@ -15,3 +19,17 @@ def timing_validate(message):
             return return_value
         return wrapper
     return real_decorator
+
+
+def report_indexing_rate(description, doc_count, elapsed_time):
+    docs_per_second = doc_count / elapsed_time if elapsed_time else 0
+    print(f'Indexed {doc_count} {description} docs in {elapsed_time:.2f}s ({docs_per_second:.1f} docs/sec)')
+
+
+def get_index_version():
+    return cache.get_or_set(INDEX_VERSION_CACHE_KEY, lambda: uuid.uuid4().hex, None)
+
+
+def bump_index_version():
+    # Anything cached from search results should key on the index version so an alias switch invalidates it
+    cache.set(INDEX_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
@@ -4,7 +4,7 @@ from elasticsearch_dsl import (
 
 from .index_aliases import officers_index_alias
 
-from search.analyzers import autocomplete, autocomplete_search
+from search.analyzers import autocomplete, autocomplete_search, autocomplete_prefix, exact_name
 
 
 @officers_index_alias.doc_type
@@ -30,8 +30,17 @@ class OfficerInfoDocType(DocType):
     percentiles = Nested(
         doc_class=OfficerYearlyPercentile,
         properties=OfficerYearlyPercentile.mapping())
-    full_name = Text(analyzer=autocomplete, search_analyzer=autocomplete_search)
-    badge = Text(analyzer=autocomplete, search_analyzer=autocomplete_search)
+    full_name = Text(
+        analyzer=autocomplete, search_analyzer=autocomplete_search,
+        fields={
+            'prefix': Text(analyzer=autocomplete_prefix, search_analyzer=autocomplete_search),
+            'exact': Text(analyzer=exact_name),
+        }
+    )
+    badge = Text(
+        analyzer=autocomplete, search_analyzer=autocomplete_search,
+        fields={'prefix': Text(analyzer=autocomplete_prefix, search_analyzer=autocomplete_search)}
+    )
     badge_keyword = Keyword()
     historic_badges_keyword = Keyword()
     tags = Text(analyzer=autocomplete, search_analyzer=autocomplete_search)
@@ -1,7 +1,7 @@
-from .officers_indexer import OfficersIndexer
-from .officer_coaccusals_indexer import OfficerCoaccusalsIndexer
+from .officers_indexer import OfficersIndexer, OfficersPartialIndexer
+from .officer_coaccusals_indexer import OfficerCoaccusalsIndexer, OfficerCoaccusalsPartialIndexer
 
 
 __all__ = [
-    'OfficersIndexer', 'OfficerCoaccusalsIndexer'
+    'OfficersIndexer', 'OfficersPartialIndexer', 'OfficerCoaccusalsIndexer', 'OfficerCoaccusalsPartialIndexer'
 ]
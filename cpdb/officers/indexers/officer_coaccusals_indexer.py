@@ -1,12 +1,10 @@
-import itertools
-
 from django.db import models
 
-from data.models import Officer, OfficerAllegation
+from data.models import Officer, OfficerAllegation, OfficerCoaccusal
 from data.utils.subqueries import SQCount
 from es_index import register_indexer
 from es_index.utils import timing_validate
-from es_index.indexers import BaseIndexer
+from es_index.indexers import BaseIndexer, PartialIndexer
 from officers.doc_types import (
     OfficerCoaccusalsDocType,
 )
@@ -22,19 +20,15 @@ class OfficerCoaccusalsIndexer(BaseIndexer):
     index_alias = officers_index_alias
     serializer = OfficerCoaccusalSerializer()
 
+    def get_coaccusal_queryset(self):
+        return OfficerCoaccusal.objects.all()
+
     @timing_validate('OfficerCoaccusalsIndexer: Populating coaccusal dict...')
     def _populate_coaccusal_dict(self):
         self._coaccusal_dict = dict()
-        allegation_dict = dict()
-        for obj in OfficerAllegation.objects.all():
-            allegation_dict.setdefault(obj.allegation_id, []).append(obj.officer_id)
-
-        for officer_ids in allegation_dict.values():
-            if len(officer_ids) < 2:
-                continue
-            for id_1, id_2 in itertools.permutations(officer_ids, 2):
-                d1 = self._coaccusal_dict.setdefault(id_1, dict())
-                d1[id_2] = d1.get(id_2, 0) + 1
+        coaccusals = self.get_coaccusal_queryset().values_list('officer_1_id', 'officer_2_id', 'coaccusal_count')
+        for officer_1_id, officer_2_id, coaccusal_count in coaccusals:
+            self._coaccusal_dict.setdefault(officer_1_id, dict())[officer_2_id] = coaccusal_count
 
     @timing_validate('OfficerCoaccusalsIndexer: Populating officers dict...')
     def _populate_officers_dict(self):
@@ -70,3 +64,19 @@ class OfficerCoaccusalsIndexer(BaseIndexer):
                 )
             ]
         }
+
+
+class OfficerCoaccusalsPartialIndexer(PartialIndexer, OfficerCoaccusalsIndexer):
+    def get_queryset(self):
+        self._populate_coaccusal_dict()
+        self._populate_officers_dict()
+        return super(OfficerCoaccusalsPartialIndexer, self).get_queryset()
+
+    def get_coaccusal_queryset(self):
+        return OfficerCoaccusal.objects.filter(officer_1_id__in=self.updating_keys)
+
+    def get_batch_queryset(self, keys):
+        return Officer.objects.filter(id__in=keys)
+
+    def get_batch_update_docs_queries(self, keys):
+        return self.doc_type_klass.search().query('terms', id=keys)
@@ -3,19 +3,15 @@ import itertools
 from django.db import models
 from django.contrib.postgres.aggregates import ArrayAgg
 
-from data import officer_percentile
-from data.constants import (
-    MIN_VISUAL_TOKEN_YEAR, MAX_VISUAL_TOKEN_YEAR,
-    PERCENTILE_TRR_GROUP, PERCENTILE_ALLEGATION_INTERNAL_CIVILIAN_GROUP, PERCENTILE_ALLEGATION_GROUP
-)
+from data.cache_managers import officer_cache_manager
 from data.models import (
     Officer, Award, OfficerAllegation, Complainant, Allegation, OfficerHistory,
-    OfficerBadgeNumber, Salary
+    OfficerBadgeNumber, Salary, OfficerYearlyPercentile
 )
 from data.utils.subqueries import SQCount
 from es_index import register_indexer
 from es_index.utils import timing_validate
-from es_index.indexers import BaseIndexer
+from es_index.indexers import BaseIndexer, PartialIndexer
 from es_index.serializers import get_gender, get_age_range
 from officers.doc_types import OfficerInfoDocType
 from officers.index_aliases import officers_index_alias
@@ -30,10 +26,11 @@ class OfficersIndexer(BaseIndexer):
     doc_type_klass = OfficerInfoDocType
     index_alias = officers_index_alias
     serializer = OfficerSerializer()
-    percentile_groups = [
-        PERCENTILE_ALLEGATION_GROUP,
-        PERCENTILE_ALLEGATION_INTERNAL_CIVILIAN_GROUP,
-        PERCENTILE_TRR_GROUP
+    percentile_attrs = [
+        'percentile_trr',
+        'percentile_allegation',
+        'percentile_allegation_civilian',
+        'percentile_allegation_internal'
     ]
 
     def __del__(self):
@@ -47,24 +44,24 @@ class OfficersIndexer(BaseIndexer):
 
     @timing_validate('OfficersIndexer: Preparing percentile data...')
     def populate_top_percentile_dict(self):
+        # yearly percentiles are shared with cache_data through the officer yearly percentile table
+        if not OfficerYearlyPercentile.objects.exists():
+            officer_cache_manager.build_cached_yearly_percentiles()
+
         self.yearly_top_percentile = dict()
-        for yr in range(MIN_VISUAL_TOKEN_YEAR, MAX_VISUAL_TOKEN_YEAR + 1):
-            for officer in officer_percentile.top_percentile(yr, percentile_groups=self.percentile_groups):
-                if officer.resignation_date and yr > officer.resignation_date.year:
-                    continue
-                officer_list = self.yearly_top_percentile.setdefault(officer.id, [])
-                officer_dict = {
-                    'id': officer.id,
-                    'year': yr
-                }
-                for attr in [
-                        'percentile_trr',
-                        'percentile_allegation',
-                        'percentile_allegation_civilian',
-                        'percentile_allegation_internal']:
-                    if hasattr(officer, attr):
-                        officer_dict[attr] = f'{getattr(officer, attr):.4f}'
-                officer_list.append(officer_dict)
+        yearly_percentiles = OfficerYearlyPercentile.objects.order_by('year').values(
+            'officer_id', 'year', *self.percentile_attrs
+        )
+        for yearly_percentile in yearly_percentiles:
+            officer_list = self.yearly_top_percentile.setdefault(yearly_percentile['officer_id'], [])
+            officer_dict = {
+                'id': yearly_percentile['officer_id'],
+                'year': yearly_percentile['year']
+            }
+            for attr in self.percentile_attrs:
+                if yearly_percentile[attr] is not None:
+                    officer_dict[attr] = f'{yearly_percentile[attr]:.4f}'
+            officer_list.append(officer_dict)
 
     def get_complainant_dict(self):
         complainant_dict = dict()
@@ -157,7 +154,7 @@ class OfficersIndexer(BaseIndexer):
         for officer in Officer.objects.exclude(tags__isnull=True).prefetch_related('tags'):
             self.tags_dict[officer.id] = [tag.name for tag in officer.tags.all()]
 
-    def get_queryset(self):
+    def populate_dicts(self):
         self.populate_top_percentile_dict()
         self.populate_allegation_dict()
         self.populate_award_dict()
@@ -165,6 +162,8 @@ class OfficersIndexer(BaseIndexer):
         self.populate_badgenumber_dict()
         self.populate_salary_dict()
         self.populate_tags_dict()
+
+    def annotate_officers(self, queryset):
         allegation_count = OfficerAllegation.objects.filter(
             officer=models.OuterRef('id')
         )
@@ -183,7 +182,7 @@ class OfficersIndexer(BaseIndexer):
         trr_count = TRR.objects.filter(
             officer=models.OuterRef('id')
         )
-        return Officer.objects.all()\
+        return queryset\
             .annotate(complaint_count=SQCount(allegation_count.values('id')))\
             .annotate(sustained_complaint_count=SQCount(sustained_count.values('id')))\
             .annotate(discipline_complaint_count=SQCount(discipline_count.values('id')))\
@@ -192,6 +191,10 @@ class OfficersIndexer(BaseIndexer):
             .annotate(trr_datetimes=ArrayAgg('trr__trr_datetime'))\
             .annotate(cr_incident_dates=ArrayAgg('officerallegation__allegation__incident_date'))
 
+    def get_queryset(self):
+        self.populate_dicts()
+        return self.annotate_officers(Officer.objects.all())
+
     def extract_datum(self, obj):
         datum = obj.__dict__
         datum['allegations'] = self.allegation_dict.get(datum['id'], [])
@@ -204,3 +207,15 @@ class OfficersIndexer(BaseIndexer):
         datum['tags'] = self.tags_dict.get(datum['id'], [])
 
         return self.serializer.serialize(datum)
+
+
+class OfficersPartialIndexer(PartialIndexer, OfficersIndexer):
+    def get_queryset(self):
+        self.populate_dicts()
+        return super(OfficersPartialIndexer, self).get_queryset()
+
+    def get_batch_queryset(self, keys):
+        return self.annotate_officers(Officer.objects.filter(id__in=keys))
+
+    def get_batch_update_docs_queries(self, keys):
+        return self.doc_type_klass.search().query('terms', id=keys)
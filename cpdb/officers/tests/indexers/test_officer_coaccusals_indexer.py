@@ -5,7 +5,7 @@ from django.test import TestCase
 from robber import expect
 import pytz
 
-from officers.indexers import OfficerCoaccusalsIndexer
+from officers.indexers import OfficerCoaccusalsIndexer, OfficerCoaccusalsPartialIndexer
 from data.factories import AllegationFactory, OfficerFactory, OfficerAllegationFactory
 
 
@@ -116,3 +116,24 @@ class OfficerCoaccusalsIndexerTestCase(TestCase):
             'id': 3232,
             'coaccusals': []
         })
+
+
+class OfficerCoaccusalsPartialIndexerTestCase(TestCase):
+    def test_extract_datum(self):
+        officer_1 = OfficerFactory(id=1)
+        officer_2 = OfficerFactory(id=2)
+        OfficerFactory(id=3)
+        allegation = AllegationFactory()
+        OfficerAllegationFactory(officer=officer_1, allegation=allegation)
+        OfficerAllegationFactory(officer=officer_2, allegation=allegation)
+
+        indexer = OfficerCoaccusalsPartialIndexer(updating_keys=[1])
+        rows = [indexer.extract_datum(obj) for obj in indexer.get_queryset()]
+
+        expect(rows).to.have.length(1)
+        expect(rows[0]['id']).to.eq(1)
+        expect([coaccusal['id'] for coaccusal in rows[0]['coaccusals']]).to.eq([2])
+
+    def test_get_batch_update_docs_queries(self):
+        update_docs_query = OfficerCoaccusalsPartialIndexer().get_batch_update_docs_queries(keys=[1, 2])
+        expect(update_docs_query.to_dict()).to.eq({'query': {'terms': {'id': [1, 2]}}})
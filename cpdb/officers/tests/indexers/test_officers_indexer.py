@@ -10,9 +10,9 @@ import pytz
 
 from data.factories import (
     OfficerFactory, OfficerAllegationFactory, OfficerHistoryFactory, AllegationFactory,
-    AwardFactory, SalaryFactory, OfficerBadgeNumberFactory, ComplainantFactory
+    AwardFactory, SalaryFactory, OfficerBadgeNumberFactory, ComplainantFactory, OfficerYearlyPercentileFactory
 )
-from officers.indexers import OfficersIndexer
+from officers.indexers import OfficersIndexer, OfficersPartialIndexer
 from trr.factories import TRRFactory
 
 
@@ -25,10 +25,7 @@ class OfficersIndexerTestCase(TestCase):
         return [indexer.extract_datum(obj) for obj in indexer.get_queryset()]
 
     @override_settings(V1_URL='http://test.com')
-    @patch(
-        'officers.indexers.officers_indexer.officer_percentile.top_percentile',
-        Mock(return_value=[])
-    )
+    @patch('officers.indexers.officers_indexer.officer_cache_manager.build_cached_yearly_percentiles', Mock())
     def test_extract_info(self):
         officer = OfficerFactory(
             id=123,
@@ -513,28 +510,16 @@ class OfficersIndexerTestCase(TestCase):
             }
         ])
 
-    @patch('officers.indexers.officers_indexer.MIN_VISUAL_TOKEN_YEAR', 2016)
-    @patch('officers.indexers.officers_indexer.MAX_VISUAL_TOKEN_YEAR', 2016)
-    @patch(
-        'officers.indexers.officers_indexer.officer_percentile.top_percentile',
-        Mock(return_value=[Mock(
-            spec=[
-                'id',
-                'year',
-                'resignation_date',
-                'percentile_allegation',
-                'percentile_allegation_civilian',
-                'percentile_allegation_internal'],
-            id=123,
+    @patch('officers.indexers.officers_indexer.officer_cache_manager.build_cached_yearly_percentiles')
+    def test_extract_datum_percentiles_missing_value(self, build_cached_yearly_percentiles_mock):
+        officer = OfficerFactory(id=123)
+        OfficerYearlyPercentileFactory(
+            officer=officer,
             year=2016,
-            resignation_date=date(2017, 3, 4),
-            percentile_allegation=23.4543,
-            percentile_allegation_civilian=54.2342,
-            percentile_allegation_internal=54.3432
-        )])
-    )
-    def test_extract_datum_percentiles_missing_value(self):
-        OfficerFactory(id=123)
+            percentile_allegation=Decimal('23.4543'),
+            percentile_allegation_civilian=Decimal('54.2342'),
+            percentile_allegation_internal=Decimal('54.3432'),
+        )
         rows = self.extract_data()
 
         expect(rows).to.have.length(1)
@@ -547,3 +532,25 @@ class OfficersIndexerTestCase(TestCase):
                 'percentile_allegation_internal': '54.3432'
             }
         ])
+        expect(build_cached_yearly_percentiles_mock).not_to.be.called()
+
+
+class OfficersPartialIndexerTestCase(TestCase):
+    @patch('officers.indexers.officers_indexer.officer_cache_manager.build_cached_yearly_percentiles', Mock())
+    def test_get_queryset(self):
+        officer = OfficerFactory(id=1)
+        OfficerFactory(id=2)
+        OfficerFactory(id=3)
+        OfficerAllegationFactory(officer=officer)
+        OfficerAllegationFactory(officer=officer)
+
+        indexer = OfficersPartialIndexer(updating_keys=[1, 3])
+        officers = sorted(indexer.get_queryset(), key=lambda officer: officer.id)
+
+        expect([officer.id for officer in officers]).to.eq([1, 3])
+        expect(officers[0].complaint_count).to.eq(2)
+        expect(indexer.allegation_dict[1]).to.have.length(2)
+
+    def test_get_batch_update_docs_queries(self):
+        update_docs_query = OfficersPartialIndexer().get_batch_update_docs_queries(keys=[1, 2])
+        expect(update_docs_query.to_dict()).to.eq({'query': {'terms': {'id': [1, 2]}}})
@@ -2,7 +2,8 @@ import re
 from random import sample
 
 from django.contrib.gis.db import models
-from django.db.models import Q, Count, Prefetch, Value, IntegerField, F
+from django.db import connection
+from django.db.models import Prefetch
 from django.utils.functional import cached_property
 
 from sortedm2m.fields import SortedManyToManyField
@@ -12,6 +13,8 @@ from data.models import Officer, AttachmentFile, OfficerAllegation, Allegation
 from data.models.common import TimeStampsModel
 from pinboard.fields import HexField
 from pinboard.constants import PINBOARD_TITLE_DUPLICATE_PATTERN
+from pinboard.queries import RelevantCoaccusalsQuery, RelevantComplaintsQuery, RelevantDocumentsQuery
+from pinboard.resolution import resolve
 
 
 class AllegationManager(models.Manager):
@@ -32,6 +35,8 @@ class ProxyAllegation(Allegation):
 
 
 class Pinboard(TimeStampsModel):
+    PIN_FIELDS = ('officers', 'allegations', 'trrs')
+
     id = HexField(hex_length=8, primary_key=True)
     title = models.CharField(max_length=255, default='', blank=True)
     officers = SortedManyToManyField('data.Officer')
@@ -57,17 +62,17 @@ class Pinboard(TimeStampsModel):
         else:
             return None
 
+    @cached_property
+    def resolution(self):
+        return resolve(self)
+
     @property
     def all_officers(self):
-        return Officer.objects.filter(
-            Q(officerallegation__allegation_id__in=self.crids) |
-            Q(trr__id__in=self.trr_ids) |
-            Q(pinboard__id=self.id)
-        ).distinct()
+        return Officer.objects.filter(id__in=self.all_officer_ids)
 
     @property
     def all_officer_ids(self):
-        return self.all_officers.values_list('id', flat=True)
+        return self.resolution.all_officer_ids
 
     def clone(self, is_duplicated=False):
         new_pinboard = Pinboard()
@@ -84,23 +89,64 @@ class Pinboard(TimeStampsModel):
         new_pinboard.source_pinboard = self
         new_pinboard.save()
 
-        new_pinboard.officers.set(self.officers.all())
-        new_pinboard.allegations.set(self.allegations.all())
-        new_pinboard.trrs.set(self.trrs.all())
+        with connection.cursor() as cursor:
+            for field_name in self.PIN_FIELDS:
+                table, source, target, sort = self._pin_columns(field_name)
+                cursor.execute(
+                    f'INSERT INTO {table} ({source}, {target}, {sort}) '
+                    f'SELECT %s, {target}, {sort} FROM {table} WHERE {source} = %s',
+                    [new_pinboard._db_id, self._db_id]
+                )
 
         return new_pinboard
 
-    @cached_property
+    def add_pins(self, officer_ids=(), crids=(), trr_ids=()):
+        """
+        Append pins after the existing ones, in the given order, with one INSERT ... SELECT per relation.
+        Unknown ids and items already pinned are skipped.
+        """
+        pins = zip(self.PIN_FIELDS, (officer_ids, crids, trr_ids))
+        with connection.cursor() as cursor:
+            for field_name, ids in pins:
+                ids = list(dict.fromkeys(ids))
+                if not ids:
+                    continue
+                table, source, target, sort = self._pin_columns(field_name)
+                related_meta = self._meta.get_field(field_name).related_model._meta
+                cursor.execute(
+                    f'INSERT INTO {table} ({source}, {target}, {sort}) '
+                    f'SELECT %(pinboard_id)s, item.id, item.position + COALESCE('
+                    f'(SELECT MAX({sort}) FROM {table} WHERE {source} = %(pinboard_id)s), 0) '
+                    f'FROM unnest(%(ids)s) WITH ORDINALITY AS item(id, position) '
+                    f'JOIN {related_meta.db_table} ON {related_meta.db_table}.{related_meta.pk.column} = item.id '
+                    f'ON CONFLICT DO NOTHING',
+                    {'pinboard_id': self._db_id, 'ids': ids}
+                )
+
+        self.save(update_fields=['updated_at'])
+        self.__dict__.pop('resolution', None)
+
+    @property
+    def _db_id(self):
+        return self._meta.pk.get_prep_value(self.id)
+
+    @classmethod
+    def _pin_columns(cls, field_name):
+        field = cls._meta.get_field(field_name)
+        through = field.remote_field.through
+        return through._meta.db_table, field.m2m_column_name(), field.m2m_reverse_name(), through._sort_field_name
+
+    @property
     def officer_ids(self):
-        return list(self.officers.values_list('id', flat=True))
+        return self.resolution.officer_ids
 
-    @cached_property
+    @property
     def crids(self):
-        return list(self.allegations.values_list('crid', flat=True))
+        return self.resolution.crids
 
-    @cached_property
+    @property
     def trr_ids(self):
-        return list(self.trrs.values_list('id', flat=True))
+        return self.resolution.trr_ids
 
     def relevant_documents_query(self, **kwargs):
         return AttachmentFile.showing.filter(
@@ -125,97 +171,16 @@ class Pinboard(TimeStampsModel):
 
     @property
     def relevant_documents(self):
-        officer_ids = self.officers.all().values_list('id', flat=True)
-        crids = self.allegations.all().values_list('crid', flat=True)
-        via_allegation = self.relevant_documents_query(allegation__in=crids)
-        via_officer = self.relevant_documents_query(allegation__officerallegation__officer__in=officer_ids)
-
-        return via_allegation.union(
-            via_officer,
-        ).distinct().order_by('-allegation__incident_date')
+        return self.relevant_documents_query(
+            id__in=RelevantDocumentsQuery(self).ids
+        ).order_by('-allegation__incident_date', 'id')
 
     @property
     def relevant_coaccusals(self):
-        officer_ids = self.officers.all().values_list('id', flat=True)
-        crids = self.allegations.all().values_list('crid', flat=True)
-        trr_officer_ids = self.trrs.all().values_list('officer_id', flat=True).distinct()
-
-        columns = [
-            'id',
-            'rank',
-            'first_name',
-            'last_name',
-            'appointed_date',
-            'resignation_date',
-            'current_badge',
-            'gender',
-            'birth_year',
-            'race',
-            'rank',
-            'trr_percentile',
-            'complaint_percentile',
-            'civilian_allegation_percentile',
-            'internal_allegation_percentile',
-            'allegation_count',
-            'sustained_count',
-            'discipline_count',
-            'trr_count',
-            'major_award_count',
-            'honorable_mention_count',
-            'honorable_mention_percentile',
-            'last_unit_id',
-            'civilian_compliment_count'
-        ]
-
-        related_renamed_columns = (
-            ('unit_id', 'last_unit__id'),
-            ('unit_name', 'last_unit__unit_name'),
-            ('unit_description', 'last_unit__description')
-        )
-
-        content_columns = columns + [col[1] for col in related_renamed_columns]
-        officer_qs = Officer.objects.annotate(**{
-            annotated_column: F(column) for annotated_column, column in related_renamed_columns
-        })
-
-        via_officer = officer_qs.filter(
-            officerallegation__allegation__officerallegation__officer_id__in=officer_ids
-        ).exclude(id__in=officer_ids).only(*content_columns).annotate(
-            sub_coaccusal_count=Count('officerallegation', distinct=True)
-        )
-
-        via_allegation = officer_qs.filter(
-            officerallegation__allegation__in=crids
-        ).exclude(id__in=officer_ids).only(*content_columns).annotate(
-            sub_coaccusal_count=Count('officerallegation', distinct=True)
-        )
-
-        via_trr = officer_qs.filter(
-            id__in=trr_officer_ids
-        ).exclude(id__in=officer_ids).only(*content_columns).annotate(
-            sub_coaccusal_count=Value(1, output_field=IntegerField())
-        )
-        sub_query = via_officer.union(via_allegation, all=True).union(via_trr, all=True)
-
-        select_columns = ', '.join(
-            [f'"{col}"' for col in columns] +
-            [f'"{col[0]}"' for col in related_renamed_columns]
-        )
-
-        raw_query = f'''
-            WITH cte AS ({sub_query.query})
-            SELECT {select_columns},
-                SUM("sub_coaccusal_count") "coaccusal_count"
-            FROM cte
-            GROUP BY {select_columns}
-            ORDER BY "coaccusal_count" DESC
-        '''
-        query = Officer.objects.raw(raw_query)
-        return query
+        return RelevantCoaccusalsQuery(self).page()
 
     def relevant_complaints_query(self, **kwargs):
-        crids = self.allegations.all().values_list('crid', flat=True)
-        return Allegation.objects.filter(**kwargs).exclude(crid__in=crids).only(
+        return Allegation.objects.filter(**kwargs).exclude(crid__in=self.crids).only(
             'crid',
             'incident_date',
             'most_common_category',
@@ -239,40 +204,11 @@ class Pinboard(TimeStampsModel):
             'victims'
         )
 
-    def relevant_complaints_count_query(self, **kwargs):
-        crids = self.allegations.all().values_list('crid', flat=True)
-        return Allegation.objects.filter(**kwargs).exclude(crid__in=crids).only('crid')
-
-    @property
-    def relevant_complaints_count(self):
-        officer_ids = self.officers.all().values_list('id', flat=True)
-        via_officer = self.relevant_complaints_count_query(
-            officerallegation__officer__in=officer_ids
-        )
-        via_investigator = self.relevant_complaints_count_query(
-            investigatorallegation__investigator__officer__in=officer_ids
-        )
-        via_police_witness = self.relevant_complaints_count_query(
-            police_witnesses__in=officer_ids
-        )
-        return via_officer.union(via_investigator, via_police_witness).distinct().count
-
     @property
     def relevant_complaints(self):
-        officer_ids = self.officers.all().values_list('id', flat=True)
-        via_officer = self.relevant_complaints_query(
-            officerallegation__officer__in=officer_ids
-        )
-        via_investigator = self.relevant_complaints_query(
-            investigatorallegation__investigator__officer__in=officer_ids
-        )
-        via_police_witness = self.relevant_complaints_query(
-            police_witnesses__in=officer_ids
-        )
-        query = via_officer.union(via_investigator, via_police_witness).distinct().order_by('-incident_date')
-        # LimitOffsetPagination need count and we optimize it with a more simple query
-        setattr(query, 'count', self.relevant_complaints_count)
-        return query
+        return self.relevant_complaints_query(
+            crid__in=RelevantComplaintsQuery(self).ids
+        ).order_by('-incident_date', 'crid')
 
 
 class ExamplePinboard(TimeStampsModel):
@@ -0,0 +1,62 @@
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from es_index.pagination import encode_cursor, decode_cursor
+
+
+class KeysetPagination(LimitOffsetPagination):
+    """
+    Paginates a query object with `count()`, `page(limit, offset, after)`, `sort_key(item)` and `sort_key_types`.
+    Shallow pages are fetched by offset. Once the next page starts at `cursor_offset` or deeper, the `next` link
+    carries an opaque cursor with the sort key of the last item instead, and that page is fetched by seeking past
+    the key.
+    """
+    cursor_query_param = 'cursor'
+    cursor_offset = 100
+
+    def paginate_keyset_query(self, query, request, view=None):
+        self.limit = self.get_limit(request)
+        self.request = request
+        self.next_cursor = None
+
+        token = request.query_params.get(self.cursor_query_param)
+        cursor = self.decode_keyset_cursor(query, token) if token else None
+        self.offset = cursor['offset'] if cursor else self.get_offset(request)
+        self.count = query.count()
+
+        if self.count == 0 or self.offset > self.count:
+            return []
+
+        if cursor:
+            page = query.page(self.limit, offset=self.offset, after=cursor['after'])
+        else:
+            page = query.page(self.limit, offset=self.offset)
+
+        next_offset = self.offset + self.limit
+        if page and self.cursor_offset <= next_offset < self.count:
+            self.next_cursor = encode_cursor({'after': query.sort_key(page[-1]), 'offset': next_offset})
+        return page
+
+    @staticmethod
+    def decode_keyset_cursor(query, token):
+        # Cursors come from the client, the sort key is checked against the query's types before it reaches SQL
+        cursor = decode_cursor(token)
+        after = cursor['after']
+        if cursor['offset'] < 0 or len(after) != len(query.sort_key_types) or not all(
+            type(value) is value_type for value, value_type in zip(after, query.sort_key_types)
+        ):
+            raise NotFound('Invalid cursor')
+        return cursor
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return super(KeysetPagination, self).get_next_link()
+
+        url = remove_query_param(self.request.build_absolute_uri(), self.offset_query_param)
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_previous_link(self):
+        url = super(KeysetPagination, self).get_previous_link()
+        return remove_query_param(url, self.cursor_query_param) if url else url
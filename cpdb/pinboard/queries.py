@@ -1,7 +1,11 @@
+from django.db import connection
 from django.db.models import Count, Q, F
+from django.utils.functional import cached_property
 
-from data.models import Allegation, OfficerAllegation, Complainant
-from trr.models import ActionResponse
+from data.constants import MEDIA_TYPE_DOCUMENT
+from data.models import Allegation, OfficerAllegation, Complainant, Officer, AttachmentFile
+from pinboard.resolution import get_or_compute
+from trr.models import ActionResponse, TRR
 
 
 DISPLAYED_RACES = ['Black', 'White', 'Hispanic']
@@ -63,28 +67,246 @@ class TrrSummaryQuery(BaseSummaryQuery):
         ).order_by('-count')
 
 
-class OfficersSummaryQuery(BaseSummaryQuery):
+class DemographicSummaryQuery(BaseSummaryQuery):
+    """
+    Race and gender breakdown of the `people` CTE, counted in one statement with GROUPING SETS. GROUPING(race)
+    tells the gender rows, where race is not grouped, apart from the race rows.
+    """
+    ctes = None
+
+    @property
+    def _params(self):
+        return {
+            'crids': list(self.pinboard.crids),
+            'all_officer_ids': list(self.pinboard.all_officer_ids),
+        }
+
     def query(self):
-        race_count = self.pinboard.all_officers.values('race').annotate(count=Count('id'))
-        gender_count = self.pinboard.all_officers.values('gender').annotate(count=Count('id')).order_by('-count')
+        with connection.cursor() as cursor:
+            cursor.execute(f'''
+                WITH {self.ctes}
+                SELECT race, gender, GROUPING(race) AS by_gender, COUNT(*) AS count
+                FROM people
+                GROUP BY GROUPING SETS ((race), (gender))
+            ''', self._params)
+            rows = cursor.fetchall()
+
+        race_count = [{'race': race, 'count': count} for race, _, by_gender, count in rows if not by_gender]
+        gender_count = [{'gender': gender, 'count': count} for _, gender, by_gender, count in rows if by_gender]
         return {
             'race': self._calculate_percentage(self._group_race_data(race_count)),
             'gender': self._calculate_percentage(self._group_gender_data(gender_count))
         }
 
 
-class ComplainantsSummaryQuery(BaseSummaryQuery):
-    def all_allegation_ids(self):
-        return Allegation.objects.filter(
-            Q(crid__in=self.pinboard.crids) |
-            Q(officerallegation__officer_id__in=list(self.pinboard.all_officer_ids))
-        ).distinct().values_list('crid', flat=True)
+class OfficersSummaryQuery(DemographicSummaryQuery):
+    ctes = f'''
+        people AS (
+            SELECT race, gender
+            FROM {Officer._meta.db_table}
+            WHERE id = ANY(%(all_officer_ids)s)
+        )
+    '''
 
-    def query(self):
-        all_complainants = Complainant.objects.filter(allegation_id__in=self.all_allegation_ids())
-        race_count = all_complainants.values('race').annotate(count=Count('id'))
-        gender_count = all_complainants.values('gender').annotate(count=Count('id')).order_by('-count')
+
+class ComplainantsSummaryQuery(DemographicSummaryQuery):
+    ctes = f'''
+        pinboard_allegations AS (
+            SELECT crid AS allegation_id
+            FROM {Allegation._meta.db_table}
+            WHERE crid = ANY(%(crids)s)
+            UNION
+            SELECT allegation_id
+            FROM {OfficerAllegation._meta.db_table}
+            WHERE officer_id = ANY(%(all_officer_ids)s)
+        ),
+        people AS (
+            SELECT race, gender
+            FROM {Complainant._meta.db_table}
+            WHERE allegation_id IN (SELECT allegation_id FROM pinboard_allegations)
+        )
+    '''
+
+
+class RelevantCoaccusalsQuery(object):
+    """
+    Officers coaccused with the pinned officers, CRs and TRRs, ranked by coaccusal count. The ranking is a narrow
+    aggregate over officer ids: the CRs each officer shares with any pinned officer, the accused officers of the
+    pinned CRs and the officers of the pinned TRRs. Officer rows are only fetched for the requested page.
+    """
+    sort_key_types = (int, int)
+
+    def __init__(self, pinboard):
+        self.pinboard = pinboard
+
+    @property
+    def _params(self):
         return {
-            'race': self._calculate_percentage(self._group_race_data(race_count)),
-            'gender': self._calculate_percentage(self._group_gender_data(gender_count))
+            'officer_ids': list(self.pinboard.officer_ids),
+            'crids': list(self.pinboard.crids),
+            'trr_ids': list(self.pinboard.trr_ids),
         }
+
+    @property
+    def _ranking_query(self):
+        return f'''
+            SELECT officer_id, SUM(coaccusal_count)::int AS coaccusal_count
+            FROM (
+                SELECT coaccused.officer_id, COUNT(DISTINCT coaccused.allegation_id) AS coaccusal_count
+                FROM {OfficerAllegation._meta.db_table} coaccused
+                JOIN {OfficerAllegation._meta.db_table} pinned ON pinned.allegation_id = coaccused.allegation_id
+                WHERE pinned.officer_id = ANY(%(officer_ids)s) AND coaccused.officer_id IS NOT NULL
+                GROUP BY coaccused.officer_id
+                UNION ALL
+                SELECT officer_id, COUNT(*)
+                FROM {OfficerAllegation._meta.db_table}
+                WHERE allegation_id = ANY(%(crids)s) AND officer_id IS NOT NULL
+                GROUP BY officer_id
+                UNION ALL
+                SELECT DISTINCT officer_id, 1
+                FROM {TRR._meta.db_table}
+                WHERE id = ANY(%(trr_ids)s) AND officer_id IS NOT NULL
+            ) candidates
+            WHERE officer_id <> ALL(%(officer_ids)s)
+            GROUP BY officer_id
+        '''
+
+    def compute_count(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM ({self._ranking_query}) ranking', self._params)
+            return cursor.fetchone()[0]
+
+    def count(self):
+        # Every page needs the count, so it is cached per pinboard version and only the page itself is ranked
+        return get_or_compute('relevant-coaccusals-count', self.pinboard, self.compute_count)
+
+    def ranking(self, limit=None, offset=0, after=None):
+        """
+        :param after: sort key of the last officer of the previous page, to seek to the page instead of
+        skipping `offset` ranked officers
+        :return: list of (officer id, coaccusal count) ordered by coaccusal count, then officer id
+        """
+        params = {**self._params, 'limit': limit, 'offset': offset}
+        seek_condition = ''
+        if after:
+            params.update({'offset': 0, 'after_count': after[0], 'after_id': after[1]})
+            seek_condition = '''
+                WHERE coaccusal_count < %(after_count)s
+                OR (coaccusal_count = %(after_count)s AND officer_id > %(after_id)s)
+            '''
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'''
+                SELECT officer_id, coaccusal_count
+                FROM ({self._ranking_query}) ranking
+                {seek_condition}
+                ORDER BY coaccusal_count DESC, officer_id
+                LIMIT %(limit)s OFFSET %(offset)s
+            ''', params)
+            return cursor.fetchall()
+
+    def page(self, limit=None, offset=0, after=None):
+        ranking = self.ranking(limit, offset, after)
+        officers = Officer.objects.annotate(
+            unit_id=F('last_unit__id'),
+            unit_name=F('last_unit__unit_name'),
+            unit_description=F('last_unit__description'),
+        ).in_bulk([officer_id for officer_id, _ in ranking])
+
+        results = []
+        for officer_id, coaccusal_count in ranking:
+            officer = officers.get(officer_id)
+            if officer:
+                officer.coaccusal_count = coaccusal_count
+                results.append(officer)
+        return results
+
+    @staticmethod
+    def sort_key(officer):
+        return [officer.coaccusal_count, officer.id]
+
+
+class CachedRelevanceQuery(object):
+    """
+    Relevant items of a pinboard served from the ordered list of their ids, which is computed with one narrow
+    query and cached per pinboard version. A page is a slice of that list, taken at an offset or right after the
+    last item of the previous page, and only the rows of the page are fetched.
+    """
+    cache_name = None
+    sort_key_types = None
+
+    def __init__(self, pinboard):
+        self.pinboard = pinboard
+
+    def ranked_ids(self):
+        raise NotImplementedError
+
+    def page_queryset(self, ids):
+        raise NotImplementedError
+
+    @cached_property
+    def ids(self):
+        return get_or_compute(self.cache_name, self.pinboard, self.ranked_ids)
+
+    def count(self):
+        return len(self.ids)
+
+    def page(self, limit=None, offset=0, after=None):
+        if after:
+            positions = {item_id: position for position, item_id in enumerate(self.ids)}
+            offset = positions[after[0]] + 1 if after[0] in positions else offset
+        page_ids = self.ids[offset:offset + limit] if limit is not None else self.ids[offset:]
+        items = self.page_queryset(page_ids).in_bulk(page_ids)
+        return [items[item_id] for item_id in page_ids if item_id in items]
+
+    @staticmethod
+    def sort_key(item):
+        return [item.pk]
+
+
+class RelevantComplaintsQuery(CachedRelevanceQuery):
+    cache_name = 'relevant-complaints'
+    sort_key_types = (str,)
+
+    def _ranking_query(self, **kwargs):
+        return Allegation.objects.filter(**kwargs).exclude(
+            crid__in=self.pinboard.crids
+        ).values_list('crid', 'incident_date')
+
+    def ranked_ids(self):
+        officer_ids = self.pinboard.officer_ids
+        if not officer_ids:
+            return []
+
+        via_officer = self._ranking_query(officerallegation__officer__in=officer_ids)
+        via_investigator = self._ranking_query(investigatorallegation__investigator__officer__in=officer_ids)
+        via_police_witness = self._ranking_query(police_witnesses__in=officer_ids)
+        ranking = via_officer.union(via_investigator, via_police_witness).order_by('-incident_date', 'crid')
+        return [crid for crid, _ in ranking]
+
+    def page_queryset(self, ids):
+        return self.pinboard.relevant_complaints_query(crid__in=ids)
+
+
+class RelevantDocumentsQuery(CachedRelevanceQuery):
+    cache_name = 'relevant-documents'
+    sort_key_types = (int,)
+
+    def _ranking_query(self, **kwargs):
+        return AttachmentFile.showing.filter(file_type=MEDIA_TYPE_DOCUMENT, **kwargs).annotate(
+            incident_date=F('allegation__incident_date')
+        ).values_list('id', 'incident_date')
+
+    def ranked_ids(self):
+        officer_ids = self.pinboard.officer_ids
+        crids = self.pinboard.crids
+        if not officer_ids and not crids:
+            return []
+
+        via_allegation = self._ranking_query(allegation__in=crids)
+        via_officer = self._ranking_query(allegation__officerallegation__officer__in=officer_ids)
+        ranking = via_allegation.union(via_officer).order_by('-incident_date', 'id')
+        return [attachment_id for attachment_id, _ in ranking]
+
+    def page_queryset(self, ids):
+        return self.pinboard.relevant_documents_query(id__in=ids)
@@ -0,0 +1,70 @@
+from django.core.cache import cache
+
+from data.models import OfficerAllegation
+from trr.models import TRR
+
+PINBOARD_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+class PinboardResolution(object):
+    """
+    The id sets every pinboard widget is built from: the pinned officers, CRs and TRRs in pinned order, and
+    all officers of the pinboard, i.e. the pinned ones plus the officers accused in the pinned CRs and involved
+    in the pinned TRRs.
+    """
+    def __init__(self, officer_ids, crids, trr_ids, all_officer_ids):
+        self.officer_ids = officer_ids
+        self.crids = crids
+        self.trr_ids = trr_ids
+        self.all_officer_ids = all_officer_ids
+
+    @classmethod
+    def compute(cls, pinboard):
+        officer_ids = list(pinboard.officers.values_list('id', flat=True))
+        crids = list(pinboard.allegations.values_list('crid', flat=True))
+        trr_ids = list(pinboard.trrs.values_list('id', flat=True))
+
+        via_allegation = OfficerAllegation.objects.filter(
+            allegation_id__in=crids, officer_id__isnull=False
+        ).values_list('officer_id', flat=True)
+        via_trr = TRR.objects.filter(id__in=trr_ids, officer_id__isnull=False).values_list('officer_id', flat=True)
+        involved_officer_ids = set(via_allegation.union(via_trr)) if crids or trr_ids else set()
+
+        return cls(
+            officer_ids=officer_ids,
+            crids=crids,
+            trr_ids=trr_ids,
+            all_officer_ids=sorted(involved_officer_ids.union(officer_ids)),
+        )
+
+    def to_dict(self):
+        return {
+            'officer_ids': self.officer_ids,
+            'crids': self.crids,
+            'trr_ids': self.trr_ids,
+            'all_officer_ids': self.all_officer_ids,
+        }
+
+
+def pinboard_cache_key(name, pinboard):
+    return f'pinboard-{name}:{pinboard.id}:{pinboard.updated_at.isoformat()}'
+
+
+def resolution_cache_key(pinboard):
+    return pinboard_cache_key('resolution', pinboard)
+
+
+def get_or_compute(name, pinboard, compute):
+    """
+    Get a result derived from the pins of a pinboard from the shared cache, computing and caching it on a miss.
+    Pins are always changed by saving the pinboard in the same transaction, which bumps updated_at, so an
+    entry never outlives the pins it was computed from.
+    :param name: result name, e.g. 'resolution'
+    :param compute: function to compute the result
+    """
+    return cache.get_or_set(pinboard_cache_key(name, pinboard), compute, PINBOARD_CACHE_TIMEOUT)
+
+
+def resolve(pinboard):
+    data = get_or_compute('resolution', pinboard, lambda: PinboardResolution.compute(pinboard).to_dict())
+    return PinboardResolution(**data)
@@ -125,3 +125,9 @@ class OrderedPinboardSerializer(ModelSerializer, NoNullSerializer):
             'description',
             'example_pinboards',
         )
+
+
+class PinsSerializer(serializers.Serializer):
+    officer_ids = serializers.ListField(child=serializers.IntegerField(), default=list)
+    crids = serializers.ListField(child=serializers.CharField(), default=list)
+    trr_ids = serializers.ListField(child=serializers.IntegerField(), default=list)
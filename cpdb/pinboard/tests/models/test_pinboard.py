@@ -50,6 +50,47 @@ class PinboardTestCase(TestCase):
         expect(trrs).to.eq(cloned_trrs)
         expect(cloned_pinboard.source_pinboard).to.eq(pinboard)
 
+    def test_clone_keep_pin_order(self):
+        officers = [OfficerFactory(id=officer_id) for officer_id in [3, 1, 2]]
+        allegations = [AllegationFactory(crid=crid) for crid in ['456def', '123abc']]
+        trrs = [TRRFactory(id=trr_id) for trr_id in [2, 1]]
+        pinboard = PinboardFactory(officers=officers, allegations=allegations, trrs=trrs)
+
+        with self.assertNumQueries(5):
+            cloned_pinboard = pinboard.clone()
+
+        expect(list(cloned_pinboard.officers.values_list('id', flat=True))).to.eq([3, 1, 2])
+        expect(list(cloned_pinboard.allegations.values_list('crid', flat=True))).to.eq(['456def', '123abc'])
+        expect(list(cloned_pinboard.trrs.values_list('id', flat=True))).to.eq([2, 1])
+        expect(list(pinboard.officers.values_list('id', flat=True))).to.eq([3, 1, 2])
+
+    def test_add_pins(self):
+        officer_1 = OfficerFactory(id=1)
+        OfficerFactory(id=2)
+        OfficerFactory(id=3)
+        allegation = AllegationFactory(crid='123abc')
+        AllegationFactory(crid='456def')
+        TRRFactory(id=1)
+        pinboard = PinboardFactory(officers=[officer_1], allegations=[allegation])
+        updated_at = pinboard.updated_at
+
+        with self.assertNumQueries(4):
+            pinboard.add_pins(officer_ids=[3, 1, 999, 2, 3], crids=['456def', 'not-exist'], trr_ids=[1])
+
+        expect(list(pinboard.officers.values_list('id', flat=True))).to.eq([1, 3, 2])
+        expect(list(pinboard.allegations.values_list('crid', flat=True))).to.eq(['123abc', '456def'])
+        expect(list(pinboard.trrs.values_list('id', flat=True))).to.eq([1])
+        expect(pinboard.updated_at > updated_at).to.be.true()
+        expect(pinboard.officer_ids).to.eq([1, 3, 2])
+
+    def test_add_pins_nothing(self):
+        pinboard = PinboardFactory()
+
+        with self.assertNumQueries(1):
+            pinboard.add_pins()
+
+        expect(pinboard.is_empty).to.be.true()
+
     def test_clone_duplicate(self):
         pinboard = PinboardFactory(
             title='Pinboard title',
@@ -0,0 +1,90 @@
+from urllib.parse import urlparse, parse_qs
+
+from django.test import SimpleTestCase
+
+from mock import Mock
+from rest_framework.exceptions import NotFound
+from robber import expect
+
+from es_index.pagination import encode_cursor, decode_cursor
+from pinboard.pagination import KeysetPagination
+
+
+class KeysetPaginationTestCase(SimpleTestCase):
+    def _query(self, count, page):
+        query = Mock()
+        query.count.return_value = count
+        query.page.return_value = page
+        query.sort_key = lambda item: [item['count'], item['id']]
+        query.sort_key_types = (int, int)
+        return query
+
+    def test_paginate_by_offset(self):
+        request = Mock()
+        request.query_params = {'limit': 2, 'offset': 2}
+        request.build_absolute_uri.return_value = 'http://testserver/api/?limit=2&offset=2'
+        query = self._query(5, [{'id': 3, 'count': 2}, {'id': 4, 'count': 1}])
+
+        pagination = KeysetPagination()
+        page = pagination.paginate_keyset_query(query, request)
+
+        query.page.assert_called_with(2, offset=2)
+        expect(page).to.eq([{'id': 3, 'count': 2}, {'id': 4, 'count': 1}])
+        expect(pagination.count).to.eq(5)
+        expect(pagination.next_cursor).to.be.none()
+        expect(pagination.get_next_link()).to.eq('http://testserver/api/?limit=2&offset=4')
+
+    def test_paginate_deep_offset_with_next_cursor(self):
+        request = Mock()
+        request.query_params = {'limit': 20, 'offset': 90}
+        request.build_absolute_uri.return_value = 'http://testserver/api/?offset=90&limit=20'
+        query = self._query(200, [{'id': 3, 'count': 2}, {'id': 4, 'count': 1}])
+
+        pagination = KeysetPagination()
+        pagination.paginate_keyset_query(query, request)
+
+        expect(decode_cursor(pagination.next_cursor)).to.eq({'after': [1, 4], 'offset': 110})
+        next_link = urlparse(pagination.get_next_link())
+        expect(parse_qs(next_link.query)).to.eq({'limit': ['20'], 'cursor': [pagination.next_cursor]})
+
+    def test_paginate_with_cursor(self):
+        request = Mock()
+        request.query_params = {'limit': 20, 'cursor': encode_cursor({'after': [1, 4], 'offset': 110})}
+        query = self._query(120, [{'id': 5, 'count': 1}])
+
+        pagination = KeysetPagination()
+        page = pagination.paginate_keyset_query(query, request)
+
+        query.page.assert_called_with(20, offset=110, after=[1, 4])
+        expect(page).to.eq([{'id': 5, 'count': 1}])
+        expect(pagination.offset).to.eq(110)
+        expect(pagination.get_next_link()).to.be.none()
+
+    def test_paginate_empty_query(self):
+        request = Mock()
+        request.query_params = {}
+        query = self._query(0, [])
+
+        expect(KeysetPagination().paginate_keyset_query(query, request)).to.eq([])
+        query.page.assert_not_called()
+
+    def test_paginate_with_invalid_cursor(self):
+        request = Mock()
+        request.query_params = {'cursor': 'invalid'}
+
+        expect(lambda: KeysetPagination().paginate_keyset_query(self._query(1, []), request)).to.throw(NotFound)
+
+    def test_paginate_with_invalid_cursor_sort_key(self):
+        for after in [['1', 4], [1], [1, 4, 5], [1, None], [1.5, 4], [True, 4]]:
+            request = Mock()
+            request.query_params = {'cursor': encode_cursor({'after': after, 'offset': 110})}
+            query = self._query(120, [])
+
+            expect(lambda: KeysetPagination().paginate_keyset_query(query, request)).to.throw(NotFound)
+            query.page.assert_not_called()
+
+    def test_paginate_with_negative_cursor_offset(self):
+        request = Mock()
+        request.query_params = {'cursor': encode_cursor({'after': [1, 4], 'offset': -1})}
+
+        expect(lambda: KeysetPagination().paginate_keyset_query(self._query(1, []), request)).to.throw(NotFound)
@@ -1,8 +1,22 @@
-from django.test import TestCase
+from datetime import datetime
 
+import pytz
+from django.core.cache import cache as django_cache
+from django.test import TestCase, override_settings
+
+from mock import patch
 from robber.expect import expect
 
-from pinboard.queries import ComplaintSummaryQuery, TrrSummaryQuery, OfficersSummaryQuery, ComplainantsSummaryQuery
+from pinboard.queries import (
+    ComplaintSummaryQuery,
+    TrrSummaryQuery,
+    OfficersSummaryQuery,
+    ComplainantsSummaryQuery,
+    RelevantCoaccusalsQuery,
+    CachedRelevanceQuery,
+    RelevantComplaintsQuery,
+    RelevantDocumentsQuery,
+)
 from pinboard.factories import PinboardFactory
 from trr.factories import TRRFactory, ActionResponseFactory
 from data.factories import (
@@ -11,6 +25,10 @@ from data.factories import (
     AllegationCategoryFactory,
     OfficerAllegationFactory,
     ComplainantFactory,
+    PoliceUnitFactory,
+    InvestigatorAllegationFactory,
+    PoliceWitnessFactory,
+    AttachmentFileFactory,
 )
 
 
@@ -177,7 +195,10 @@ class OfficersSummaryQueryTestCase(TestCase):
             allegations=(pinboard_allegation,),
             officers=(pinboard_officer1, pinboard_officer2, pinboard_officer3)
         )
-        query_results = dict(OfficersSummaryQuery(pinboard).query())
+        pinboard.resolution
+
+        with self.assertNumQueries(1):
+            query_results = dict(OfficersSummaryQuery(pinboard).query())
         expect(list(query_results['race'])).to.eq([
             {'race': 'Black', 'percentage': 0.14},
             {'race': 'White', 'percentage': 0.43},
@@ -232,7 +253,10 @@ class ComplainantsSummaryQueryTestCase(TestCase):
             allegations=(pinboard_allegation,),
             officers=(pinboard_officer,)
         )
-        query_results = dict(ComplainantsSummaryQuery(pinboard).query())
+        pinboard.resolution
+
+        with self.assertNumQueries(1):
+            query_results = dict(ComplainantsSummaryQuery(pinboard).query())
         expect(list(query_results['race'])).to.eq([
             {'race': 'Black', 'percentage': 0.3},
             {'race': 'White', 'percentage': 0.4},
@@ -244,3 +268,181 @@ class ComplainantsSummaryQueryTestCase(TestCase):
             {'gender': 'F', 'percentage': 0.5},
             {'gender': 'Unknown', 'percentage': 0.3}
         ])
+
+    def test_query_count_each_allegation_once(self):
+        officer = OfficerFactory(race='White', gender='F')
+        allegation = AllegationFactory()
+        ComplainantFactory(allegation=allegation, gender='F', race='White')
+        ComplainantFactory(allegation=AllegationFactory(), gender='M', race='Black')
+        OfficerAllegationFactory(allegation=allegation, officer=officer)
+
+        pinboard = PinboardFactory(allegations=(allegation,))
+        query_results = ComplainantsSummaryQuery(pinboard).query()
+
+        expect(query_results).to.eq({
+            'race': [
+                {'race': 'Black', 'percentage': 0.0},
+                {'race': 'White', 'percentage': 1.0},
+                {'race': 'Hispanic', 'percentage': 0.0},
+                {'race': 'Other', 'percentage': 0.0}
+            ],
+            'gender': [
+                {'gender': 'M', 'percentage': 0.0},
+                {'gender': 'F', 'percentage': 1.0},
+                {'gender': 'Unknown', 'percentage': 0.0}
+            ]
+        })
+
+
+class RelevantCoaccusalsQueryTestCase(TestCase):
+    def setUp(self):
+        pinned_officer_1 = OfficerFactory(id=1)
+        pinned_officer_2 = OfficerFactory(id=2)
+        pinned_allegation = AllegationFactory(crid='1')
+        unit = PoliceUnitFactory(id=4, unit_name='004', description='District 004')
+
+        coaccusal_11 = OfficerFactory(id=11, last_unit=unit)
+        coaccusal_12 = OfficerFactory(id=12)
+        coaccusal_13 = OfficerFactory(id=13)
+        OfficerFactory(id=99)
+
+        for allegation in AllegationFactory.create_batch(2):
+            OfficerAllegationFactory(allegation=allegation, officer=pinned_officer_1)
+            OfficerAllegationFactory(allegation=allegation, officer=coaccusal_11)
+        allegation = AllegationFactory()
+        OfficerAllegationFactory(allegation=allegation, officer=pinned_officer_2)
+        OfficerAllegationFactory(allegation=allegation, officer=coaccusal_11)
+        OfficerAllegationFactory(allegation=allegation, officer=pinned_officer_1)
+
+        OfficerAllegationFactory(allegation=pinned_allegation, officer=coaccusal_12)
+        trr = TRRFactory(officer=coaccusal_13)
+
+        self.pinboard = PinboardFactory(
+            officers=[pinned_officer_1, pinned_officer_2],
+            allegations=[pinned_allegation],
+            trrs=[trr],
+        )
+
+    def test_count(self):
+        expect(RelevantCoaccusalsQuery(self.pinboard).count()).to.eq(3)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_count_cached_per_pinboard_version(self):
+        django_cache.clear()
+
+        with patch.object(RelevantCoaccusalsQuery, 'compute_count', return_value=3) as compute_count:
+            expect(RelevantCoaccusalsQuery(self.pinboard).count()).to.eq(3)
+            expect(RelevantCoaccusalsQuery(self.pinboard).count()).to.eq(3)
+            expect(compute_count).to.be.called_once()
+
+            self.pinboard.save()
+            RelevantCoaccusalsQuery(self.pinboard).count()
+            expect(compute_count.call_count).to.eq(2)
+
+    def test_ranking(self):
+        query = RelevantCoaccusalsQuery(self.pinboard)
+
+        expect(query.ranking()).to.eq([(11, 3), (12, 1), (13, 1)])
+        expect(query.ranking(limit=2)).to.eq([(11, 3), (12, 1)])
+        expect(query.ranking(limit=2, offset=1)).to.eq([(12, 1), (13, 1)])
+        expect(query.ranking(limit=2, after=[3, 11])).to.eq([(12, 1), (13, 1)])
+        expect(query.ranking(after=[1, 12])).to.eq([(13, 1)])
+
+    def test_page(self):
+        query = RelevantCoaccusalsQuery(self.pinboard)
+        expect(self.pinboard.resolution.officer_ids).to.eq([1, 2])
+
+        with self.assertNumQueries(2):
+            page = query.page(limit=2)
+
+        expect([(officer.id, officer.coaccusal_count) for officer in page]).to.eq([(11, 3), (12, 1)])
+        expect(page[0].unit_id).to.eq(4)
+        expect(page[0].unit_name).to.eq('004')
+        expect(page[0].unit_description).to.eq('District 004')
+        expect(page[1].unit_id).to.be.none()
+        expect(query.sort_key(page[1])).to.eq([1, 12])
+
+    def test_empty_pinboard(self):
+        query = RelevantCoaccusalsQuery(PinboardFactory())
+
+        expect(query.count()).to.eq(0)
+        expect(query.page()).to.eq([])
+
+
+class CachedRelevanceQueryTestCase(TestCase):
+    def test_raise_NotImplementedError(self):
+        query = CachedRelevanceQuery(PinboardFactory())
+
+        expect(lambda: query.ranked_ids()).to.throw(NotImplementedError)
+        expect(lambda: query.page_queryset([])).to.throw(NotImplementedError)
+
+
+class RelevantComplaintsQueryTestCase(TestCase):
+    def setUp(self):
+        pinned_officer = OfficerFactory(id=1)
+        pinned_allegation = AllegationFactory(crid='1', incident_date=datetime(2004, 1, 1, tzinfo=pytz.utc))
+        allegation_2 = AllegationFactory(crid='2', incident_date=datetime(2002, 1, 1, tzinfo=pytz.utc))
+        allegation_3 = AllegationFactory(crid='3', incident_date=datetime(2003, 1, 1, tzinfo=pytz.utc))
+        allegation_4 = AllegationFactory(crid='4', incident_date=datetime(2003, 1, 1, tzinfo=pytz.utc))
+        AllegationFactory(crid='5')
+
+        OfficerAllegationFactory(officer=pinned_officer, allegation=pinned_allegation)
+        OfficerAllegationFactory(officer=pinned_officer, allegation=allegation_2)
+        InvestigatorAllegationFactory(investigator__officer=pinned_officer, allegation=allegation_4)
+        InvestigatorAllegationFactory(investigator__officer=pinned_officer, allegation=allegation_2)
+        PoliceWitnessFactory(officer=pinned_officer, allegation=allegation_3)
+
+        self.pinboard = PinboardFactory(officers=[pinned_officer], allegations=[pinned_allegation])
+
+    def test_ranked_ids(self):
+        expect(RelevantComplaintsQuery(self.pinboard).ranked_ids()).to.eq(['3', '4', '2'])
+
+    def test_ranked_ids_without_pinned_officers(self):
+        expect(RelevantComplaintsQuery(PinboardFactory()).ranked_ids()).to.eq([])
+
+    def test_page(self):
+        query = RelevantComplaintsQuery(self.pinboard)
+
+        expect(query.count()).to.eq(3)
+        expect([allegation.crid for allegation in query.page(limit=2)]).to.eq(['3', '4'])
+        expect([allegation.crid for allegation in query.page(limit=2, offset=1)]).to.eq(['4', '2'])
+        expect([allegation.crid for allegation in query.page(limit=2, after=['4'])]).to.eq(['2'])
+        expect([allegation.crid for allegation in query.page(offset=2, after=['999'])]).to.eq(['2'])
+        expect(query.sort_key(query.page(limit=1)[0])).to.eq(['3'])
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_ids_cached_per_pinboard_version(self):
+        django_cache.clear()
+
+        with patch.object(RelevantComplaintsQuery, 'ranked_ids', return_value=['3', '4', '2']) as ranked_ids:
+            expect(RelevantComplaintsQuery(self.pinboard).ids).to.eq(['3', '4', '2'])
+            expect(RelevantComplaintsQuery(self.pinboard).count()).to.eq(3)
+            expect(ranked_ids).to.be.called_once()
+
+            self.pinboard.save()
+            RelevantComplaintsQuery(self.pinboard).count()
+            expect(ranked_ids.call_count).to.eq(2)
+
+
+class RelevantDocumentsQueryTestCase(TestCase):
+    def test_page(self):
+        pinned_officer = OfficerFactory(id=1)
+        pinned_allegation = AllegationFactory(crid='1', incident_date=datetime(2004, 1, 1, tzinfo=pytz.utc))
+        allegation_2 = AllegationFactory(crid='2', incident_date=datetime(2002, 1, 1, tzinfo=pytz.utc))
+        OfficerAllegationFactory(officer=pinned_officer, allegation=allegation_2)
+        AttachmentFileFactory(id=1, file_type='document', allegation=allegation_2)
+        AttachmentFileFactory(id=2, file_type='document', allegation=pinned_allegation)
+        AttachmentFileFactory(id=3, file_type='document', allegation=allegation_2)
+        AttachmentFileFactory(id=4, file_type='audio', allegation=allegation_2)
+        AttachmentFileFactory(id=5, file_type='document', allegation=allegation_2, show=False)
+        AttachmentFileFactory(id=6, file_type='document')
+
+        pinboard = PinboardFactory(officers=[pinned_officer], allegations=[pinned_allegation])
+        query = RelevantDocumentsQuery(pinboard)
+
+        expect(query.ranked_ids()).to.eq([2, 1, 3])
+        expect(query.count()).to.eq(3)
+        expect([document.id for document in query.page(limit=2, after=[2])]).to.eq([1, 3])
+
+    def test_ranked_ids_of_empty_pinboard(self):
+        expect(RelevantDocumentsQuery(PinboardFactory()).ranked_ids()).to.eq([])
@@ -0,0 +1,98 @@
+from django.core.cache import cache as django_cache
+from django.test import TestCase, override_settings
+
+from mock import patch
+from robber import expect
+
+from data.factories import OfficerFactory, AllegationFactory, OfficerAllegationFactory
+from pinboard.factories import PinboardFactory
+from pinboard.models import Pinboard
+from pinboard.resolution import PinboardResolution, resolve, resolution_cache_key
+from trr.factories import TRRFactory
+
+
+class PinboardResolutionTestCase(TestCase):
+    def test_compute(self):
+        officer_1 = OfficerFactory(id=1)
+        officer_2 = OfficerFactory(id=2)
+        officer_3 = OfficerFactory(id=3)
+        officer_4 = OfficerFactory(id=4)
+        OfficerFactory(id=5)
+        allegation_1 = AllegationFactory(crid='123')
+        allegation_2 = AllegationFactory(crid='456')
+        OfficerAllegationFactory(officer=officer_3, allegation=allegation_1)
+        OfficerAllegationFactory(officer=officer_1, allegation=allegation_1)
+        OfficerAllegationFactory(officer=None, allegation=allegation_2)
+        trr_1 = TRRFactory(id=10, officer=officer_4)
+        trr_2 = TRRFactory(id=11, officer=officer_3)
+
+        pinboard = PinboardFactory(
+            officers=[officer_2, officer_1],
+            allegations=[allegation_2, allegation_1],
+            trrs=[trr_1, trr_2],
+        )
+
+        with self.assertNumQueries(4):
+            resolution = PinboardResolution.compute(pinboard)
+
+        expect(resolution.officer_ids).to.eq([2, 1])
+        expect(resolution.crids).to.eq(['456', '123'])
+        expect(resolution.trr_ids).to.eq([10, 11])
+        expect(resolution.all_officer_ids).to.eq([1, 2, 3, 4])
+
+    def test_compute_only_pinned_officers(self):
+        officer = OfficerFactory(id=1)
+        pinboard = PinboardFactory(officers=[officer])
+
+        with self.assertNumQueries(3):
+            resolution = PinboardResolution.compute(pinboard)
+
+        expect(resolution.to_dict()).to.eq({
+            'officer_ids': [1],
+            'crids': [],
+            'trr_ids': [],
+            'all_officer_ids': [1],
+        })
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ResolveTestCase(TestCase):
+    def setUp(self):
+        django_cache.clear()
+
+    def test_resolution_cache_key(self):
+        pinboard = PinboardFactory(id='aaaa1111')
+
+        expect(resolution_cache_key(pinboard)).to.eq(
+            f'pinboard-resolution:aaaa1111:{pinboard.updated_at.isoformat()}'
+        )
+
+    def test_resolve_once_per_pinboard_version(self):
+        pinboard = PinboardFactory(id='aaaa1111', officers=[OfficerFactory(id=1)])
+
+        with patch('pinboard.resolution.PinboardResolution.compute', wraps=PinboardResolution.compute) as compute:
+            expect(resolve(pinboard).officer_ids).to.eq([1])
+            expect(resolve(Pinboard.objects.get(id='aaaa1111')).officer_ids).to.eq([1])
+            expect(compute).to.be.called_once()
+
+            pinboard.officers.add(OfficerFactory(id=2))
+            pinboard.save()
+
+            expect(resolve(Pinboard.objects.get(id='aaaa1111')).officer_ids).to.eq([1, 2])
+            expect(compute.call_count).to.eq(2)
+
+    def test_pinboard_resolution(self):
+        officer_1 = OfficerFactory(id=1)
+        officer_2 = OfficerFactory(id=2)
+        pinboard = PinboardFactory(officers=[officer_1], trrs=[TRRFactory(id=10, officer=officer_2)])
+        pinboard = Pinboard.objects.get(id=pinboard.id)
+
+        with self.assertNumQueries(4):
+            expect(pinboard.officer_ids).to.eq([1])
+            expect(pinboard.trr_ids).to.eq([10])
+            expect(pinboard.crids).to.eq([])
+            expect(pinboard.all_officer_ids).to.eq([1, 2])
+
+        pinboard = Pinboard.objects.get(id=pinboard.id)
+        with self.assertNumQueries(0):
+            expect(pinboard.all_officer_ids).to.eq([1, 2])
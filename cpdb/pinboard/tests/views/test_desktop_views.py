@@ -387,6 +387,75 @@ class PinboardDesktopViewSetTestCase(APITestCase):
 
         expect(response.status_code).to.eq(status.HTTP_403_FORBIDDEN)
 
+    def test_add_pins(self):
+        OfficerFactory(id=1)
+        OfficerFactory(id=2)
+        OfficerFactory(id=3)
+        AllegationFactory(crid='123abc')
+        AllegationFactory(crid='456def')
+        TRRFactory(id=1, officer=OfficerFactory(id=4))
+
+        response = self.client.post(
+            reverse('api-v2:pinboards-list'),
+            json.dumps({
+                'title': 'My Pinboard',
+                'officer_ids': [2],
+                'crids': ['456def'],
+                'trr_ids': [],
+                'description': 'abc',
+            }),
+            content_type='application/json'
+        )
+        pinboard_id = response.data['id']
+
+        response = self.client.post(
+            reverse('api-v2:pinboards-add-pins', kwargs={'pk': pinboard_id}),
+            json.dumps({
+                'officer_ids': [3, 2, 1, 999],
+                'crids': ['123abc'],
+                'trr_ids': [1],
+            }),
+            content_type='application/json'
+        )
+
+        expect(response.status_code).to.eq(status.HTTP_200_OK)
+        expect(response.data).to.eq({
+            'id': pinboard_id,
+            'title': 'My Pinboard',
+            'officer_ids': [2, 3, 1],
+            'crids': ['456def', '123abc'],
+            'trr_ids': [1],
+            'description': 'abc',
+        })
+
+    def test_add_pins_bad_request(self):
+        response = self.client.post(
+            reverse('api-v2:pinboards-list'),
+            json.dumps({'title': 'My Pinboard'}),
+            content_type='application/json'
+        )
+
+        response = self.client.post(
+            reverse('api-v2:pinboards-add-pins', kwargs={'pk': response.data['id']}),
+            json.dumps({'officer_ids': ['abc']}),
+            content_type='application/json'
+        )
+
+        expect(response.status_code).to.eq(status.HTTP_400_BAD_REQUEST)
+
+    def test_add_pins_out_of_session(self):
+        OfficerFactory(id=1)
+        pinboard = PinboardFactory(id='aaaa1111')
+
+        response = self.client.post(
+            reverse('api-v2:pinboards-add-pins', kwargs={'pk': 'aaaa1111'}),
+            json.dumps({'officer_ids': [1]}),
+            content_type='application/json'
+        )
+
+        expect(response.status_code).to.eq(status.HTTP_403_FORBIDDEN)
+        expect(list(pinboard.officers.all())).to.eq([])
+
     def test_create_pinboard(self):
         OfficerFactory(id=1)
         OfficerFactory(id=2)
@@ -1866,6 +1935,40 @@ class PinboardDesktopViewSetTestCase(APITestCase):
         )
         expect(last_response.data['next']).to.be.none()
 
+    def test_relevant_coaccusals_cursor_pagination(self):
+        pinned_officer = OfficerFactory(id=1)
+        pinned_allegation = AllegationFactory(crid='1')
+        pinboard = PinboardFactory(id='66ef1560')
+        pinboard.officers.set([pinned_officer])
+        pinboard.allegations.set([pinned_allegation])
+
+        allegation = AllegationFactory(crid='2')
+        OfficerAllegationFactory(allegation=allegation, officer=pinned_officer)
+        officers = [OfficerFactory(id=officer_id) for officer_id in range(101, 221)]
+        for officer in officers:
+            OfficerAllegationFactory(allegation=allegation, officer=officer)
+        OfficerAllegationFactory(allegation=pinned_allegation, officer=officers[0])
+
+        base_url = reverse('api-v2:pinboards-relevant-coaccusals', kwargs={'pk': '66ef1560'})
+        response = self.client.get(f"{base_url}?{urlencode({'limit': 20, 'offset': 80})}")
+
+        expect(response.status_code).to.eq(status.HTTP_200_OK)
+        expect(response.data['count']).to.eq(120)
+        expect([officer['id'] for officer in response.data['results']]).to.eq(list(range(181, 201)))
+        expect([officer['coaccusal_count'] for officer in response.data['results']]).to.eq([1] * 20)
+        expect(response.data['next']).to.contain('cursor=')
+        expect(response.data['next']).not_to.contain('offset=')
+
+        next_response = self.client.get(response.data['next'])
+
+        expect(next_response.status_code).to.eq(status.HTTP_200_OK)
+        expect(next_response.data['count']).to.eq(120)
+        expect([officer['id'] for officer in next_response.data['results']]).to.eq(list(range(201, 221)))
+        expect(next_response.data['previous']).to.eq(
+            'http://testserver/api/v2/pinboards/66ef1560/relevant-coaccusals/?limit=20&offset=80'
+        )
+        expect(next_response.data['next']).to.be.none()
+
     def test_relevant_complaints_via_accused_officers(self):
         pinned_officer_1 = OfficerFactory(
             id=1,
@@ -3084,3 +3187,50 @@ class PinboardDesktopViewSetTestCase(APITestCase):
             {'gender': 'F', 'percentage': 0.5},
             {'gender': 'Unknown', 'percentage': 0.3}
         ])
+
+    def test_summary(self):
+        officer = OfficerFactory(race='White', gender='M')
+        allegation = AllegationFactory()
+        OfficerAllegationFactory(
+            allegation=allegation,
+            officer=officer,
+            allegation_category=AllegationCategoryFactory(category='Illegal Search')
+        )
+        ComplainantFactory(allegation=allegation, gender='F', race='Black')
+        trr = TRRFactory(officer=officer)
+        ActionResponseFactory(trr=trr, force_type='Verbal Commands')
+
+        pinboard = PinboardFactory(officers=(officer,))
+
+        response = self.client.get(reverse('api-v2:pinboards-summary', kwargs={'pk': pinboard.id}))
+        expect(response.status_code).to.eq(status.HTTP_200_OK)
+        expect(response.data).to.eq({
+            'complaint_summary': [{'category': 'Illegal Search', 'count': 1}],
+            'trr_summary': [{'force_type': 'Verbal Commands', 'count': 1}],
+            'officers_summary': {
+                'race': [
+                    {'race': 'Black', 'percentage': 0.0},
+                    {'race': 'White', 'percentage': 1.0},
+                    {'race': 'Hispanic', 'percentage': 0.0},
+                    {'race': 'Other', 'percentage': 0.0}
+                ],
+                'gender': [
+                    {'gender': 'M', 'percentage': 1.0},
+                    {'gender': 'F', 'percentage': 0.0},
+                    {'gender': 'Unknown', 'percentage': 0.0}
+                ]
+            },
+            'complainants_summary': {
+                'race': [
+                    {'race': 'Black', 'percentage': 1.0},
+                    {'race': 'White', 'percentage': 0.0},
+                    {'race': 'Hispanic', 'percentage': 0.0},
+                    {'race': 'Other', 'percentage': 0.0}
+                ],
+                'gender': [
+                    {'gender': 'M', 'percentage': 0.0},
+                    {'gender': 'F', 'percentage': 1.0},
+                    {'gender': 'Unknown', 'percentage': 0.0}
+                ]
+            },
+        })
@@ -15,7 +15,8 @@ from pinboard.serializers.pinboard_serializer import (
     PinboardSerializer,
     PinboardDetailSerializer,
     ListPinboardDetailSerializer,
-    OrderedPinboardSerializer
+    OrderedPinboardSerializer,
+    PinsSerializer,
 )
 from pinboard.serializers.desktop.admin.pinboard_serializer import PinboardSerializer as PinboardAdminSerializer
 from pinboard.serializers.desktop.pinned import (
@@ -40,7 +41,16 @@ from pinboard.serializers.mobile.relevant import (
 )
 from trr.models import ActionResponse
 from .models import Pinboard, ProxyAllegation as Allegation
-from .queries import ComplaintSummaryQuery, TrrSummaryQuery, OfficersSummaryQuery, ComplainantsSummaryQuery
+from .pagination import KeysetPagination
+from .queries import (
+    ComplaintSummaryQuery,
+    TrrSummaryQuery,
+    OfficersSummaryQuery,
+    ComplainantsSummaryQuery,
+    RelevantCoaccusalsQuery,
+    RelevantComplaintsQuery,
+    RelevantDocumentsQuery,
+)
 
 
 @method_decorator(never_cache, name='dispatch')
@@ -137,6 +147,17 @@ class PinboardViewSet(
                 return Response(status=status.HTTP_200_OK)
         return Response(status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=True, methods=['POST'], url_path='pins')
+    def add_pins(self, request, pk):
+        if str(pk) not in request.session.get('owned_pinboards', []):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        serializer = PinsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        pinboard = get_object_or_404(Pinboard, id=pk)
+        pinboard.add_pins(**serializer.validated_data)
+        return Response(OrderedPinboardSerializer(pinboard).data)
+
     @action(detail=False, methods=['GET'], url_path='latest-retrieved-pinboard')
     def latest_retrieved_pinboard(self, request):
         if ('latest_retrieved_pinboard' in request.session) and \
@@ -176,8 +197,8 @@ class PinboardViewSet(
         queryset = Pinboard.objects.all()
         pinboard = get_object_or_404(queryset, id=pk)
 
-        paginator = self.pagination_class()
-        relevant_coaccusals = paginator.paginate_queryset(pinboard.relevant_coaccusals, request, view=self)
+        paginator = KeysetPagination()
+        relevant_coaccusals = paginator.paginate_keyset_query(RelevantCoaccusalsQuery(pinboard), request, view=self)
         serializer = self.relevant_coaccusal_serializer_class(relevant_coaccusals, many=True)
         return paginator.get_paginated_response(serializer.data)
 
@@ -186,8 +207,8 @@ class PinboardViewSet(
         queryset = Pinboard.objects.all()
         pinboard = get_object_or_404(queryset, id=pk)
 
-        paginator = self.pagination_class()
-        relevant_documents = paginator.paginate_queryset(pinboard.relevant_documents, request, view=self)
+        paginator = KeysetPagination()
+        relevant_documents = paginator.paginate_keyset_query(RelevantDocumentsQuery(pinboard), request, view=self)
         serializer = self.relevant_document_serializer_class(relevant_documents, many=True)
         return paginator.get_paginated_response(serializer.data)
 
@@ -196,8 +217,8 @@ class PinboardViewSet(
         queryset = Pinboard.objects.all()
         pinboard = get_object_or_404(queryset, id=pk)
 
-        paginator = self.pagination_class()
-        relevant_complaints = paginator.paginate_queryset(pinboard.relevant_complaints, request, view=self)
+        paginator = KeysetPagination()
+        relevant_complaints = paginator.paginate_keyset_query(RelevantComplaintsQuery(pinboard), request, view=self)
         serializer = self.relevant_complaint_serializer_class(relevant_complaints, many=True)
         return paginator.get_paginated_response(serializer.data)
 
@@ -225,6 +246,17 @@ class PinboardViewSet(
         pinboard = get_object_or_404(queryset, id=pk)
         return Response(ComplainantsSummaryQuery(pinboard).query())
 
+    @action(detail=True, methods=['get'], url_path='summary')
+    def summary(self, request, pk):
+        queryset = Pinboard.objects.all()
+        pinboard = get_object_or_404(queryset, id=pk)
+        return Response({
+            'complaint_summary': list(ComplaintSummaryQuery(pinboard).query()),
+            'trr_summary': list(TrrSummaryQuery(pinboard).query()),
+            'officers_summary': OfficersSummaryQuery(pinboard).query(),
+            'complainants_summary': ComplainantsSummaryQuery(pinboard).query(),
+        })
+
     @property
     def _source_pinboard(self):
         from_pinboard_id = self.request.data.get('source_pinboard_id', None)
@@ -15,3 +15,18 @@ autocomplete_search = analyzer(
     filter=['lowercase'],
     tokenizer=tokenizer('autocomplete_search', 'pattern', pattern='[^a-zA-Z0-9]+')
 )
+
+autocomplete_prefix = analyzer(
+    'autocomplete_prefix',
+    filter=['lowercase'],
+    tokenizer=tokenizer(
+        'autocomplete_prefix', 'edge_ngram', min_gram=1, max_gram=20, token_chars=['letter', 'digit']
+    )
+)
+
+exact_name = analyzer(
+    'exact_name',
+    char_filter=[analysis.char_filter('collapse_white_spaces', 'pattern_replace', pattern='\\s+', replacement=' ')],
+    filter=['lowercase', 'trim'],
+    tokenizer='keyword'
+)
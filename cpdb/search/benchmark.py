@@ -0,0 +1,124 @@
+import json
+import math
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+
+import numpy as np
+
+from analytics.models import SearchTracking
+from search.services import SearchManager
+
+LATENCY_PERCENTILES = (50, 95, 99)
+
+
+def export_search_queries(limit=None):
+    queries = SearchTracking.objects.order_by('-usages', 'query').values('query', 'usages')
+    return list(queries[:limit] if limit else queries)
+
+
+def load_search_queries(file_name):
+    """
+    Read a query corpus: a json list of query strings or of {"query": ..., "usages": ...} objects, the format
+    written by export_search_queries.
+    """
+    with open(file_name) as f:
+        return [item if isinstance(item, str) else item['query'] for item in json.load(f)]
+
+
+def latency_stats(durations):
+    if not durations:
+        return {'count': 0}
+
+    stats = {'count': len(durations), 'mean': round(float(np.mean(durations)), 2)}
+    for percentile, value in zip(LATENCY_PERCENTILES, np.percentile(durations, LATENCY_PERCENTILES)):
+        stats[f'p{percentile}'] = round(float(value), 2)
+    return stats
+
+
+def ndcg(result_ids, golden_ids):
+    """
+    Normalized discounted cumulative gain of a result list against the golden one, which is taken as the ideal
+    ranking: the first golden result is worth the most, the last one the least.
+    """
+    if not golden_ids:
+        return 1.0 if not result_ids else 0.0
+
+    gains = {result_id: len(golden_ids) - index for index, result_id in enumerate(golden_ids)}
+    dcg = sum(gains.get(result_id, 0) / math.log2(index + 2) for index, result_id in enumerate(result_ids))
+    ideal_dcg = sum(gain / math.log2(index + 2) for index, gain in enumerate(gains.values()))
+    return dcg / ideal_dcg
+
+
+class SearchBenchmark(object):
+    """
+    Replays search terms through SearchManager with the workers and formatters of a search view, bypassing the
+    result cache and search hooks, and measures latency, throughput and ranking.
+    """
+    def __init__(self, workers, formatters, limit=10, autocomplete=False):
+        self.workers = workers
+        self.formatters = formatters
+        self.limit = limit
+        self.autocomplete = autocomplete
+
+    def search(self, term):
+        search_manager = SearchManager(workers=self.workers, formatters=self.formatters)
+        response = search_manager._search(term, None, self.limit, self.autocomplete)
+        return search_manager.timings, response
+
+    def run(self, terms, concurrency=1):
+        start_time = time()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(self.search, terms))
+        elapsed = time() - start_time
+
+        msearch_durations = []
+        content_type_durations = defaultdict(list)
+        worker_durations = defaultdict(list)
+        for timings, _ in results:
+            timings = dict(timings)
+            msearch_durations.append(timings.pop('msearch'))
+            for content_type, took in timings.items():
+                content_type_durations[content_type].append(took)
+                worker_durations[type(self.workers[content_type]).__name__].append(took)
+
+        report = {
+            'queries': len(results),
+            'concurrency': concurrency,
+            'elapsed': round(elapsed, 2),
+            'throughput': round(len(results) / elapsed, 2) if elapsed else None,
+            'latency': latency_stats(msearch_durations),
+            'content_types': {
+                content_type: latency_stats(durations) for content_type, durations in content_type_durations.items()
+            },
+            'workers': {name: latency_stats(durations) for name, durations in worker_durations.items()},
+        }
+        return report, dict(zip(terms, (response for _, response in results)))
+
+    @staticmethod
+    def get_ranking(responses):
+        return {
+            term: {content_type: [item['id'] for item in items] for content_type, items in response.items()}
+            for term, response in responses.items()
+        }
+
+    def relevance(self, golden, responses):
+        """
+        Mean nDCG over every golden query and content type, with the pairs that do not match the golden
+        ranking listed worst first.
+        """
+        ranking = self.get_ranking(responses)
+        scores = []
+        for term, golden_content_types in golden.items():
+            for content_type, golden_ids in golden_content_types.items():
+                result_ids = ranking.get(term, {}).get(content_type, [])
+                scores.append((term, content_type, ndcg(result_ids, golden_ids)))
+
+        return {
+            'ndcg': round(float(np.mean([score for _, _, score in scores])), 4) if scores else None,
+            'regressions': [
+                {'query': term, 'content_type': content_type, 'ndcg': round(score, 4)}
+                for term, content_type, score in sorted(scores, key=lambda item: item[2])
+                if score < 1
+            ],
+        }
@@ -0,0 +1,78 @@
+import logging
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from es_index.utils import get_index_version
+
+logger = logging.getLogger(__name__)
+
+SEARCH_RESULT_CACHE_TIMEOUT = 5 * 60
+SEARCH_RESULT_CACHE_MAX_SIZE = 2000
+
+
+def normalize_term(term):
+    return ' '.join(term.lower().split())
+
+
+class SearchResultCache(object):
+    """
+    In-process cache of formatted search results with a TTL per entry and least recently used eviction once
+    `max_size` entries are held. Keys include the shared index version, which IndexAlias.indexing bumps
+    whenever an alias is switched, so results from a replaced index are never served.
+    """
+    def __init__(self, timeout=SEARCH_RESULT_CACHE_TIMEOUT, max_size=SEARCH_RESULT_CACHE_MAX_SIZE):
+        self.timeout = timeout
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute):
+        """
+        :param key: hashable tuple identifying the result, e.g. the normalized term, content type, limit and offset
+        :param compute: function to compute the result on a miss
+        :return: tuple of the result and whether it was served from the cache
+        """
+        key = (get_index_version(),) + tuple(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], True
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = (monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        if (self.hits + self.misses) % 1000 == 0:
+            logger.info(f'Search result cache: {self.stats()}')
+        return value, False
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0,
+            'size': len(self._entries),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+search_result_cache = SearchResultCache()
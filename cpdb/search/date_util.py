@@ -1,4 +1,6 @@
 import re
+from datetime import datetime
+from functools import lru_cache
 
 from dateparser.search import search_dates
 from dateparser import parse
@@ -13,11 +15,25 @@ DELIMITERS_PATTERN = r'[/\:\-\,\s\_\+\@]'
 COMPONENT_PATTERN = fr'({MONTHS_PATTERN}|{DIGITS_MODIFIER_PATTERN}|{DIGITS_PATTERN})\,?'
 DATE_PATTERN = f'^({COMPONENT_PATTERN})({DELIMITERS_PATTERN}({COMPONENT_PATTERN}))*$'
 SPLIT_DATE_TOKEN = 'SPLIT_DATE_TOKEN'
+DATE_REGEX = re.compile(DATE_PATTERN)
+DIGIT_REGEX = re.compile(r'\d')
+YEAR_MONTH_DAY_REGEX = re.compile(r'^(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})$')
+MONTH_DAY_YEAR_REGEX = re.compile(r'^(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4})$')
+MONTH_NAME_DAY_YEAR_REGEX = re.compile(
+    fr'^(?P<month_name>{MONTHS_PATTERN}) (?P<day>\d{{1,2}})(st|nd|rd|th)?,? (?P<year>\d{{4}})$'
+)
+MONTH_NUMBERS = {
+    name: index
+    for index, month in enumerate(MONTHS_PATTERN.split('|')[:12], start=1)
+    for name in (month, month[:3])
+}
+MONTH_NUMBERS['sept'] = 9
+DATES_MEMO_SIZE = 1024
 
 
 def _remove_illegal_words(string):
     string = re.sub(' +', ' ', string.lower())
-    legal_words = [term if re.match(DATE_PATTERN, term) else SPLIT_DATE_TOKEN for term in string.split()]
+    legal_words = [term if DATE_REGEX.match(term) else SPLIT_DATE_TOKEN for term in string.split()]
     return ' '.join(legal_words)
 
 
@@ -36,8 +52,29 @@ def _search_first_date(string):
     return None, ''
 
 
-def find_dates_from_string(string):
-    string = _remove_illegal_words(string)
+def _parse_common_date(string):
+    match = YEAR_MONTH_DAY_REGEX.match(string) or MONTH_DAY_YEAR_REGEX.match(string) \
+        or MONTH_NAME_DAY_YEAR_REGEX.match(string)
+    if not match:
+        return None
+
+    parts = match.groupdict()
+    month = MONTH_NUMBERS[parts['month_name']] if 'month_name' in parts else int(parts['month'])
+    try:
+        return datetime(int(parts['year']), month, int(parts['day']))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=DATES_MEMO_SIZE)
+def _find_dates(string):
+    # a complete date needs a year, so without any digit dateparser can not find one
+    if not DIGIT_REGEX.search(string):
+        return ()
+
+    date = _parse_common_date(string)
+    if date:
+        return (date,)
 
     dates = []
     date, remaining = _search_first_date(string)
@@ -49,4 +86,13 @@ def find_dates_from_string(string):
         if date and date not in dates:
             dates.append(date)
 
-    return dates
+    return tuple(dates)
+
+
+def find_dates_from_string(string):
+    """
+    Dates found in a search term. Terms made of a single common format (YYYY-MM-DD, MM/DD/YYYY or
+    "Month D YYYY") are parsed directly and terms without any digit are skipped, leaving dateparser for the
+    rest. Results are memoized per normalized term.
+    """
+    return list(_find_dates(_remove_illegal_words(string).strip()))
@@ -0,0 +1,83 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from search.benchmark import SearchBenchmark, export_search_queries, load_search_queries
+from search.views import SearchV1ViewSet, SearchV2ViewSet
+
+SEARCH_VIEWSETS = {
+    'v1': SearchV1ViewSet,
+    'v2': SearchV2ViewSet,
+}
+
+
+class Command(BaseCommand):
+    help = 'Replay a corpus of search queries against Elasticsearch and report latency, throughput and relevance'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', help='Json query corpus to replay instead of the tracked searches')
+        parser.add_argument(
+            '--tracked-queries', type=int, default=500, help='Number of most used tracked searches to replay'
+        )
+        parser.add_argument('--export-queries', help='Write the tracked searches corpus to this file and exit')
+        parser.add_argument('--api', choices=SEARCH_VIEWSETS.keys(), default='v1')
+        parser.add_argument('--limit', type=int, default=10)
+        parser.add_argument('--autocomplete', action='store_true', help='Benchmark the autocomplete queries')
+        parser.add_argument('--concurrency', type=int, default=1)
+        parser.add_argument('--repeat', type=int, default=1, help='Number of times to replay the corpus')
+        parser.add_argument('--golden', help='Golden rankings json to score the results against')
+        parser.add_argument('--write-golden', help='Store the rankings of this run as the golden set')
+        parser.add_argument('--output', help='Write the results as json to this file')
+
+    def write_json(self, file_name, data):
+        with open(file_name, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def handle(self, *args, **kwargs):
+        if kwargs['export_queries']:
+            queries = export_search_queries(kwargs['tracked_queries'])
+            self.write_json(kwargs['export_queries'], queries)
+            self.stdout.write(f'Exported {len(queries)} queries to {kwargs["export_queries"]}')
+            return
+
+        if kwargs['queries']:
+            terms = load_search_queries(kwargs['queries'])
+        else:
+            terms = [item['query'] for item in export_search_queries(kwargs['tracked_queries'])]
+
+        golden = {}
+        if kwargs['golden']:
+            with open(kwargs['golden']) as f:
+                golden = json.load(f)
+            terms += [term for term in golden if term not in set(terms)]
+
+        viewset = SEARCH_VIEWSETS[kwargs['api']]
+        benchmark = SearchBenchmark(
+            viewset.workers, viewset.formatters, limit=kwargs['limit'], autocomplete=kwargs['autocomplete']
+        )
+        results, responses = benchmark.run(terms * kwargs['repeat'], concurrency=kwargs['concurrency'])
+        if golden:
+            results['relevance'] = benchmark.relevance(golden, responses)
+
+        if kwargs['write_golden']:
+            self.write_json(kwargs['write_golden'], benchmark.get_ranking(responses))
+        if kwargs['output']:
+            self.write_json(kwargs['output'], results)
+
+        self.report(results)
+
+    def report(self, results):
+        latency = results['latency']
+        self.stdout.write(
+            f'Ran {results["queries"]} searches with concurrency {results["concurrency"]} '
+            f'in {results["elapsed"]}s ({results["throughput"]} searches/sec)'
+        )
+        if latency['count']:
+            self.stdout.write(f'msearch: p50 {latency["p50"]}ms, p95 {latency["p95"]}ms, p99 {latency["p99"]}ms')
+        for content_type, stats in sorted(results['content_types'].items()):
+            self.stdout.write(f'{content_type}: p50 {stats["p50"]}ms, p95 {stats["p95"]}ms, p99 {stats["p99"]}ms')
+        if 'relevance' in results:
+            relevance = results['relevance']
+            self.stdout.write(
+                f'Relevance: nDCG {relevance["ndcg"]}, {len(relevance["regressions"])} rankings differ from golden'
+            )
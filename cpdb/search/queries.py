@@ -1,5 +1,7 @@
+from django.db.models import Case, When, OuterRef, Subquery
+
 from data.models import Officer, Allegation
-from trr.models import TRR
+from trr.models import TRR, ActionResponse
 
 
 class BaseModelQuery(object):
@@ -12,7 +14,8 @@ class BaseModelQuery(object):
         raise NotImplementedError
 
     def query(self):
-        return self.queryset().filter(**{f'{self.query_field}__in': self.ids})
+        preserved = Case(*[When(**{self.query_field: pk}, then=pos) for pos, pk in enumerate(self.ids)])
+        return self.queryset().filter(**{f'{self.query_field}__in': self.ids}).order_by(preserved)
 
 
 class OfficerQuery(BaseModelQuery):
@@ -26,11 +29,14 @@ class CrQuery(BaseModelQuery):
     query_field = 'crid'
 
     def queryset(self):
-        return Allegation.objects
+        return Allegation.objects.select_related('most_common_category')
 
 
 class TrrQuery(BaseModelQuery):
     query_field = 'id'
 
     def queryset(self):
-        return TRR.objects
+        member_actions = ActionResponse.objects.filter(
+            trr=OuterRef('pk'), person='Member Action'
+        ).order_by('-action_sub_category', 'force_type')
+        return TRR.objects.annotate(member_top_force_type=Subquery(member_actions.values('force_type')[:1]))
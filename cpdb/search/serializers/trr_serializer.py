@@ -7,9 +7,15 @@ from shared.serializer import NoNullSerializer
 
 class TRRSerializer(NoNullSerializer):
     id = serializers.IntegerField()
-    force_type = serializers.CharField(max_length=255, source='top_force_type')
+    force_type = serializers.SerializerMethodField()
     trr_datetime = serializers.DateTimeField(format='%Y-%m-%d', default_timezone=pytz.utc)
     type = serializers.SerializerMethodField()
 
+    def get_force_type(self, obj):
+        # TrrQuery annotates the top force type so a batch of TRRs does not query member actions one by one
+        if hasattr(obj, 'member_top_force_type'):
+            return obj.member_top_force_type
+        return obj.top_force_type
+
     def get_type(self, obj):
         return 'TRR'
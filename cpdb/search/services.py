@@ -1,3 +1,9 @@
+import re
+from time import time
+
+from elasticsearch_dsl import MultiSearch
+
+from search.cache import search_result_cache, normalize_term
 from search.date_util import find_dates_from_string
 from search.workers import (
     DateWorker,
@@ -15,6 +21,7 @@ DEFAULT_SEARCH_WORKERS = {
     'COMMUNITY': CommunityWorker(),
     'NEIGHBORHOOD': NeighborhoodsWorker()
 }
+AUTOCOMPLETE_TERM_MAX_LENGTH = 3
 
 
 class SearchManager(object):
@@ -22,23 +29,68 @@ class SearchManager(object):
         self.formatters = formatters or {}
         self.workers = workers or DEFAULT_SEARCH_WORKERS
         self.hooks = hooks or []
+        self.timings = {}
+        self.cache_hit = None
+        # Identifies the worker and formatter setup so views sharing content type names do not share results
+        self.signature = tuple(sorted(
+            (_content_type, type(worker).__name__, self._formatter_for(_content_type).__name__)
+            for _content_type, worker in self.workers.items()
+        ))
+
+    def search(self, term, content_type=None, limit=10, submit=False):
+        """
+        While a short prefix is being typed workers run their cheaper autocomplete query; the full scored
+        query runs for longer terms and once the search is submitted.
+        """
+        self.timings = {}
+        normalized_term = normalize_term(term)
+        autocomplete = not submit and len(normalized_term) <= AUTOCOMPLETE_TERM_MAX_LENGTH
+        response, self.cache_hit = search_result_cache.get_or_compute(
+            ('search', self.signature, normalized_term, content_type, limit, 0, autocomplete),
+            lambda: self._search(term, content_type, limit, autocomplete)
+        )
 
-    def search(self, term, content_type=None, limit=10):
+        for hook in self.hooks:
+            hook.execute(term, content_type, response)
+
+        return response
+
+    def _search(self, term, content_type, limit, autocomplete=False):
         response = {}
 
         _workers = {content_type: self.workers[content_type]} if content_type else self.workers
         search_with_dates = any([isinstance(worker, DateWorker) for worker in _workers.values()])
         dates = [date.strftime('%Y-%m-%d') for date in find_dates_from_string(term)] if search_with_dates else []
 
-        for _content_type, worker in _workers.items():
-            search_results = worker.search(term, size=limit, dates=dates)
-            response[_content_type] = self._formatter_for(_content_type)().format(search_results)
+        # Every worker query goes out in a single _msearch round trip
+        multi_search = MultiSearch()
+        for worker in _workers.values():
+            multi_search = multi_search.add(
+                worker.search_query(term, size=limit, autocomplete=autocomplete, dates=dates)
+            )
 
-        for hook in self.hooks:
-            hook.execute(term, content_type, response)
+        start_time = time()
+        all_search_results = multi_search.execute()
+        self.timings = {'msearch': (time() - start_time) * 1000}
+
+        for _content_type, search_results in zip(_workers.keys(), all_search_results):
+            self.timings[_content_type] = search_results.took
+            response[_content_type] = self._formatter_for(_content_type)().format(search_results)
 
         return response
 
+    @property
+    def server_timing(self):
+        """
+        Timings of the last search as a Server-Timing header value, in milliseconds: whether it was served from
+        the result cache, the whole _msearch round trip and the time Elasticsearch spent on each content type.
+        """
+        metrics = [] if self.cache_hit is None else [f'cache;desc="{"hit" if self.cache_hit else "miss"}"']
+        for name, duration in self.timings.items():
+            metric_name = re.sub(r'[^A-Za-z0-9]+', '-', name).strip('-').lower()
+            metrics.append(f'{metric_name};desc="{name}";dur={duration:.1f}')
+        return ', '.join(metrics)
+
     def get_search_query_for_type(self, term, content_type):
         worker = self.workers[content_type]
         dates = [
@@ -46,6 +98,27 @@ class SearchManager(object):
         ] if isinstance(worker, DateWorker) else []
         return worker.query(term, dates=dates)
 
+    def get_paginated_results(self, term, content_type, paginator, request):
+        limit = paginator.get_limit(request)
+        offset = paginator.get_offset(request)
+        cursor = request.query_params.get(paginator.cursor_query_param)
+
+        def paginated_results():
+            query = self.get_search_query_for_type(term, content_type)
+            documents = paginator.paginate_es_query(query, request)
+            return (
+                paginator.count, paginator.offset, paginator.next_cursor,
+                self.get_formatted_results(documents, content_type)
+            )
+
+        (count, offset, next_cursor, results), self.cache_hit = search_result_cache.get_or_compute(
+            ('single', self.signature, normalize_term(term), content_type, limit, offset, cursor),
+            paginated_results
+        )
+        paginator.count, paginator.limit, paginator.offset, paginator.request = count, limit, offset, request
+        paginator.next_cursor = next_cursor
+        return results
+
     def get_formatted_results(self, documents, content_type):
         return self._formatter_for(content_type)().serialize(documents)
 
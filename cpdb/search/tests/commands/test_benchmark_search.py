@@ -0,0 +1,67 @@
+import json
+
+from django.test import SimpleTestCase
+from django.core.management import call_command
+
+from mock import patch, mock_open
+from robber import expect
+
+from search.views import SearchV1ViewSet
+
+RESULTS = {
+    'queries': 1,
+    'concurrency': 1,
+    'elapsed': 0.1,
+    'throughput': 10.0,
+    'latency': {'count': 1, 'mean': 5.0, 'p50': 5.0, 'p95': 5.0, 'p99': 5.0},
+    'content_types': {'OFFICER': {'count': 1, 'mean': 3.0, 'p50': 3.0, 'p95': 3.0, 'p99': 3.0}},
+    'workers': {'OfficerWorker': {'count': 1, 'mean': 3.0, 'p50': 3.0, 'p95': 3.0, 'p99': 3.0}},
+}
+
+
+class BenchmarkSearchCommandTestCase(SimpleTestCase):
+    @patch('search.management.commands.benchmark_search.SearchBenchmark')
+    @patch(
+        'search.management.commands.benchmark_search.export_search_queries',
+        return_value=[{'query': 'jerome', 'usages': 2}]
+    )
+    def test_handle(self, export_search_queries, search_benchmark):
+        search_benchmark.return_value.run.return_value = (dict(RESULTS), {})
+
+        with patch('sys.stdout') as stdout:
+            call_command('benchmark_search', '--repeat=2', '--concurrency=4')
+
+        export_search_queries.assert_called_with(500)
+        expect(search_benchmark).to.be.called_with(
+            SearchV1ViewSet.workers, SearchV1ViewSet.formatters, limit=10, autocomplete=False
+        )
+        search_benchmark.return_value.run.assert_called_with(['jerome', 'jerome'], concurrency=4)
+        expect(stdout.write.call_args_list[0][0][0]).to.contain('Ran 1 searches with concurrency 1')
+
+    @patch('search.management.commands.benchmark_search.SearchBenchmark')
+    @patch('search.management.commands.benchmark_search.load_search_queries', return_value=['jerome'])
+    def test_handle_golden(self, _, search_benchmark):
+        search_benchmark.return_value.run.return_value = (dict(RESULTS), {})
+        search_benchmark.return_value.relevance.return_value = {'ndcg': 1.0, 'regressions': []}
+        golden = {'edward': {'OFFICER': ['1']}}
+
+        with patch('builtins.open', mock_open(read_data=json.dumps(golden))) as mock_file:
+            call_command('benchmark_search', '--queries=queries.json', '--golden=golden.json', '--output=out.json')
+
+        search_benchmark.return_value.run.assert_called_with(['jerome', 'edward'], concurrency=1)
+        search_benchmark.return_value.relevance.assert_called_with(golden, {})
+        mock_file.assert_any_call('out.json', 'w')
+        written = ''.join(call[0][0] for call in mock_file.return_value.write.call_args_list)
+        expect(json.loads(written)['relevance']).to.eq({'ndcg': 1.0, 'regressions': []})
+
+    @patch(
+        'search.management.commands.benchmark_search.export_search_queries',
+        return_value=[{'query': 'jerome', 'usages': 2}]
+    )
+    def test_handle_export_queries(self, export_search_queries):
+        with patch('builtins.open', mock_open()) as mock_file:
+            call_command('benchmark_search', '--export-queries=queries.json', '--tracked-queries=10')
+
+        export_search_queries.assert_called_with(10)
+        written = ''.join(call[0][0] for call in mock_file.return_value.write.call_args_list)
+        expect(json.loads(written)).to.eq([{'query': 'jerome', 'usages': 2}])
@@ -23,3 +23,11 @@ class TRRSerializerTestCase(TestCase):
             'force_type': 'Impact Weapon',
             'type': 'TRR',
         })
+
+    def test_serialization_with_annotated_force_type(self):
+        trr = TRRFactory(id=1, trr_datetime=datetime(2007, 1, 1, tzinfo=pytz.utc))
+        trr.member_top_force_type = 'Taser'
+
+        with self.assertNumQueries(0):
+            data = TRRSerializer(trr).data
+        expect(data['force_type']).to.eq('Taser')
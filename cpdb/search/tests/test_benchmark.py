@@ -0,0 +1,78 @@
+from django.test import SimpleTestCase, TestCase
+
+from mock import patch
+from robber import expect
+
+from analytics.factories import SearchTrackingFactory
+from search.benchmark import SearchBenchmark, export_search_queries, latency_stats, ndcg
+from search.workers import OfficerWorker, AreaWorker
+
+
+class ExportSearchQueriesTestCase(TestCase):
+    def test_export_search_queries(self):
+        SearchTrackingFactory(query='jerome', usages=5)
+        SearchTrackingFactory(query='edward', usages=10)
+        SearchTrackingFactory(query='unit', usages=1)
+
+        expect(export_search_queries()).to.eq([
+            {'query': 'edward', 'usages': 10},
+            {'query': 'jerome', 'usages': 5},
+            {'query': 'unit', 'usages': 1},
+        ])
+        expect(export_search_queries(1)).to.eq([{'query': 'edward', 'usages': 10}])
+
+
+class BenchmarkUtilsTestCase(SimpleTestCase):
+    def test_latency_stats(self):
+        expect(latency_stats(list(range(1, 101)))).to.eq({
+            'count': 100, 'mean': 50.5, 'p50': 50.5, 'p95': 95.05, 'p99': 99.01
+        })
+        expect(latency_stats([])).to.eq({'count': 0})
+
+    def test_ndcg(self):
+        expect(ndcg(['1', '2', '3'], ['1', '2', '3'])).to.eq(1.0)
+        expect(ndcg(['4', '5'], ['1', '2'])).to.eq(0.0)
+        expect(ndcg(['2', '1'], ['1', '2'])).to.be.below(1.0)
+        expect(ndcg([], [])).to.eq(1.0)
+
+
+class SearchBenchmarkTestCase(SimpleTestCase):
+    def setUp(self):
+        self.benchmark = SearchBenchmark({'OFFICER': OfficerWorker(), 'COMMUNITY': AreaWorker()}, {})
+
+    def test_run(self):
+        def search(term):
+            return {'msearch': 10.0, 'OFFICER': 4, 'COMMUNITY': 2}, {'OFFICER': [{'id': term}], 'COMMUNITY': []}
+
+        with patch.object(self.benchmark, 'search', side_effect=search):
+            results, responses = self.benchmark.run(['jerome', 'edward'], concurrency=2)
+
+        expect(results['queries']).to.eq(2)
+        expect(results['concurrency']).to.eq(2)
+        expect(results['latency']).to.eq({'count': 2, 'mean': 10.0, 'p50': 10.0, 'p95': 10.0, 'p99': 10.0})
+        expect(results['content_types']['OFFICER']['p50']).to.eq(4.0)
+        expect(results['content_types']['COMMUNITY']['p50']).to.eq(2.0)
+        expect(results['workers']['OfficerWorker']['count']).to.eq(2)
+        expect(results['workers']['AreaWorker']['count']).to.eq(2)
+        expect(responses['jerome']).to.eq({'OFFICER': [{'id': 'jerome'}], 'COMMUNITY': []})
+
+    @patch('search.benchmark.SearchManager._search', return_value={'OFFICER': []})
+    def test_search(self, search):
+        expect(self.benchmark.search('jerome')).to.eq(({}, {'OFFICER': []}))
+        search.assert_called_with('jerome', None, 10, False)
+
+    def test_relevance(self):
+        responses = {
+            'jerome': {'OFFICER': [{'id': '1'}, {'id': '2'}]},
+            'edward': {'OFFICER': [{'id': '4'}, {'id': '3'}]},
+        }
+        golden = {
+            'jerome': {'OFFICER': ['1', '2']},
+            'edward': {'OFFICER': ['3']},
+        }
+
+        relevance = self.benchmark.relevance(golden, responses)
+
+        expect(relevance['ndcg']).to.be.below(1.0)
+        expect(relevance['regressions']).to.have.length(1)
+        expect(relevance['regressions'][0]['query']).to.eq('edward')
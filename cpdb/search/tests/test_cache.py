@@ -0,0 +1,68 @@
+from django.test import SimpleTestCase
+
+from mock import Mock, patch
+from robber import expect
+
+from search.cache import SearchResultCache, normalize_term
+
+
+class NormalizeTermTestCase(SimpleTestCase):
+    def test_normalize_term(self):
+        expect(normalize_term('  Jerome   Finnigan ')).to.eq('jerome finnigan')
+
+
+@patch('search.cache.get_index_version', return_value='1')
+class SearchResultCacheTestCase(SimpleTestCase):
+    def test_get_or_compute(self, _):
+        cache = SearchResultCache()
+        compute = Mock(return_value={'OFFICER': []})
+
+        expect(cache.get_or_compute(('jerome', 'OFFICER'), compute)).to.eq(({'OFFICER': []}, False))
+        expect(cache.get_or_compute(('jerome', 'OFFICER'), compute)).to.eq(({'OFFICER': []}, True))
+        expect(cache.get_or_compute(('jerome', 'UNIT'), compute)).to.eq(({'OFFICER': []}, False))
+
+        expect(compute.call_count).to.eq(2)
+        expect(cache.stats()).to.eq({'hits': 1, 'misses': 2, 'hit_rate': 1 / 3, 'size': 2})
+
+    @patch('search.cache.monotonic')
+    def test_expire_entries(self, mock_monotonic, _):
+        cache = SearchResultCache(timeout=60)
+        compute = Mock(return_value='result')
+
+        mock_monotonic.return_value = 100
+        cache.get_or_compute(('jerome',), compute)
+        mock_monotonic.return_value = 159
+        expect(cache.get_or_compute(('jerome',), compute)).to.eq(('result', True))
+        mock_monotonic.return_value = 160
+        expect(cache.get_or_compute(('jerome',), compute)).to.eq(('result', False))
+
+        expect(compute.call_count).to.eq(2)
+
+    def test_evict_least_recently_used(self, _):
+        cache = SearchResultCache(max_size=2)
+
+        cache.get_or_compute(('a',), lambda: 'a')
+        cache.get_or_compute(('b',), lambda: 'b')
+        cache.get_or_compute(('a',), lambda: 'a')
+        cache.get_or_compute(('c',), lambda: 'c')
+
+        expect(len(cache)).to.eq(2)
+        expect(cache.get_or_compute(('a',), lambda: 'a')[1]).to.be.true()
+        expect(cache.get_or_compute(('b',), lambda: 'b')[1]).to.be.false()
+
+    def test_invalidate_on_index_version_change(self, mock_get_index_version):
+        cache = SearchResultCache()
+        cache.get_or_compute(('jerome',), lambda: 'old')
+
+        mock_get_index_version.return_value = '2'
+
+        expect(cache.get_or_compute(('jerome',), lambda: 'new')).to.eq(('new', False))
+
+    def test_clear(self, _):
+        cache = SearchResultCache()
+        cache.get_or_compute(('jerome',), lambda: 'result')
+
+        cache.clear()
+
+        expect(len(cache)).to.eq(0)
+        expect(cache.stats()).to.eq({'hits': 0, 'misses': 0, 'hit_rate': 0, 'size': 0})
@@ -2,12 +2,16 @@ from datetime import datetime
 
 from django.test import SimpleTestCase
 
+from mock import patch
 from robber import expect
 
-from search.date_util import find_dates_from_string
+from search.date_util import find_dates_from_string, _find_dates
 
 
 class DateUtilTestCase(SimpleTestCase):
+    def setUp(self):
+        _find_dates.cache_clear()
+
     def test_find_dates_from_string_single_date(self):
         test_cases = {
             '2018-06-01': [datetime(2018, 6, 1)],
@@ -95,3 +99,28 @@ class DateUtilTestCase(SimpleTestCase):
         ]
         for incomplete_date_string in incomplete_date_strings:
             expect(find_dates_from_string(incomplete_date_string)).to.eq([])
+
+    @patch('search.date_util.search_dates')
+    def test_find_dates_from_string_without_digits(self, search_dates):
+        expect(find_dates_from_string('Jerome Finnigan')).to.eq([])
+        expect(find_dates_from_string('June')).to.eq([])
+        expect(search_dates).not_to.be.called()
+
+    @patch('search.date_util.search_dates')
+    def test_find_dates_from_string_common_formats(self, search_dates):
+        test_cases = {
+            '2018-06-01': [datetime(2018, 6, 1)],
+            ' 06/01/2018 ': [datetime(2018, 6, 1)],
+            'Sept 1st, 2018': [datetime(2018, 9, 1)],
+            'June 1 2018': [datetime(2018, 6, 1)],
+        }
+        for string, dates in test_cases.items():
+            expect(find_dates_from_string(string)).to.eq(dates)
+        expect(search_dates).not_to.be.called()
+
+    def test_find_dates_from_string_memoized(self):
+        with patch('search.date_util._search_first_date', return_value=(datetime(2018, 6, 1), '')) as search_first:
+            expect(find_dates_from_string('ke 6/1/18')).to.eq([datetime(2018, 6, 1)])
+            expect(find_dates_from_string('KE  6/1/18')).to.eq([datetime(2018, 6, 1)])
+
+        expect(search_first.call_count).to.eq(1)
@@ -4,9 +4,9 @@ from django.test import TestCase
 
 from robber import expect
 
-from data.factories import OfficerFactory, AllegationFactory
+from data.factories import OfficerFactory, AllegationFactory, AllegationCategoryFactory
 from search.queries import BaseModelQuery, OfficerQuery, CrQuery, TrrQuery
-from trr.factories import TRRFactory
+from trr.factories import TRRFactory, ActionResponseFactory
 
 
 class BaseModelQueryTestCase(TestCase):
@@ -22,6 +22,12 @@ class OfficerQueryTestCase(TestCase):
         results = sorted(list(OfficerQuery(ids=[8562, 8563]).query()), key=attrgetter('id'))
         expect(results).to.eq([officer_1, officer_2])
 
+    def test_query_preserve_ids_order(self):
+        officer_1 = OfficerFactory(id=8562)
+        officer_2 = OfficerFactory(id=8563)
+        officer_3 = OfficerFactory(id=8564)
+        expect(list(OfficerQuery(ids=['8564', '8562', '8563']).query())).to.eq([officer_3, officer_1, officer_2])
+
 
 class CrQueryTestCase(TestCase):
     def test_query(self):
@@ -31,6 +37,16 @@ class CrQueryTestCase(TestCase):
         results = sorted(list(CrQuery(ids=['C123', 'C456']).query()), key=attrgetter('crid'))
         expect(results).to.eq([allegation_1, allegation_2])
 
+    def test_query_select_category(self):
+        AllegationFactory(crid='C123', most_common_category=AllegationCategoryFactory(category='Use of Force'))
+        AllegationFactory(crid='C456', most_common_category=AllegationCategoryFactory(category='Illegal Search'))
+
+        with self.assertNumQueries(1):
+            categories = [
+                allegation.most_common_category.category for allegation in CrQuery(ids=['C456', 'C123']).query()
+            ]
+        expect(categories).to.eq(['Illegal Search', 'Use of Force'])
+
 
 class TrrQueryTestCase(TestCase):
     def test_query(self):
@@ -39,3 +55,17 @@ class TrrQueryTestCase(TestCase):
         TRRFactory(id=789)
         results = sorted(list(TrrQuery(ids=[123, 456]).query()), key=attrgetter('id'))
         expect(results).to.eq([trr_1, trr_2])
+
+    def test_query_annotate_top_force_type(self):
+        trr_1 = TRRFactory(id=123)
+        trr_2 = TRRFactory(id=456)
+        ActionResponseFactory(trr=trr_1, force_type='Taser', action_sub_category='5.1')
+        ActionResponseFactory(trr=trr_1, force_type='Impact Weapon', action_sub_category='5.2')
+        ActionResponseFactory(trr=trr_1, force_type='Verbal Commands', action_sub_category='6', person='Subject Action')
+        ActionResponseFactory(trr=trr_2, force_type='Taser Display', action_sub_category='3')
+
+        results = list(TrrQuery(ids=[456, 123, 789]).query())
+
+        expect([(trr.id, trr.member_top_force_type) for trr in results]).to.eq([
+            (456, 'Taser Display'), (123, 'Impact Weapon')
+        ])
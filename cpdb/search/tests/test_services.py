@@ -3,6 +3,7 @@ from django.test import TestCase
 from mock import Mock, patch
 from robber import expect
 
+from search.cache import SearchResultCache
 from search.services import SearchManager
 from search.tests.utils import IndexMixin
 from search.workers import DateCRWorker, OfficerWorker
@@ -127,13 +128,102 @@ class SearchManagerTestCase(IndexMixin, TestCase):
         }])
 
     @patch('search.services.SimpleFormatter.format', return_value='formatter_results')
-    def test_hooks(self, _):
+    @patch('search.services.MultiSearch')
+    def test_hooks(self, multi_search_mock, _):
+        multi_search_mock.return_value.add.return_value = multi_search_mock.return_value
+        multi_search_mock.return_value.execute.return_value = [Mock(took=1)]
         mock_hook = Mock()
         mock_worker = Mock()
         term = 'whatever'
         SearchManager(hooks=[mock_hook], workers={'mock': mock_worker}).search(term)
         mock_hook.execute.assert_called_with(term, None, {'mock': 'formatter_results'})
 
+    def test_search_in_one_multi_search_request(self):
+        OfficerInfoDocType(meta={'id': '1'}, full_name='full name', badge='123', url='url').save()
+        self.refresh_index()
+
+        search_manager = SearchManager()
+        with patch('elasticsearch_dsl.Search.execute') as search_execute_mock:
+            response = search_manager.search('fu na', limit=1)
+
+        expect(search_execute_mock).not_to.be.called()
+        expect(response['OFFICER']).to.have.length(1)
+        expect(list(search_manager.timings.keys())).to.eq(['msearch', 'OFFICER', 'UNIT', 'COMMUNITY', 'NEIGHBORHOOD'])
+
+    @patch('search.services.MultiSearch')
+    def test_search_autocomplete_short_term(self, multi_search):
+        worker = Mock(spec=OfficerWorker)
+        multi_search.return_value.add.return_value.execute.return_value = [Mock(hits=[], took=1)]
+
+        SearchManager(workers={'OFFICER': worker}).search('Je ', limit=5)
+        worker.search_query.assert_called_with('Je ', size=5, autocomplete=True, dates=[])
+
+        SearchManager(workers={'OFFICER': worker}).search('Je', limit=5, submit=True)
+        worker.search_query.assert_called_with('Je', size=5, autocomplete=False, dates=[])
+
+        SearchManager(workers={'OFFICER': worker}).search('Jerome', limit=5)
+        worker.search_query.assert_called_with('Jerome', size=5, autocomplete=False, dates=[])
+
+    def test_server_timing(self):
+        search_manager = SearchManager()
+        search_manager.timings = {'msearch': 12.345, 'OFFICER': 3, 'DATE > CR': 1}
+
+        expect(search_manager.server_timing).to.eq(
+            'msearch;desc="msearch";dur=12.3, officer;desc="OFFICER";dur=3.0, date-cr;desc="DATE > CR";dur=1.0'
+        )
+
+    def test_server_timing_with_cache_hit(self):
+        search_manager = SearchManager()
+        search_manager.cache_hit = True
+
+        expect(search_manager.server_timing).to.eq('cache;desc="hit"')
+
+    @patch('search.services.search_result_cache', SearchResultCache())
+    @patch('search.cache.get_index_version', return_value='1')
+    def test_search_served_from_cache(self, _):
+        hook = Mock()
+        search_manager = SearchManager(workers={'OFFICER': OfficerWorker()}, hooks=[hook])
+
+        with patch.object(search_manager, '_search', return_value={'OFFICER': []}) as mock_search:
+            expect(search_manager.search(' Jerome  ', limit=5)).to.eq({'OFFICER': []})
+            expect(search_manager.cache_hit).to.be.false()
+            expect(search_manager.search('jerome', limit=5)).to.eq({'OFFICER': []})
+            expect(search_manager.cache_hit).to.be.true()
+            search_manager.search('jerome', limit=10)
+
+        expect(mock_search.call_count).to.eq(2)
+        expect(hook.execute.call_count).to.eq(3)
+        hook.execute.assert_any_call(' Jerome  ', None, {'OFFICER': []})
+
+    @patch('search.services.search_result_cache', SearchResultCache())
+    @patch('search.cache.get_index_version', return_value='1')
+    def test_get_paginated_results_served_from_cache(self, _):
+        search_manager = SearchManager(workers={'OFFICER': OfficerWorker()})
+        request = Mock(query_params={'limit': '5', 'offset': '10'})
+        paginator = Mock(
+            count=30, offset=10, next_cursor=None, cursor_query_param='cursor',
+            get_limit=Mock(return_value=5), get_offset=Mock(return_value=10)
+        )
+
+        with patch.object(search_manager, 'get_search_query_for_type'), \
+                patch.object(search_manager, 'get_formatted_results', return_value=['a']) as mock_format:
+            expect(search_manager.get_paginated_results('term', 'OFFICER', paginator, request)).to.eq(['a'])
+            expect(search_manager.cache_hit).to.be.false()
+
+            other_paginator = Mock(
+                cursor_query_param='cursor', get_limit=Mock(return_value=5), get_offset=Mock(return_value=10)
+            )
+            results = search_manager.get_paginated_results('Term', 'OFFICER', other_paginator, request)
+
+        expect(results).to.eq(['a'])
+        expect(search_manager.cache_hit).to.be.true()
+        expect(mock_format.call_count).to.eq(1)
+        expect(other_paginator.count).to.eq(30)
+        expect(other_paginator.limit).to.eq(5)
+        expect(other_paginator.offset).to.eq(10)
+        expect(other_paginator.next_cursor).to.be.none()
+        expect(other_paginator.paginate_es_query.called).to.be.false()
+
     @patch('search.services.OfficerWorker.query', return_value='abc')
     def test_get_search_query_for_type(self, patched_query):
         query = SearchManager().get_search_query_for_type('term', 'OFFICER')
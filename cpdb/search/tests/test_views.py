@@ -37,7 +37,33 @@ class SearchV1ViewSetTestCase(IndexMixin, APITestCase):
 
         expect(response.status_code).to.equal(status.HTTP_200_OK)
         expect(response.data).to.equal('anything_suggester_returns')
-        search.assert_called_with(text, content_type='OFFICER')
+        search.assert_called_with(text, content_type='OFFICER', submit=False)
+
+    @patch('search.views.SearchManager.search')
+    def test_list_with_submit(self, search):
+        search.return_value = {}
+
+        url = reverse('api:suggestion-list')
+        response = self.client.get(url, {
+            'term': 'Je',
+            'contentType': 'OFFICER',
+            'submit': 'true'
+        })
+
+        expect(response.status_code).to.equal(status.HTTP_200_OK)
+        search.assert_called_with('Je', content_type='OFFICER', submit=True)
+
+    def test_list_with_server_timing(self):
+        url = reverse('api:suggestion-list')
+        response = self.client.get(url, {
+            'term': 'any_text',
+            'contentType': 'OFFICER'
+        })
+
+        expect(response.status_code).to.equal(status.HTTP_200_OK)
+        expect(response['Server-Timing']).to.match(
+            r'^cache;desc="miss", msearch;desc="msearch";dur=[\d.]+, officer;desc="OFFICER";dur=[\d.]+$'
+        )
 
     def test_search_unit_officer(self):
         officer = OfficerFactory()
@@ -554,6 +580,29 @@ class SearchV1ViewSetTestCase(IndexMixin, APITestCase):
             }
         ])
 
+    def test_retrieve_recent_search_items_in_requested_order(self):
+        for officer_id in [1, 2, 3]:
+            OfficerFactory(id=officer_id)
+        for crid in ['C1', 'C2', 'C3']:
+            AllegationFactory(crid=crid, most_common_category=AllegationCategoryFactory())
+        for trr_id in [1, 2, 3]:
+            ActionResponseFactory(trr=TRRFactory(id=trr_id), force_type='Taser')
+
+        url = reverse('api:suggestion-recent-search-items')
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {
+                'officer_ids[]': [3, 1, 2],
+                'crids[]': ['C2', 'C3', 'C1'],
+                'trr_ids[]': [2, 1, 3],
+            })
+
+        expect(response.status_code).to.eq(status.HTTP_200_OK)
+        expect([(item['type'], item['id']) for item in response.data]).to.eq([
+            ('OFFICER', 3), ('OFFICER', 1), ('OFFICER', 2),
+            ('CR', 'C2'), ('CR', 'C3'), ('CR', 'C1'),
+            ('TRR', 2), ('TRR', 1), ('TRR', 3),
+        ])
+
     def test_search_with_apostrophe(self):
         allegation_category = AllegationCategoryFactory(category='Use of Force')
         allegation_1 = AllegationFactory(
@@ -613,4 +662,4 @@ class SearchV2ViewSetTestCase(APITestCase):
 
         expect(response.status_code).to.equal(status.HTTP_200_OK)
         expect(response.data).to.equal('anything_suggester_returns')
-        search.assert_called_with(text, content_type='OFFICER')
+        search.assert_called_with(text, content_type='OFFICER', submit=False)
@@ -69,6 +69,69 @@ class OfficerWorkerTestCase(IndexMixin, SimpleTestCase):
         expect(response.hits.hits[0]['_source']['full_name']).to.eq('another guy')
         expect(response.hits.hits[1]['_source']['full_name']).to.eq('some dude')
 
+    def test_search_prioritizing_exact_full_name(self):
+        OfficerInfoDocType(full_name='Jerome Finnigan Turner', badge='123', allegation_count=50).save()
+        OfficerInfoDocType(full_name='Jerome Finnigan', badge='456', allegation_count=10).save()
+
+        self.refresh_index()
+
+        response = OfficerWorker().search('jerome  finnigan')
+
+        expect(response.hits.total).to.equal(2)
+        expect(response.hits.hits[0]['_source']['full_name']).to.eq('Jerome Finnigan')
+        expect(response.hits.hits[1]['_source']['full_name']).to.eq('Jerome Finnigan Turner')
+
+    def test_search_prioritizing_full_name_match_over_allegation_count(self):
+        OfficerInfoDocType(full_name='Jerome Turner', badge='123', allegation_count=500).save()
+        OfficerInfoDocType(full_name='Jerome Finnigan Jr', badge='456', allegation_count=1).save()
+
+        self.refresh_index()
+
+        response = OfficerWorker().search('jerome finnigan')
+
+        expect(response.hits.total).to.equal(2)
+        expect(response.hits.hits[0]['_source']['full_name']).to.eq('Jerome Finnigan Jr')
+        expect(response.hits.hits[1]['_source']['full_name']).to.eq('Jerome Turner')
+
+    def test_autocomplete_prioritizing_allegation_count(self):
+        OfficerInfoDocType(full_name='Jerome Finnigan', badge='123', allegation_count=1).save()
+        OfficerInfoDocType(full_name='Jeremy Turner', badge='456', allegation_count=10).save()
+        OfficerInfoDocType(full_name='Edward May', badge='789', allegation_count=20).save()
+
+        self.refresh_index()
+
+        response = OfficerWorker().search('je', autocomplete=True)
+
+        expect(response.hits.total).to.equal(2)
+        expect(response.hits.hits[0]['_source']['full_name']).to.eq('Jeremy Turner')
+        expect(response.hits.hits[1]['_source']['full_name']).to.eq('Jerome Finnigan')
+
+    def test_autocomplete_by_badge_prefix(self):
+        OfficerInfoDocType(full_name='Jerome Finnigan', badge='5167').save()
+        OfficerInfoDocType(full_name='Edward May', badge='1516').save()
+
+        self.refresh_index()
+
+        response = OfficerWorker().search('51', autocomplete=True)
+
+        expect(response.hits.total).to.equal(1)
+        expect(response.hits.hits[0]['_source']['full_name']).to.eq('Jerome Finnigan')
+
+    def test_autocomplete_by_officer_id_historic_badge_and_tag(self):
+        OfficerInfoDocType(full_name='Jerome Finnigan', badge='5167', meta={'_id': '12'}).save()
+        OfficerInfoDocType(
+            full_name='Edward May', badge='1516', historic_badges=['987'], historic_badges_keyword=['987']
+        ).save()
+        OfficerInfoDocType(full_name='Raymond Piwnicki', badge='4316', tags=['ssb']).save()
+
+        self.refresh_index()
+
+        for term, full_name in [('12', 'Jerome Finnigan'), ('987', 'Edward May'), ('ssb', 'Raymond Piwnicki')]:
+            response = OfficerWorker().search(term, autocomplete=True)
+
+            expect(response.hits.total).to.equal(1)
+            expect(response.hits.hits[0]['_source']['full_name']).to.eq(full_name)
+
     def test_search_by_officer_id(self):
         doc = OfficerInfoDocType(full_name='some dude', badge='123', meta={'_id': '456'})
         doc.save()
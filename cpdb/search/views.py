@@ -43,34 +43,40 @@ class SearchViewSet(viewsets.ViewSet):
         if not self._content_type:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        query = self.search_manager.get_search_query_for_type(
-            term, content_type=self._content_type
-        )
         paginator = SearchQueryPagination()
-        paginated_query = paginator.paginate_es_query(query, request)
-        return paginator.get_paginated_response(
-            self.search_manager.get_formatted_results(paginated_query, self._content_type)
-        )
+        results = self.search_manager.get_paginated_results(term, self._content_type, paginator, request)
+        return paginator.get_paginated_response(results)
 
     def list(self, request):
         term = self._search_term
         if term:
-            results = self.search_manager.search(term, content_type=self._content_type)
+            results = self.search_manager.search(term, content_type=self._content_type, submit=self._submit)
         else:
             results = SearchManager(formatters=self.formatters, workers=self.workers).suggest_sample()
 
-        return Response(results)
+        response = Response(results)
+        if self.search_manager.cache_hit is not None:
+            response['Server-Timing'] = self.search_manager.server_timing
+        return response
 
     @property
     def _content_type(self):
         return self.request.query_params.get('contentType', None)
 
+    @property
+    def _submit(self):
+        return self.request.query_params.get('submit', '').lower() == 'true'
+
     @property
     def _search_term(self):
         return self.request.query_params.get('term', None)
 
     @action(detail=False, methods=['GET'], url_path='recent-search-items', url_name='recent-search-items')
     def recent_search_items(self, _):
+        """
+        Each query fetches all requested items of its type at once, related rows included, in the order the ids
+        were sent, so the number of queries does not grow with the number of recent items.
+        """
         recent_search_data = []
         for recent_items_query in self.recent_items_queries:
             ids = self.request.query_params.getlist(f'{recent_items_query["query_param"]}[]', None)
@@ -6,6 +6,24 @@ from .doc_types import (
 )
 from officers.doc_types import OfficerInfoDocType
 
+# Officer ranking multiplies the text score by weights from indexed fields only, without any scripts
+TAG_MATCH_BOOST = 60000
+FULL_NAME_EXACT_MATCH_BOOST = 1000
+FULL_NAME_MATCH_BOOST = 500
+ALLEGATION_COUNT_BOOST = {
+    'field': 'allegation_count',
+    'factor': 3,
+    'missing': 0
+}
+# Grows with the allegation count but stays far below FULL_NAME_MATCH_BOOST, so a partial name match never
+# outranks a full name match however many allegations it has
+ALLEGATION_COUNT_MULTIPLIER = {
+    'field': 'allegation_count',
+    'factor': 3,
+    'modifier': 'sqrt',
+    'missing': 0
+}
+
 
 class Worker(object):
     doc_type_klass = None
@@ -22,8 +40,15 @@ class Worker(object):
             .query('multi_match', query=term, operator='and', fields=self.fields) \
             .sort(*self.sort_order)
 
+    def autocomplete_query(self, term, **kwargs):
+        return self.query(term, **kwargs)
+
+    def search_query(self, term, size=10, begin=0, autocomplete=False, **kwargs):
+        query = self.autocomplete_query if autocomplete else self.query
+        return query(term, **kwargs)[begin:size]
+
     def search(self, term, size=10, begin=0, **kwargs):
-        return self.query(term, **kwargs)[begin:size].execute()
+        return self.search_query(term, size=size, begin=begin, **kwargs).execute()
 
     def get_sample(self):
         query = self._searcher.query(
@@ -72,9 +97,15 @@ class OfficerWorker(Worker):
                             'tags': term
                         }
                     },
-                    'script_score': {
-                        'script': '_score + 60000'
-                    }
+                    'weight': TAG_MATCH_BOOST
+                },
+                {
+                    'filter': {
+                        'match': {
+                            'full_name.exact': term
+                        }
+                    },
+                    'weight': FULL_NAME_EXACT_MATCH_BOOST
                 },
                 {
                     'filter': {
@@ -85,24 +116,51 @@ class OfficerWorker(Worker):
                             }
                         }
                     },
-                    'script_score': {
-                        'script': '_score + 500'
-                    }
+                    'weight': FULL_NAME_MATCH_BOOST
                 },
                 {
                     'filter': {
-                        'match': {
-                            'full_name': term
+                        'bool': {
+                            'must': {'match': {'full_name': term}},
+                            'filter': {'range': {'allegation_count': {'gt': 0}}}
                         }
                     },
-                    'script_score': {
-                        'script': '_score + doc[\'allegation_count\'].value * 3'
-                    }
+                    'field_value_factor': ALLEGATION_COUNT_MULTIPLIER
                 }
-            ]
+            ],
+            score_mode='multiply',
+            boost_mode='multiply'
         )
         return _query
 
+    def autocomplete_query(self, term, **kwargs):
+        return self._searcher.query(
+            'function_score',
+            query={
+                'bool': {
+                    'should': [
+                        {
+                            'multi_match': {
+                                'query': term,
+                                'operator': 'and',
+                                'fields': ['full_name.prefix', 'badge.prefix^2']
+                            }
+                        },
+                        {
+                            'multi_match': {
+                                'query': term,
+                                'fields': [
+                                    'historic_badges', 'tags', '_id', 'badge_keyword^4', 'historic_badges_keyword^3'
+                                ]
+                            }
+                        }
+                    ]
+                }
+            },
+            field_value_factor=ALLEGATION_COUNT_BOOST,
+            boost_mode='sum'
+        )
+
 
 class UnitWorker(Worker):
     doc_type_klass = UnitDocType
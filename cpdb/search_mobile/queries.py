@@ -1,4 +1,4 @@
-from data.models import Allegation
+from trr.models import TRR
 
 from search.queries import OfficerQuery, CrQuery, TrrQuery
 
@@ -8,9 +8,9 @@ class OfficerMobileQuery(OfficerQuery):
 
 
 class CrMobileQuery(CrQuery):
-    def queryset(self):
-        return Allegation.objects.select_related('most_common_category')
+    pass
 
 
 class TrrMobileQuery(TrrQuery):
-    pass
+    def queryset(self):
+        return TRR.objects
@@ -0,0 +1,35 @@
+import hashlib
+import json
+from uuid import uuid4
+
+from django.apps import apps
+from django.core.cache import cache
+
+SOCIAL_GRAPH_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+SOCIAL_GRAPH_CACHE_VERSION_KEY = 'social-graph:version'
+
+
+def _cache_version():
+    # A random version is used so that entries written before an evicted version key are never served again
+    return cache.get_or_set(SOCIAL_GRAPH_CACHE_VERSION_KEY, lambda: uuid4().hex, None)
+
+
+def _edges_version():
+    # Coaccusal edges are also refreshed by database triggers as allegations change, every refresh bumps this version
+    return apps.get_model('data', 'OfficerCoaccusalVersion').current()
+
+
+def get_or_compute(name, params, compute):
+    """
+    Get a social graph result from the shared cache, computing and caching it on a miss
+    :param name: result name, e.g. 'coaccused_data'
+    :param params: json serializable params which identify the result
+    :param compute: function to compute the result
+    """
+    params_hash = hashlib.md5(json.dumps(params, sort_keys=True).encode()).hexdigest()
+    key = f'social-graph:{_cache_version()}:{_edges_version()}:{name}:{params_hash}'
+    return cache.get_or_set(key, compute, SOCIAL_GRAPH_CACHE_TIMEOUT)
+
+
+def invalidate():
+    cache.set(SOCIAL_GRAPH_CACHE_VERSION_KEY, uuid4().hex, None)
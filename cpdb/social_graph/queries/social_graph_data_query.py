@@ -1,6 +1,7 @@
-import functools
 from django.db import connection
+from django.utils.functional import cached_property
 
+from social_graph import cache
 from social_graph.serializers import OfficerSerializer, AccusedSerializer
 from data.models import Officer, Allegation
 from utils.raw_query_utils import dict_fetch_all
@@ -11,6 +12,10 @@ COMPLAINT_ORIGIN_FILTER_MAPPING = {
     'OFFICER': 'AND data_allegation.is_officer_complaint IS TRUE',
     'CIVILIAN': 'AND data_allegation.is_officer_complaint IS FALSE',
 }
+COMPLAINT_ORIGIN_COACCUSAL_COUNT_MAPPING = {
+    'OFFICER': 'officer_complaint_coaccusal_count',
+    'CIVILIAN': 'civilian_coaccusal_count',
+}
 DEFAULT_COMPLAINT_ORIGIN = 'CIVILIAN'
 
 
@@ -23,21 +28,35 @@ class SocialGraphDataQuery(object):
         show_connected_officers=False,
     ):
         self.officers = officers
-        self.threshold = threshold if threshold else DEFAULT_THRESHOLD
+        self.threshold = int(threshold) if threshold else DEFAULT_THRESHOLD
         self.complaint_origin = complaint_origin if complaint_origin is not None else DEFAULT_COMPLAINT_ORIGIN
         self.show_connected_officers = show_connected_officers
 
+    @cached_property
+    def officer_ids(self):
+        return sorted(officer.id for officer in self.officers) if self.officers else []
+
+    @property
+    def _cache_params(self):
+        return [self.officer_ids, self.threshold, self.complaint_origin, self.show_connected_officers]
+
     def _officer_allegation_query(self, select_fields):
-        officer_ids_string = ", ".join([str(officer.id) for officer in self.officers])
+        officer_ids_string = ", ".join([str(officer_id) for officer_id in self.officer_ids])
+        coaccusal_count_column = COMPLAINT_ORIGIN_COACCUSAL_COUNT_MAPPING.get(self.complaint_origin, 'coaccusal_count')
+        # Pairs are picked from the coaccusal edge table first, so only allegations of pairs which can reach
+        # the threshold are joined
         return f"""
             SELECT {select_fields}
-            FROM data_officerallegation AS A
-            INNER JOIN data_officerallegation AS B ON A.allegation_id = B.allegation_id
+            FROM data_officercoaccusal AS C
+            INNER JOIN data_officerallegation AS A ON A.officer_id = C.officer_1_id
+            INNER JOIN data_officerallegation AS B
+                ON B.officer_id = C.officer_2_id AND A.allegation_id = B.allegation_id
             LEFT JOIN data_allegation ON data_allegation.crid = A.allegation_id
-            WHERE A.officer_id < B.officer_id
+            WHERE C.officer_1_id < C.officer_2_id
+            AND C.{coaccusal_count_column} >= {self.threshold}
             AND (
-                B.officer_id IN ({officer_ids_string})
-                {'OR' if self.show_connected_officers else 'AND'} A.officer_id IN ({officer_ids_string})
+                C.officer_2_id IN ({officer_ids_string})
+                {'OR' if self.show_connected_officers else 'AND'} C.officer_1_id IN ({officer_ids_string})
             )
             AND data_allegation.incident_date IS NOT NULL
             {COMPLAINT_ORIGIN_FILTER_MAPPING.get(self.complaint_origin, '')}
@@ -68,23 +87,27 @@ class SocialGraphDataQuery(object):
             WHERE total_accussed_count >= {self.threshold}
         """
 
-    @property
-    @functools.lru_cache()
+    def _fetch_coaccused_data(self):
+        with connection.cursor() as cursor:
+            cursor.execute(self._coaccused_data_query())
+            return dict_fetch_all(cursor)
+
+    def _fetch_allegation_ids(self):
+        with connection.cursor() as cursor:
+            cursor.execute(self._allegation_id_query())
+            return [row['allegation_id'] for row in dict_fetch_all(cursor)]
+
+    @cached_property
     def coaccused_data(self):
-        if self.officers:
-            with connection.cursor() as cursor:
-                cursor.execute(self._coaccused_data_query())
-                return dict_fetch_all(cursor)
+        if self.officer_ids:
+            return cache.get_or_compute('coaccused_data', self._cache_params, self._fetch_coaccused_data)
         else:
             return []
 
-    @property
-    @functools.lru_cache()
+    @cached_property
     def allegation_ids(self):
-        if self.officers:
-            with connection.cursor() as cursor:
-                cursor.execute(self._allegation_id_query())
-                return [row['allegation_id'] for row in dict_fetch_all(cursor)]
+        if self.officer_ids:
+            return cache.get_or_compute('allegation_ids', self._cache_params, self._fetch_allegation_ids)
         else:
             return []
 
@@ -97,7 +120,7 @@ class SocialGraphDataQuery(object):
         if self.show_connected_officers:
             officer_ids = [row['officer_id_1'] for row in self.coaccused_data]
             officer_ids += [row['officer_id_2'] for row in self.coaccused_data]
-            officer_ids += [officer.id for officer in self.officers]
+            officer_ids += self.officer_ids
             officer_ids = list(set(officer_ids))
             return Officer.objects.filter(id__in=officer_ids).order_by('first_name', 'last_name')
         else:
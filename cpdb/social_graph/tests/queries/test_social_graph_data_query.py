@@ -1,7 +1,8 @@
 import pytz
 from datetime import datetime
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
 from robber import expect
 
@@ -1527,3 +1528,33 @@ class SocialGraphDataQueryTestCase(TestCase):
 
         social_graph_data_query = SocialGraphDataQuery(Officer.objects.none())
         expect(social_graph_data_query.allegation_ids).to.eq([])
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_coaccused_data_shared_cache(self):
+        cache.clear()
+        officer_1 = OfficerFactory(id=8562)
+        officer_2 = OfficerFactory(id=8563)
+        allegation = AllegationFactory(
+            crid='123',
+            is_officer_complaint=False,
+            incident_date=datetime(2005, 12, 31, tzinfo=pytz.utc)
+        )
+        OfficerAllegationFactory(officer=officer_1, allegation=allegation)
+        OfficerAllegationFactory(officer=officer_2, allegation=allegation)
+
+        expected_coaccused_data = [{
+            'officer_id_1': 8562,
+            'officer_id_2': 8563,
+            'allegation_id': '123',
+            'incident_date': datetime(2005, 12, 31, tzinfo=pytz.utc),
+            'accussed_count': 1,
+        }]
+        officers = Officer.objects.filter(id__in=[8562, 8563])
+        expect(SocialGraphDataQuery(officers, threshold=1).coaccused_data).to.eq(expected_coaccused_data)
+
+        with self.assertNumQueries(2):
+            coaccused_data = SocialGraphDataQuery(officers.order_by('-id'), threshold=1).coaccused_data
+        expect(coaccused_data).to.eq(expected_coaccused_data)
+
+        with self.assertNumQueries(3):
+            SocialGraphDataQuery(officers, threshold=2).coaccused_data
@@ -0,0 +1,43 @@
+from django.core.cache import cache as django_cache
+from django.test import TestCase, override_settings
+
+from mock import Mock
+from robber import expect
+
+from data.models import OfficerCoaccusal
+from social_graph import cache
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SocialGraphCacheTestCase(TestCase):
+    def setUp(self):
+        django_cache.clear()
+
+    def test_get_or_compute(self):
+        compute = Mock(return_value=[1, 2])
+
+        expect(cache.get_or_compute('coaccused_data', [[1, 2], 2, 'CIVILIAN', False], compute)).to.eq([1, 2])
+        expect(cache.get_or_compute('coaccused_data', [[1, 2], 2, 'CIVILIAN', False], compute)).to.eq([1, 2])
+        expect(compute).to.be.called_once()
+
+        cache.get_or_compute('coaccused_data', [[1, 2], 3, 'CIVILIAN', False], compute)
+        cache.get_or_compute('allegation_ids', [[1, 2], 2, 'CIVILIAN', False], compute)
+        expect(compute.call_count).to.eq(3)
+
+    def test_invalidate(self):
+        compute = Mock(return_value=[1, 2])
+        cache.get_or_compute('coaccused_data', [[1, 2], 2, 'CIVILIAN', False], compute)
+
+        cache.invalidate()
+        cache.get_or_compute('coaccused_data', [[1, 2], 2, 'CIVILIAN', False], compute)
+
+        expect(compute.call_count).to.eq(2)
+
+    def test_invalidate_on_coaccusal_edges_refresh(self):
+        compute = Mock(return_value=[1, 2])
+        cache.get_or_compute('coaccused_data', [[1, 2], 2, 'CIVILIAN', False], compute)
+
+        OfficerCoaccusal.rebuild(officer_ids=[1, 2])
+        cache.get_or_compute('coaccused_data', [[1, 2], 2, 'CIVILIAN', False], compute)
+
+        expect(compute.call_count).to.eq(2)
@@ -795,6 +795,16 @@ class SocialGraphDesktopViewSetTestCase(APITestCase):
         expect(response.data['coaccused_data']).to.eq(expected_data['coaccused_data'])
         expect(response.data['list_event']).to.eq(expected_data['list_event'])
 
+    def test_network_with_invalid_threshold(self):
+        OfficerFactory(id=8562)
+
+        url = reverse('api-v2:social-graph-network', kwargs={})
+        for threshold in ['abc', '0', '-1']:
+            response = self.client.get(url, {'officer_ids': '8562', 'threshold': threshold})
+
+            expect(response.status_code).to.eq(status.HTTP_400_BAD_REQUEST)
+            expect(response.data).to.eq({'threshold': 'Threshold must be a positive integer.'})
+
     def test_officers_default(self):
         officer_1 = OfficerFactory(
             id=8562,
@@ -1,9 +1,11 @@
 from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
 from django.views.decorators.cache import never_cache
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 
@@ -129,7 +131,9 @@ class SocialGraphBaseViewSet(viewsets.ViewSet):
         show_connected_officers = False
         if pinboard:
             show_connected_officers = self.PINBOARD_SHOW_CONNECTED_OFFICERS
-            officers = pinboard.all_officers if include_connected_officers else pinboard.officers.all()
+            officers = Officer.objects.filter(
+                id__in=pinboard.all_officer_ids if include_connected_officers else pinboard.officer_ids
+            )
         elif officer_ids:
             officers = Officer.objects.filter(id__in=officer_ids.split(','))
         elif unit_id:
@@ -137,7 +141,7 @@ class SocialGraphBaseViewSet(viewsets.ViewSet):
 
         return {'officers': officers, 'show_connected_officers': show_connected_officers}
 
-    @property
+    @cached_property
     def _pinboard(self):
         pinboard_id = self._pinboard_id
         if pinboard_id:
@@ -163,7 +167,16 @@ class SocialGraphBaseViewSet(viewsets.ViewSet):
 
     @property
     def _threshold(self):
-        return self.request.query_params.get('threshold', None)
+        threshold = self.request.query_params.get('threshold', None)
+        if not threshold:
+            return None
+        try:
+            threshold = int(threshold)
+        except ValueError:
+            threshold = 0
+        if threshold < 1:
+            raise ValidationError({'threshold': 'Threshold must be a positive integer.'})
+        return threshold
 
     @property
     def _complaint_origin(self):
@@ -1,4 +1,4 @@
-from elasticsearch_dsl import Integer, DocType, Text, Boolean
+from elasticsearch_dsl import Integer, DocType, Text, Boolean, Keyword, Date
 
 from .index_aliases import tracker_index_alias
 from search.analyzers import autocomplete, autocomplete_search
@@ -7,10 +7,17 @@ from search.analyzers import autocomplete, autocomplete_search
 @tracker_index_alias.doc_type
 class AttachmentFileDocType(DocType):
     id = Integer()
-    crid = Text(analyzer=autocomplete, search_analyzer=autocomplete_search)
+    crid = Text(analyzer=autocomplete, search_analyzer=autocomplete_search, fields={'keyword': Keyword()})
     title = Text(analyzer=autocomplete, search_analyzer=autocomplete_search)
     text_content = Text(analyzer=autocomplete, search_analyzer=autocomplete_search)
     show = Boolean()
+    created_at = Date()
+    updated_at = Date()
+    source_type = Keyword()
+    preview_image_url = Keyword()
+    file_type = Keyword()
+    url = Keyword()
+    documents_count = Integer()
 
     class Meta:
         doc_type = 'attachment_file_doc_type'
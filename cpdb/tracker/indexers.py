@@ -1,6 +1,10 @@
-from es_index import register_indexer
-from es_index.indexers import BaseIndexer
+from django.db.models import OuterRef
+from elasticsearch.helpers import bulk
+
+from es_index import register_indexer, es_client
+from es_index.indexers import BaseIndexer, PartialIndexer
 from data.models import AttachmentFile
+from data.utils.subqueries import SQCount
 from .doc_types import AttachmentFileDocType
 from .index_aliases import tracker_index_alias
 
@@ -12,8 +16,13 @@ class AttachmentFileIndexer(BaseIndexer):
     doc_type_klass = AttachmentFileDocType
     index_alias = tracker_index_alias
 
+    def annotate_attachment_files(self, queryset):
+        return queryset.annotate(documents_count=SQCount(
+            AttachmentFile.showing.filter(allegation=OuterRef('allegation')).values('allegation')
+        ))
+
     def get_queryset(self):
-        return AttachmentFile.objects.all()
+        return self.annotate_attachment_files(AttachmentFile.objects.all())
 
     def extract_datum(self, datum):
         return {
@@ -22,4 +31,31 @@ class AttachmentFileIndexer(BaseIndexer):
             'title': datum.title,
             'text_content': datum.text_content,
             'show': datum.show,
+            'created_at': datum.created_at,
+            'updated_at': datum.updated_at,
+            'source_type': datum.source_type,
+            'preview_image_url': datum.preview_image_url,
+            'file_type': datum.file_type,
+            'url': datum.url,
+            'documents_count': datum.documents_count,
         }
+
+    def update_allegation_docs(self, crid):
+        """
+        Rewrite the live docs of every attachment of an allegation, whose documents_count changes with any of
+        them, without waiting for the next sync_index run.
+        """
+        if not es_client.indices.exists_alias(name=self.index_alias.name):
+            return
+
+        queryset = self.annotate_attachment_files(AttachmentFile.objects.filter(allegation_id=crid))
+        docs = [dict(doc, _index=self.index_alias.name) for doc in self.extract_docs(queryset)]
+        bulk(es_client, docs, refresh='wait_for')
+
+
+class AttachmentFilePartialIndexer(PartialIndexer, AttachmentFileIndexer):
+    def get_batch_queryset(self, keys):
+        return self.annotate_attachment_files(AttachmentFile.objects.filter(allegation_id__in=keys))
+
+    def get_batch_update_docs_queries(self, keys):
+        return self.doc_type_klass.search().query('terms', **{'crid.keyword': keys})
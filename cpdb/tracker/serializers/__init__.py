@@ -1,5 +1,5 @@
 from .attachmentfile_serializer import (
-    AttachmentFileListSerializer,
+    AttachmentFileListDocSerializer,
     AuthenticatedAttachmentFileListSerializer,
     AttachmentFileSerializer,
     AuthenticatedAttachmentFileSerializer,
@@ -8,7 +8,7 @@ from .attachmentfile_serializer import (
 from .document_crawler_serializer import DocumentCrawlerSerializer
 
 __all__ = [
-    'AttachmentFileListSerializer',
+    'AttachmentFileListDocSerializer',
     'AuthenticatedAttachmentFileListSerializer',
     'DocumentCrawlerSerializer',
     'AttachmentFileSerializer',
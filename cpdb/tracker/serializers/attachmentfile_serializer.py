@@ -9,7 +9,20 @@ from tracker.constants import TAG_MAX_LENGTH
 from data.constants import MEDIA_TYPE_DOCUMENT
 
 
-class AttachmentFileListSerializer(serializers.ModelSerializer):
+class AttachmentFileListDocSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    created_at = serializers.DateTimeField()
+    crid = serializers.CharField()
+    title = serializers.CharField()
+    source_type = serializers.CharField()
+    preview_image_url = serializers.CharField()
+    show = serializers.BooleanField()
+    documents_count = serializers.IntegerField()
+    file_type = serializers.CharField()
+    url = serializers.CharField()
+
+
+class AuthenticatedAttachmentFileListSerializer(serializers.ModelSerializer):
     crid = serializers.CharField(source='allegation_id')
     documents_count = serializers.IntegerField()
 
@@ -24,20 +37,10 @@ class AttachmentFileListSerializer(serializers.ModelSerializer):
             'preview_image_url',
             'show',
             'documents_count',
-            'show',
             'file_type',
             'url',
-        )
-
-
-class AuthenticatedAttachmentFileListSerializer(serializers.ModelSerializer):
-    crid = serializers.CharField(source='allegation_id')
-    documents_count = serializers.IntegerField()
-
-    class Meta(AttachmentFileListSerializer.Meta):
-        fields = AttachmentFileListSerializer.Meta.fields + (
             'views_count',
-            'downloads_count'
+            'downloads_count',
         )
 
 
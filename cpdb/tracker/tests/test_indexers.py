@@ -1,9 +1,11 @@
 from django.test import TestCase
 
+from mock import patch
 from robber import expect
 
 from data.factories import AttachmentFileFactory, AllegationFactory
-from tracker.indexers import AttachmentFileIndexer
+from tracker.index_aliases import tracker_index_alias
+from tracker.indexers import AttachmentFileIndexer, AttachmentFilePartialIndexer
 
 
 class AttachmentFileIndexerTestCase(TestCase):
@@ -14,20 +16,76 @@ class AttachmentFileIndexerTestCase(TestCase):
 
     def test_extract_datum(self):
         allegation = AllegationFactory(crid=123456)
-        datum = AttachmentFileFactory(
+        AttachmentFileFactory(
             id=1,
             allegation=allegation,
             title='Document Title',
             text_content='This is document text content.',
             show=False,
+            source_type='DOCUMENTCLOUD',
+            preview_image_url='http://web.com/image/CRID-123456-CR-p1-normal.gif',
+            file_type='document',
+            url='http://document/link/1',
         )
+        AttachmentFileFactory(allegation=allegation, show=True)
+        AttachmentFileFactory(allegation=allegation, show=True)
+        indexer = AttachmentFileIndexer()
+        datum = indexer.get_queryset().get(id=1)
 
-        expect(
-            AttachmentFileIndexer().extract_datum(datum)
-        ).to.be.eq({
+        expect(indexer.extract_datum(datum)).to.be.eq({
             'id': 1,
-            'crid': 123456,
+            'crid': '123456',
             'title': 'Document Title',
             'text_content': 'This is document text content.',
             'show': False,
+            'created_at': datum.created_at,
+            'updated_at': datum.updated_at,
+            'source_type': 'DOCUMENTCLOUD',
+            'preview_image_url': 'http://web.com/image/CRID-123456-CR-p1-normal.gif',
+            'file_type': 'document',
+            'url': 'http://document/link/1',
+            'documents_count': 2,
         })
+
+    @patch('tracker.indexers.bulk')
+    @patch('tracker.indexers.es_client')
+    def test_update_allegation_docs(self, es_client, bulk):
+        allegation = AllegationFactory(crid='123456')
+        AttachmentFileFactory(id=1, allegation=allegation)
+        AttachmentFileFactory(id=2, allegation=allegation)
+        AttachmentFileFactory(id=3)
+        es_client.indices.exists_alias.return_value = True
+
+        AttachmentFileIndexer().update_allegation_docs('123456')
+
+        docs = bulk.call_args[0][1]
+        expect(sorted(doc['_id'] for doc in docs)).to.eq([1, 2])
+        expect({doc['_index'] for doc in docs}).to.eq({tracker_index_alias.name})
+        expect(docs[0]['_source']['documents_count']).to.eq(2)
+        expect(bulk.call_args[1]).to.eq({'refresh': 'wait_for'})
+
+    @patch('tracker.indexers.bulk')
+    @patch('tracker.indexers.es_client')
+    def test_update_allegation_docs_without_index(self, es_client, bulk):
+        es_client.indices.exists_alias.return_value = False
+
+        AttachmentFileIndexer().update_allegation_docs('123456')
+
+        expect(bulk).not_to.be.called()
+
+
+class AttachmentFilePartialIndexerTestCase(TestCase):
+    def test_get_batch_queryset(self):
+        allegation = AllegationFactory(crid='123456')
+        AttachmentFileFactory(id=1, allegation=allegation)
+        AttachmentFileFactory(id=2, allegation=allegation, show=False)
+        AttachmentFileFactory(id=3)
+
+        queryset = AttachmentFilePartialIndexer().get_batch_queryset(['123456'])
+
+        expect({(item.id, item.documents_count) for item in queryset}).to.eq({(1, 1), (2, 1)})
+
+    def test_get_batch_update_docs_queries(self):
+        query = AttachmentFilePartialIndexer().get_batch_update_docs_queries(['123456'])
+
+        expect(query.to_dict()).to.eq({'query': {'terms': {'crid.keyword': ['123456']}}})
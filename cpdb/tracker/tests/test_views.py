@@ -9,6 +9,8 @@ from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 from robber import expect
 from freezegun import freeze_time
+from mock import patch, call
+from elasticsearch.exceptions import ConnectionError as ESConnectionError
 from urllib.parse import urlencode
 
 from authentication.factories import AdminUserFactory
@@ -250,6 +252,7 @@ class AttachmentAPITestCase(TrackerTestCaseMixin, APITestCase):
             url='http://video/link/3',
         )
         AttachmentFileFactory(id=4, allegation=allegation2, show=False)
+        self.refresh_index()
 
         expected_data = {
             'count': 3,
@@ -437,6 +440,45 @@ class AttachmentAPITestCase(TrackerTestCaseMixin, APITestCase):
         expect(response.status_code).to.eq(status.HTTP_200_OK)
         expect(AttachmentFile.objects.get(pk=1).show).to.be.false()
 
+    @patch('tracker.views.AttachmentFileIndexer.update_allegation_docs')
+    def test_update_attachment_moved_to_another_allegation(self, update_allegation_docs_mock):
+        admin_user = AdminUserFactory()
+        token, _ = Token.objects.get_or_create(user=admin_user)
+
+        AttachmentFileFactory(id=1, allegation=AllegationFactory(crid='123'))
+        AllegationFactory(crid='456')
+
+        def move_attachment():
+            AttachmentFile.objects.filter(id=1).update(allegation_id='456')
+
+        url = reverse('api-v2:attachments-detail', kwargs={'pk': '1'})
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        with patch('tracker.views.UpdateAttachmentFileSerializer.save', side_effect=move_attachment):
+            response = self.client.patch(url, {'show': False}, format='json')
+
+        expect(response.status_code).to.eq(status.HTTP_200_OK)
+        expect(update_allegation_docs_mock.call_args_list).to.eq([call('456'), call('123')])
+
+    @patch('tracker.views.logger')
+    @patch(
+        'tracker.views.AttachmentFileIndexer.update_allegation_docs',
+        side_effect=ESConnectionError('N/A', 'connection refused', Exception())
+    )
+    def test_update_attachment_when_index_is_unavailable(self, update_allegation_docs_mock, logger_mock):
+        admin_user = AdminUserFactory()
+        token, _ = Token.objects.get_or_create(user=admin_user)
+
+        AttachmentFileFactory(id=1, allegation=AllegationFactory(crid='123'))
+
+        url = reverse('api-v2:attachments-detail', kwargs={'pk': '1'})
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        response = self.client.patch(url, {'show': False}, format='json')
+
+        expect(response.status_code).to.eq(status.HTTP_200_OK)
+        expect(AttachmentFile.objects.get(pk=1).show).to.be.false()
+        update_allegation_docs_mock.assert_called_once_with('123')
+        logger_mock.exception.assert_called_once_with('Failed to update attachment docs of allegation 123')
+
     def test_update_attachment_bad_request(self):
         admin_user = AdminUserFactory()
         token, _ = Token.objects.get_or_create(user=admin_user)
@@ -822,6 +864,7 @@ class AttachmentAPITestCase(TrackerTestCaseMixin, APITestCase):
             url='http://audio/link/2',
         )
 
+        self.refresh_index()
         base_url = reverse('api-v2:attachments-list')
         query_string = urlencode({'crid': allegation1.crid})
         url = f'{base_url}?{query_string}'
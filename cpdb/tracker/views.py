@@ -1,3 +1,5 @@
+import logging
+
 from django.shortcuts import get_object_or_404
 from django.db.models import OuterRef
 from django.views.decorators.cache import never_cache
@@ -8,15 +10,17 @@ from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.serializers import ValidationError
 from rest_framework.decorators import action
+from elasticsearch import ElasticsearchException
 
 from data.constants import MEDIA_TYPE_DOCUMENT
 from data.models import AttachmentFile
 from data.utils.subqueries import SQCount
 from document_cloud.models import DocumentCrawler
-from es_index.pagination import ESQuerysetPagination
+from es_index.pagination import ESQuerysetPagination, ESQueryPagination
 from .doc_types import AttachmentFileDocType
+from .indexers import AttachmentFileIndexer
 from .serializers import (
-    AttachmentFileListSerializer,
+    AttachmentFileListDocSerializer,
     AuthenticatedAttachmentFileListSerializer,
     AttachmentFileSerializer,
     AuthenticatedAttachmentFileSerializer,
@@ -27,6 +31,8 @@ from activity_log.models import ActivityLog
 from activity_log.constants import ADD_TAG_TO_DOCUMENT, REMOVE_TAG_FROM_DOCUMENT
 from shared.utils import formatted_errors
 
+logger = logging.getLogger(__name__)
+
 
 class AttachmentViewSet(viewsets.ViewSet):
     permission_classes = (IsAuthenticatedOrReadOnly,)
@@ -43,21 +49,18 @@ class AttachmentViewSet(viewsets.ViewSet):
             return Response(AttachmentFileSerializer(document).data)
 
     def list(self, request):
+        if request.auth is None:
+            return self._list_from_index(request)
+
         queryset = AttachmentFile.objects.annotate(documents_count=SQCount(
             AttachmentFile.showing.filter(allegation=OuterRef('allegation')).values('allegation')
         ))
 
-        serializer_class = AttachmentFileListSerializer if request.auth is None else \
-            AuthenticatedAttachmentFileListSerializer
-
         if 'match' in request.query_params and 'crid' not in request.query_params:
-            match = request.query_params['match']
-
             es_query = AttachmentFileDocType().search().query(
-                'multi_match', query=match, operator='and', fields=['crid', 'title', 'text_content']
+                'multi_match', query=request.query_params['match'], operator='and',
+                fields=['crid', 'title', 'text_content']
             )
-            if request.auth is None:
-                es_query = es_query.filter('term', show=True)
 
             paginator = ESQuerysetPagination()
             page = paginator.paginate_es_query(es_query, request, queryset)
@@ -65,20 +68,36 @@ class AttachmentViewSet(viewsets.ViewSet):
             if 'crid' in request.query_params:
                 queryset = queryset.filter(allegation_id=request.query_params['crid'])
 
-            if request.auth is None:
-                queryset = queryset.filter(show=True)
-
             queryset = queryset.order_by('-created_at', '-updated_at', 'id')
 
             paginator = LimitOffsetPagination()
             page = paginator.paginate_queryset(queryset, request, view=self)
 
-        serializer = serializer_class(page, many=True)
+        serializer = AuthenticatedAttachmentFileListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def _list_from_index(self, request):
+        es_query = AttachmentFileDocType().search().filter('term', show=True)
+
+        if 'match' in request.query_params and 'crid' not in request.query_params:
+            es_query = es_query.query(
+                'multi_match', query=request.query_params['match'], operator='and',
+                fields=['crid', 'title', 'text_content']
+            )
+        else:
+            if 'crid' in request.query_params:
+                es_query = es_query.filter('term', **{'crid.keyword': request.query_params['crid']})
+            es_query = es_query.sort('-created_at', '-updated_at', 'id')
+
+        paginator = ESQueryPagination()
+        page = paginator.paginate_es_query(es_query, request)
+        serializer = AttachmentFileListDocSerializer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
 
     def partial_update(self, request, pk):
         attachment = get_object_or_404(AttachmentFile, id=pk)
         old_tags = list(attachment.tags.all())
+        old_crid = attachment.allegation_id
 
         serializer = UpdateAttachmentFileSerializer(
             instance=attachment,
@@ -90,6 +109,10 @@ class AttachmentViewSet(viewsets.ViewSet):
             if serializer.is_valid():
                 serializer.save()
                 attachment.refresh_from_db()
+                crids = [attachment.allegation_id]
+                if old_crid != attachment.allegation_id:
+                    crids.append(old_crid)
+                self._update_allegation_docs(crids)
                 new_tags = list(attachment.tags.all())
                 if new_tags != old_tags:
                     added_tags = list(set(new_tags).difference(set(old_tags)))
@@ -125,6 +148,16 @@ class AttachmentViewSet(viewsets.ViewSet):
                 data={'message': formatted_errors(serializer.errors)}
             )
 
+    @staticmethod
+    def _update_allegation_docs(crids):
+        # The update is already saved, the docs are left to the next sync_index run when the index is unavailable
+        indexer = AttachmentFileIndexer()
+        for crid in crids:
+            try:
+                indexer.update_allegation_docs(crid)
+            except ElasticsearchException:
+                logger.exception(f'Failed to update attachment docs of allegation {crid}')
+
     @action(detail=False, methods=['get'], url_path='tags')
     def tags(self, request):
         return Response(list(AttachmentFile.tags.all().order_by('name').values_list('name', flat=True)))
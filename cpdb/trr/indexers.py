@@ -1,5 +1,5 @@
 from es_index import register_indexer
-from es_index.indexers import BaseIndexer
+from es_index.indexers import BaseIndexer, PartialIndexer
 from trr.models import TRR
 from .doc_types import TRRDocType
 from .index_aliases import trr_index_alias
@@ -19,3 +19,11 @@ class TRRIndexer(BaseIndexer):
 
     def extract_datum(self, datum):
         return TRRDocSerializer(datum).data
+
+
+class TRRPartialIndexer(PartialIndexer, TRRIndexer):
+    def get_batch_queryset(self, keys):
+        return TRR.objects.filter(id__in=keys).select_related('officer')
+
+    def get_batch_update_docs_queries(self, keys):
+        return self.doc_type_klass.search().query('terms', id=keys)
@@ -8,7 +8,7 @@ import pytz
 
 from data.factories import OfficerFactory, PoliceUnitFactory, OfficerHistoryFactory
 from trr.factories import TRRFactory, ActionResponseFactory
-from trr.indexers import TRRIndexer
+from trr.indexers import TRRIndexer, TRRPartialIndexer
 
 
 class TRRIndexerTestCase(TestCase):
@@ -196,3 +196,16 @@ class TRRIndexerTestCase(TestCase):
             'beat': 1021,
             'point': None,
         })
+
+
+class TRRPartialIndexerTestCase(TestCase):
+    def test_get_queryset(self):
+        trr_1 = TRRFactory(id=1)
+        trr_2 = TRRFactory(id=2)
+        TRRFactory(id=3)
+
+        expect(set(TRRPartialIndexer(updating_keys=[1, 2]).get_queryset())).to.eq({trr_1, trr_2})
+
+    def test_get_batch_update_docs_queries(self):
+        update_docs_query = TRRPartialIndexer().get_batch_update_docs_queries(keys=[1, 2])
+        expect(update_docs_query.to_dict()).to.eq({'query': {'terms': {'id': [1, 2]}}})
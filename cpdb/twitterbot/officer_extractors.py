@@ -1,4 +1,5 @@
 from officers.doc_types import OfficerInfoDocType
+from search.workers import ALLEGATION_COUNT_BOOST
 from twitterbot.serializers import OfficerSerializer
 
 
@@ -17,12 +18,8 @@ class ElasticSearchOfficerExtractor:
                         }
                     }
                 },
-                script_score={
-                    'script': {
-                        'lang': 'painless',
-                        'inline': '_score + doc[\'allegation_count\'].value * 3'
-                    }
-                }
+                field_value_factor=ALLEGATION_COUNT_BOOST,
+                boost_mode='sum'
             )
             search_result = query[:1].execute()
             results += [
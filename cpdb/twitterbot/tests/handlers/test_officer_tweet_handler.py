@@ -68,8 +68,7 @@ class OfficerTweetHandlerTestCase(RebuildIndexMixin, TestCase):
         self.send_tweet_patcher = patch('twitterbot.handlers.officer_tweet_handler.send_tweet')
         self.send_tweet = self.send_tweet_patcher.start()
         self.percentile_patch = patch(
-            'officers.indexers.officers_indexer.officer_percentile.top_percentile',
-            return_value=[]
+            'officers.indexers.officers_indexer.officer_cache_manager.build_cached_yearly_percentiles'
         )
         self.percentile_patch.start()
 
@@ -43,7 +43,7 @@ class TextPipelineTestCase(RebuildIndexMixin, TestCase):
 
 
 class UrlPipelineTestCase(RebuildIndexMixin, TestCase):
-    @patch('officers.indexers.officers_indexer.officer_percentile.top_percentile', return_value=[])
+    @patch('officers.indexers.officers_indexer.officer_cache_manager.build_cached_yearly_percentiles')
     def test_extract_matching_id(self, _):
         OfficerFactory(id=1234, first_name='James', last_name='Lynch')
         self.refresh_index()
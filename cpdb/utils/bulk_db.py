@@ -1,28 +1,71 @@
-def build_bulk_update_sql(table_name, id_field, fields, data):
-    column_assignment = ', '.join(f'{field} = c.{field}' for field in fields)
-    data_columns = [id_field] + fields
-
-    def format_value(value):
-        if value is None:
-            return 'NULL'
-        elif isinstance(value, str):
-            return f"'{value}'"
-        else:
-            return str(value)
-
-    def format_value_row(row):
-        return f"({', '.join(format_value(row[field]) for field in data_columns)})"
-
-    value_rows = ', '.join(map(format_value_row, data))
-    defining_types = ', '.join(f'(NULL::{table_name}).{field}' for field in data_columns)
-    null_rows_for_defining_types = f'({defining_types}), '
-
-    return f'''
-        UPDATE {table_name} AS t SET
-          {column_assignment}
-        FROM (values
-          {null_rows_for_defining_types}
-          {value_rows}
-        ) AS c({', '.join(data_columns)})
-        WHERE c.{id_field} = t.{id_field};
-    '''
+from django.db import connection, transaction
+
+
+def _format_copy_value(value):
+    # COPY csv reads an unquoted empty field as NULL and a quoted one as an empty string
+    if value is None:
+        return ''
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+class CopyRowsReader(object):
+    """
+    File-like object handing rows to COPY as csv lines, pulling from the iterable only as psycopg2 reads so the
+    rows are never all held in memory.
+    """
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.buffer = ''
+
+    def read(self, size=-1):
+        lines = [self.buffer]
+        buffered_size = len(self.buffer)
+        for row in self.rows:
+            line = ','.join(map(_format_copy_value, row)) + '\n'
+            lines.append(line)
+            buffered_size += len(line)
+            if 0 <= size <= buffered_size:
+                break
+
+        data = ''.join(lines)
+        if size < 0:
+            size = len(data)
+        data, self.buffer = data[:size], data[size:]
+        return data
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+
+def bulk_update(table_name, id_field, fields, data):
+    """
+    Update `fields` of every `table_name` row matched on `id_field` from `data`, an iterable of dicts.
+
+    Rows are streamed with COPY into a temporary table shaped like the target table, so values are parsed by the
+    target column types rather than formatted into SQL, then applied with a single UPDATE ... FROM join.
+    `data` is consumed while COPY holds the connection, so it must not query the database itself: evaluate
+    querysets before passing rows built from them. Returns the number of updated rows.
+    """
+    data_columns = [id_field] + list(fields)
+    quote_name = connection.ops.quote_name
+    table = quote_name(table_name)
+    temp_table = quote_name(f'bulk_update_{table_name}')
+    column_list = ', '.join(map(quote_name, data_columns))
+    column_assignment = ', '.join(f'{quote_name(field)} = c.{quote_name(field)}' for field in fields)
+
+    rows = ([row[column] for column in data_columns] for row in data)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TEMP TABLE {temp_table} AS SELECT {column_list} FROM {table} WITH NO DATA')
+        cursor.copy_expert(f'COPY {temp_table} ({column_list}) FROM STDIN WITH (FORMAT csv)', CopyRowsReader(rows))
+        cursor.execute(f'ANALYZE {temp_table}')
+        cursor.execute(f'''
+            UPDATE {table} AS t SET
+              {column_assignment}
+            FROM {temp_table} AS c
+            WHERE c.{quote_name(id_field)} = t.{quote_name(id_field)}
+        ''')
+        updated_count = cursor.rowcount
+        cursor.execute(f'DROP TABLE {temp_table}')
+
+    return updated_count
@@ -1,37 +1,94 @@
-from django.test.testcases import TestCase
+from datetime import date
+from decimal import Decimal
+
+from django.test.testcases import TestCase, SimpleTestCase
 
 from robber import expect
 
-from utils.bulk_db import build_bulk_update_sql
-
-
-class BulkDbTestCase(TestCase):
-    def test_build_bulk_update_sql(self):
-        def _format_sql(sql_string):
-            ''.join(sql_string.replace('\n', '').split())
-
-        batch_data = [
-            {
-                'id': 1,
-                'first_name': 'Roman',
-                'complaint_percentile': 50
-            },
-            {
-                'id': 2,
-                'first_name': 'Jerome',
-                'complaint_percentile': 78
-            }
-        ]
-
-        expected_sql_string = '''
-            UPDATE officer AS t SET
-              complaint_percentile = c.complaint_percentile
-            FROM (values
-              ((NULL::officer).id, (NULL::officer).first_name, (NULL::officer).complaint_percentile),
-              (1, 'Roman', 50), (2, 'Jerome', 78)
-            ) AS c(id, first_name, complaint_percentile)
-            WHERE c.id = t.id;
-        '''
-
-        sql_string = build_bulk_update_sql('officer', 'id', ['first_name', 'complaint_percentile'], batch_data)
-        expect(_format_sql(sql_string)).to.eq(_format_sql(expected_sql_string))
+from data.factories import OfficerFactory
+from data.models import Officer
+from utils.bulk_db import bulk_update, CopyRowsReader
+
+
+class CopyRowsReaderTestCase(SimpleTestCase):
+    def test_read(self):
+        reader = CopyRowsReader([
+            [1, "O'Brien", None, True],
+            [2, '', 'say "hi"', 1.5],
+        ])
+
+        expect(reader.read()).to.eq('"1","O\'Brien",,"True"\n"2","","say ""hi""","1.5"\n')
+        expect(reader.read()).to.eq('')
+
+    def test_read_with_size(self):
+        reader = CopyRowsReader([[1, 'Roman'], [2, 'Jerome']])
+
+        chunks = []
+        chunk = reader.read(5)
+        while chunk:
+            expect(len(chunk)).to.be.below(6)
+            chunks.append(chunk)
+            chunk = reader.read(5)
+
+        expect(''.join(chunks)).to.eq('"1","Roman"\n"2","Jerome"\n')
+
+
+class BulkUpdateTestCase(TestCase):
+    def test_bulk_update(self):
+        OfficerFactory(id=1, first_name='Roman', middle_initial='A', complaint_percentile=None)
+        OfficerFactory(id=2, first_name='Jerome', middle_initial='B', complaint_percentile=Decimal('10.0'))
+        OfficerFactory(id=3, first_name='Edward', middle_initial='C', complaint_percentile=Decimal('20.0'))
+
+        updated_count = bulk_update(
+            Officer._meta.db_table,
+            'id',
+            ['first_name', 'middle_initial', 'complaint_percentile', 'appointed_date'],
+            [
+                {
+                    'id': 1,
+                    'first_name': "O'Brien",
+                    'middle_initial': '',
+                    'complaint_percentile': Decimal('50.1234'),
+                    'appointed_date': date(2001, 2, 3),
+                },
+                {
+                    'id': 2,
+                    'first_name': 'Jerome, "Jerry"',
+                    'middle_initial': None,
+                    'complaint_percentile': None,
+                    'appointed_date': None,
+                },
+                {
+                    'id': 4,
+                    'first_name': 'Missing',
+                    'middle_initial': None,
+                    'complaint_percentile': None,
+                    'appointed_date': None,
+                },
+            ]
+        )
+
+        expect(updated_count).to.eq(2)
+
+        officer_1 = Officer.objects.get(id=1)
+        expect(officer_1.first_name).to.eq("O'Brien")
+        expect(officer_1.middle_initial).to.eq('')
+        expect(officer_1.complaint_percentile).to.eq(Decimal('50.1234'))
+        expect(officer_1.appointed_date).to.eq(date(2001, 2, 3))
+
+        officer_2 = Officer.objects.get(id=2)
+        expect(officer_2.first_name).to.eq('Jerome, "Jerry"')
+        expect(officer_2.middle_initial).to.be.none()
+        expect(officer_2.complaint_percentile).to.be.none()
+
+        officer_3 = Officer.objects.get(id=3)
+        expect(officer_3.first_name).to.eq('Edward')
+        expect(officer_3.complaint_percentile).to.eq(Decimal('20.0'))
+
+    def test_bulk_update_twice(self):
+        OfficerFactory(id=1, first_name='Roman')
+
+        bulk_update(Officer._meta.db_table, 'id', ['first_name'], [{'id': 1, 'first_name': 'Jerome'}])
+        bulk_update(Officer._meta.db_table, 'id', ['first_name'], iter([{'id': 1, 'first_name': 'Edward'}]))
+
+        expect(Officer.objects.get(id=1).first_name).to.eq('Edward')
@@ -0,0 +1,110 @@
+from django.db import connection
+
+
+def _row_hash(alias, *excluded_columns):
+    excluded = ''.join(f" - '{column}'" for column in ('created_at', 'updated_at') + excluded_columns)
+    return f'md5((to_jsonb({alias}){excluded})::text)'
+
+
+# Officer rows are printed in full, with the name of their last unit, on the accused, coaccused and witness sheets.
+def _officer_hashes(officer_alias, unit_alias):
+    return f'{_row_hash(officer_alias)}, {_row_hash(unit_alias)}'
+
+
+ATTACHMENT_HASH = _row_hash(
+    'AF', 'views_count', 'downloads_count', 'notifications_count', 'reprocess_text_count', 'upload_fail_attempts'
+)
+
+# An allegation contributes its own row, its beat, documents, victims, police witnesses and every officer accused
+# in it, with their findings and category. Attachment counters are bumped by page views and never show up in the
+# spreadsheets, so they are left out of the hash.
+ALLEGATION_CONTENT = f'''
+    concat(
+        {_row_hash('A')},
+        (
+            SELECT concat({_row_hash('B', 'polygon')}, {_row_hash('BC')}, {_row_hash('BHQ', 'polygon')})
+            FROM data_area AS B
+            LEFT JOIN data_officer AS BC ON BC.id = B.commander_id
+            LEFT JOIN data_area AS BHQ ON BHQ.id = B.police_hq_id
+            WHERE B.id = A.beat_id
+        ),
+        (
+            SELECT string_agg(
+                concat({_row_hash('COA')}, {_row_hash('AC')}, {_officer_hashes('CO', 'COU')}), '' ORDER BY COA.id
+            )
+            FROM data_officerallegation AS COA
+            LEFT JOIN data_allegationcategory AS AC ON AC.id = COA.allegation_category_id
+            LEFT JOIN data_officer AS CO ON CO.id = COA.officer_id
+            LEFT JOIN data_policeunit AS COU ON COU.id = CO.last_unit_id
+            WHERE COA.allegation_id = A.crid
+        ),
+        (
+            SELECT string_agg({ATTACHMENT_HASH}, '' ORDER BY AF.id)
+            FROM data_attachmentfile AS AF
+            WHERE AF.allegation_id = A.crid
+        ),
+        (
+            SELECT string_agg({_row_hash('V')}, '' ORDER BY V.id)
+            FROM data_victim AS V
+            WHERE V.allegation_id = A.crid
+        ),
+        (
+            SELECT string_agg(concat({_row_hash('PW')}, {_officer_hashes('PWO', 'PWU')}), '' ORDER BY PW.id)
+            FROM data_policewitness AS PW
+            LEFT JOIN data_officer AS PWO ON PWO.id = PW.officer_id
+            LEFT JOIN data_policeunit AS PWU ON PWU.id = PWO.last_unit_id
+            WHERE PW.allegation_id = A.crid
+        )
+    )
+'''
+
+OFFICER_XLSX_FINGERPRINTS_QUERY = f'''
+    SELECT
+        O.id AS officer_id,
+        md5(concat(
+            'accused:',
+            (
+                SELECT string_agg({_row_hash('OA')} || {ALLEGATION_CONTENT}, '' ORDER BY OA.id)
+                FROM data_officerallegation AS OA
+                INNER JOIN data_allegation AS A ON A.crid = OA.allegation_id
+                WHERE OA.officer_id = O.id
+            ),
+            '|coaccused:',
+            (
+                SELECT string_agg({_row_hash('OC', 'id')}, '' ORDER BY OC.officer_2_id)
+                FROM data_officercoaccusal AS OC
+                WHERE OC.officer_1_id = O.id
+            ),
+            '|investigated:',
+            (
+                SELECT string_agg({_row_hash('IA')} || {ALLEGATION_CONTENT}, '' ORDER BY IA.id)
+                FROM data_investigatorallegation AS IA
+                INNER JOIN data_investigator AS I ON I.id = IA.investigator_id
+                INNER JOIN data_allegation AS A ON A.crid = IA.allegation_id
+                WHERE I.officer_id = O.id
+            ),
+            '|trr:',
+            (
+                SELECT string_agg(concat({_row_hash('T')}, {_row_hash('TU')}, {_row_hash('TUD')}), '' ORDER BY T.id)
+                FROM trr_trr AS T
+                LEFT JOIN data_policeunit AS TU ON TU.id = T.officer_unit_id
+                LEFT JOIN data_policeunit AS TUD ON TUD.id = T.officer_unit_detail_id
+                WHERE T.officer_id = O.id
+            )
+        )) AS fingerprint
+    FROM data_officer AS O
+    WHERE %(officer_ids)s::int[] IS NULL OR O.id = ANY(%(officer_ids)s::int[])
+'''
+
+
+def get_officer_xlsx_fingerprints(officer_ids=None):
+    """
+    Map officer ids to a hash of everything their spreadsheets are built from: accused allegations, coaccusals,
+    investigations and TRRs, including the beats, documents, victims, witnesses and accused officers of those
+    allegations.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(OFFICER_XLSX_FINGERPRINTS_QUERY, {
+            'officer_ids': [int(officer_id) for officer_id in officer_ids] if officer_ids is not None else None
+        })
+        return dict(cursor.fetchall())
@@ -1,19 +1,43 @@
+from functools import partial
 from multiprocessing import Pool
+from time import time
 import shutil
 
+import botocore
 from django.core.management import BaseCommand
 from django.conf import settings
 
 from tqdm import tqdm
 
 from data.models import Officer
+from xlsx.constants import XLSX_FINGERPRINT_FILE_NAME
+from xlsx.fingerprints import get_officer_xlsx_fingerprints
 from xlsx.utils import export_officer_xlsx
+from xlsx.writers.officer_xlsx_context import OfficerXlsxContext
 from shared.aws import aws
 
 
-def upload_xlsx_files(officer):
+def get_fingerprint_key(officer):
+    return f'{settings.S3_BUCKET_XLSX_DIRECTORY}/{officer.id}/{XLSX_FINGERPRINT_FILE_NAME}'
+
+
+def get_uploaded_fingerprint(officer):
+    try:
+        response = aws.s3.get_object(Bucket=settings.S3_BUCKET_OFFICER_CONTENT, Key=get_fingerprint_key(officer))
+    except botocore.exceptions.ClientError as e:
+        if e.response['Error']['Code'] == 'NoSuchKey':
+            return None
+        raise e
+    return response['Body'].read().decode()
+
+
+def upload_xlsx_files(officer, force=False):
+    if not force and get_uploaded_fingerprint(officer) == officer.xlsx_fingerprint:
+        return None
+
     tmp_dir = f'tmp/{officer.id}'
-    file_names = export_officer_xlsx(officer, tmp_dir)
+    context = OfficerXlsxContext(officer)
+    file_names = export_officer_xlsx(officer, tmp_dir, context=context)
 
     for file_name in file_names:
         aws.s3.upload_file(
@@ -24,16 +48,51 @@ def upload_xlsx_files(officer):
 
     shutil.rmtree(tmp_dir, ignore_errors=True)
 
+    # The fingerprint is only stored once every file is up so an interrupted run is retried next time
+    aws.s3.put_object(
+        Bucket=settings.S3_BUCKET_OFFICER_CONTENT,
+        Key=get_fingerprint_key(officer),
+        Body=officer.xlsx_fingerprint.encode()
+    )
+    officer.invalidate_zip_files()
+    return context.row_count
+
 
 class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('officer_ids', nargs='*')
+        parser.add_argument(
+            '--force', action='store_true', help='Regenerate xlsx files even if the officer data has not changed'
+        )
 
-    def handle(self, officer_ids, *args, **kwargs):
+    def get_officers(self, officer_ids):
         if officer_ids:
-            officers = Officer.objects.filter(id__in=officer_ids)
+            officers = list(Officer.objects.filter(id__in=officer_ids))
+            fingerprints = get_officer_xlsx_fingerprints(officer_ids)
         else:
-            officers = Officer.objects.all()
+            officers = list(Officer.objects.all())
+            fingerprints = get_officer_xlsx_fingerprints()
+
+        for officer in officers:
+            officer.xlsx_fingerprint = fingerprints[officer.id]
+        return officers
+
+    def handle(self, officer_ids, *args, **kwargs):
+        officers = self.get_officers(officer_ids)
 
+        start_time = time()
         with Pool(20) as p:
-            list(tqdm(p.imap(upload_xlsx_files, officers), desc='Uploading officer xlsx', total=officers.count()))
+            row_counts = list(tqdm(
+                p.imap(partial(upload_xlsx_files, force=kwargs['force']), officers),
+                desc='Uploading officer xlsx',
+                total=len(officers)
+            ))
+        elapsed_time = time() - start_time
+
+        uploaded_row_counts = [row_count for row_count in row_counts if row_count is not None]
+        row_count = sum(uploaded_row_counts)
+        rows_per_second = row_count / elapsed_time if elapsed_time else 0
+        self.stdout.write(
+            f'Wrote {row_count} xlsx rows for {len(uploaded_row_counts)} officers in {elapsed_time:.2f}s '
+            f'({rows_per_second:.1f} rows/sec), skipped {len(row_counts) - len(uploaded_row_counts)} unchanged'
+        )
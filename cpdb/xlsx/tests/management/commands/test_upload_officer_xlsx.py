@@ -1,9 +1,11 @@
 import os
+from io import StringIO, BytesIO
 
+import botocore
 from django.core.management import call_command
 from django.test import TestCase, override_settings
 
-from mock import patch, MagicMock, Mock
+from mock import patch, MagicMock, Mock, ANY
 from robber import expect
 
 from data.factories import OfficerFactory
@@ -11,6 +13,7 @@ from data.factories import OfficerFactory
 
 class UploadOfficerXlsxTestCase(TestCase):
     @override_settings(S3_BUCKET_OFFICER_CONTENT='officer_content_bucket', S3_BUCKET_XLSX_DIRECTORY='xlsx')
+    @patch('data.models.officer.aws')
     @patch(
         'xlsx.management.commands.upload_officer_xlsx.Pool',
         return_value=MagicMock(__enter__=Mock(return_value=Mock(imap=map)))
@@ -21,7 +24,7 @@ class UploadOfficerXlsxTestCase(TestCase):
         create=True
     )
     @patch('xlsx.management.commands.upload_officer_xlsx.aws')
-    def test_upload_officer_xlsx(self, aws_mock, mock_export_officer_xlsx, _):
+    def test_upload_officer_xlsx(self, aws_mock, mock_export_officer_xlsx, _, officer_aws_mock):
         officer_1 = OfficerFactory(id=1)
         officer_2 = OfficerFactory(id=2)
         officer_3 = OfficerFactory(id=3)
@@ -60,13 +63,17 @@ class UploadOfficerXlsxTestCase(TestCase):
         )
 
         expect(mock_export_officer_xlsx.call_count).to.eq(3)
-        expect(mock_export_officer_xlsx).to.be.any_call(officer_1, 'tmp/1')
-        expect(mock_export_officer_xlsx).to.be.any_call(officer_2, 'tmp/2')
-        expect(mock_export_officer_xlsx).to.be.any_call(officer_3, 'tmp/3')
+        expect(mock_export_officer_xlsx).to.be.any_call(officer_1, 'tmp/1', context=ANY)
+        expect(mock_export_officer_xlsx).to.be.any_call(officer_2, 'tmp/2', context=ANY)
+        expect(mock_export_officer_xlsx).to.be.any_call(officer_3, 'tmp/3', context=ANY)
+
+        expect(aws_mock.s3.put_object.call_count).to.eq(3)
+        expect(officer_aws_mock.s3.delete_object.call_count).to.eq(6)
 
         expect(os.path.exists('tmp')).to.be.false()
 
     @override_settings(S3_BUCKET_OFFICER_CONTENT='officer_content_bucket', S3_BUCKET_XLSX_DIRECTORY='xlsx')
+    @patch('data.models.officer.aws')
     @patch(
         'xlsx.management.commands.upload_officer_xlsx.Pool',
         return_value=MagicMock(__enter__=Mock(return_value=Mock(imap=map)))
@@ -77,7 +84,7 @@ class UploadOfficerXlsxTestCase(TestCase):
         create=True
     )
     @patch('xlsx.management.commands.upload_officer_xlsx.aws')
-    def test_upload_officer_xlsx_with_officer_id(self, aws_mock, mock_export_officer_xlsx, _):
+    def test_upload_officer_xlsx_with_officer_id(self, aws_mock, mock_export_officer_xlsx, _, __):
         officer_1 = OfficerFactory(id=1)
         OfficerFactory(id=2)
         officer_3 = OfficerFactory(id=3)
@@ -106,7 +113,115 @@ class UploadOfficerXlsxTestCase(TestCase):
         )
 
         expect(mock_export_officer_xlsx.call_count).to.eq(2)
-        expect(mock_export_officer_xlsx).to.be.any_call(officer_1, 'tmp/1')
-        expect(mock_export_officer_xlsx).to.be.any_call(officer_3, 'tmp/3')
+        expect(mock_export_officer_xlsx).to.be.any_call(officer_1, 'tmp/1', context=ANY)
+        expect(mock_export_officer_xlsx).to.be.any_call(officer_3, 'tmp/3', context=ANY)
 
         expect(os.path.exists('tmp')).to.be.false()
+
+    @override_settings(S3_BUCKET_OFFICER_CONTENT='officer_content_bucket', S3_BUCKET_XLSX_DIRECTORY='xlsx')
+    @patch('data.models.officer.aws')
+    @patch(
+        'xlsx.management.commands.upload_officer_xlsx.Pool',
+        return_value=MagicMock(__enter__=Mock(return_value=Mock(imap=map)))
+    )
+    @patch('xlsx.management.commands.upload_officer_xlsx.export_officer_xlsx')
+    @patch('xlsx.management.commands.upload_officer_xlsx.aws')
+    @patch('xlsx.management.commands.upload_officer_xlsx.time', side_effect=[100.0, 104.0])
+    def test_upload_officer_xlsx_report_rows_per_second(self, _, __, mock_export_officer_xlsx, ___, ____):
+        def export_officer_xlsx(officer, out_dir, context):
+            context.row_count += 10
+            return ['first.xlsx']
+
+        mock_export_officer_xlsx.side_effect = export_officer_xlsx
+        OfficerFactory(id=1)
+        OfficerFactory(id=2)
+
+        out = StringIO()
+        call_command('upload_officer_xlsx', stdout=out)
+
+        expect(out.getvalue()).to.contain(
+            'Wrote 20 xlsx rows for 2 officers in 4.00s (5.0 rows/sec), skipped 0 unchanged'
+        )
+
+    @override_settings(S3_BUCKET_OFFICER_CONTENT='officer_content_bucket', S3_BUCKET_XLSX_DIRECTORY='xlsx')
+    @patch('data.models.officer.aws')
+    @patch(
+        'xlsx.management.commands.upload_officer_xlsx.Pool',
+        return_value=MagicMock(__enter__=Mock(return_value=Mock(imap=map)))
+    )
+    @patch(
+        'xlsx.management.commands.upload_officer_xlsx.get_officer_xlsx_fingerprints',
+        return_value={1: 'unchanged', 2: 'changed', 3: 'new'}
+    )
+    @patch('xlsx.management.commands.upload_officer_xlsx.export_officer_xlsx', return_value=['first.xlsx'])
+    @patch('xlsx.management.commands.upload_officer_xlsx.aws')
+    def test_upload_officer_xlsx_skip_unchanged_officers(
+        self, aws_mock, mock_export_officer_xlsx, _, __, officer_aws_mock
+    ):
+        OfficerFactory(id=1)
+        officer_2 = OfficerFactory(id=2, first_name='Jerome', last_name='Finnigan')
+        officer_3 = OfficerFactory(id=3)
+        uploaded_fingerprints = {
+            'xlsx/1/fingerprint': 'unchanged',
+            'xlsx/2/fingerprint': 'outdated',
+        }
+
+        def get_object(Bucket, Key):
+            try:
+                return {'Body': BytesIO(uploaded_fingerprints[Key].encode())}
+            except KeyError:
+                raise botocore.exceptions.ClientError(
+                    error_response={'Error': {'Code': 'NoSuchKey'}},
+                    operation_name='get_object'
+                )
+
+        aws_mock.s3.get_object.side_effect = get_object
+
+        out = StringIO()
+        call_command('upload_officer_xlsx', stdout=out)
+
+        expect(mock_export_officer_xlsx.call_count).to.eq(2)
+        expect(mock_export_officer_xlsx).to.be.any_call(officer_2, 'tmp/2', context=ANY)
+        expect(mock_export_officer_xlsx).to.be.any_call(officer_3, 'tmp/3', context=ANY)
+
+        expect(aws_mock.s3.upload_file.call_count).to.eq(2)
+        expect(aws_mock.s3.put_object.call_count).to.eq(2)
+        expect(aws_mock.s3.put_object).to.be.any_call(
+            Bucket='officer_content_bucket',
+            Key='xlsx/2/fingerprint',
+            Body=b'changed'
+        )
+        expect(aws_mock.s3.put_object).to.be.any_call(
+            Bucket='officer_content_bucket',
+            Key='xlsx/3/fingerprint',
+            Body=b'new'
+        )
+
+        expect(officer_aws_mock.s3.delete_object.call_count).to.eq(4)
+        expect(officer_aws_mock.s3.delete_object).to.be.any_call(
+            Bucket='officer_content_bucket',
+            Key='zip/Jerome_Finnigan.zip'
+        )
+        expect(out.getvalue()).to.contain('skipped 1 unchanged')
+
+    @override_settings(S3_BUCKET_OFFICER_CONTENT='officer_content_bucket', S3_BUCKET_XLSX_DIRECTORY='xlsx')
+    @patch('data.models.officer.aws')
+    @patch(
+        'xlsx.management.commands.upload_officer_xlsx.Pool',
+        return_value=MagicMock(__enter__=Mock(return_value=Mock(imap=map)))
+    )
+    @patch(
+        'xlsx.management.commands.upload_officer_xlsx.get_officer_xlsx_fingerprints',
+        return_value={1: 'unchanged'}
+    )
+    @patch('xlsx.management.commands.upload_officer_xlsx.export_officer_xlsx', return_value=['first.xlsx'])
+    @patch('xlsx.management.commands.upload_officer_xlsx.aws')
+    def test_upload_officer_xlsx_force(self, aws_mock, mock_export_officer_xlsx, _, __, ___):
+        officer = OfficerFactory(id=1)
+        aws_mock.s3.get_object.return_value = {'Body': BytesIO(b'unchanged')}
+
+        call_command('upload_officer_xlsx', '--force')
+
+        expect(aws_mock.s3.get_object).not_to.be.called()
+        expect(mock_export_officer_xlsx).to.be.called_once()
+        expect(mock_export_officer_xlsx).to.be.called_with(officer, 'tmp/1', context=ANY)
@@ -0,0 +1,99 @@
+from django.test import TestCase
+
+from robber import expect
+
+from data.factories import (
+    OfficerFactory, AllegationFactory, OfficerAllegationFactory, AttachmentFileFactory, InvestigatorFactory,
+    InvestigatorAllegationFactory, VictimFactory, PoliceUnitFactory, AllegationCategoryFactory, AreaFactory,
+)
+from data.models import OfficerCoaccusal
+from trr.factories import TRRFactory
+from xlsx.fingerprints import get_officer_xlsx_fingerprints
+
+
+class GetOfficerXlsxFingerprintsTestCase(TestCase):
+    def setUp(self):
+        self.officer = OfficerFactory(id=1)
+        self.other_officer = OfficerFactory(id=2)
+        self.allegation = AllegationFactory(crid='123', summary='Summary')
+        OfficerAllegationFactory(id=1, officer=self.officer, allegation=self.allegation)
+        self.attachment = AttachmentFileFactory(id=1, allegation=self.allegation, title='Report')
+
+    def test_get_officer_xlsx_fingerprints(self):
+        fingerprints = get_officer_xlsx_fingerprints()
+
+        expect(fingerprints).to.have.length(2)
+        expect(fingerprints[1]).to.have.length(32)
+        expect(fingerprints[1]).not_to.eq(fingerprints[2])
+        expect(get_officer_xlsx_fingerprints()).to.eq(fingerprints)
+
+    def test_get_officer_xlsx_fingerprints_with_officer_ids(self):
+        fingerprints = get_officer_xlsx_fingerprints(['1'])
+
+        expect(fingerprints).to.eq({1: get_officer_xlsx_fingerprints()[1]})
+
+    def test_fingerprint_changes_with_related_data(self):
+        fingerprint = get_officer_xlsx_fingerprints([1])[1]
+
+        VictimFactory(allegation=self.allegation)
+        victim_fingerprint = get_officer_xlsx_fingerprints([1])[1]
+        expect(victim_fingerprint).not_to.eq(fingerprint)
+
+        self.attachment.title = 'New report'
+        self.attachment.save()
+        document_fingerprint = get_officer_xlsx_fingerprints([1])[1]
+        expect(document_fingerprint).not_to.eq(victim_fingerprint)
+
+        TRRFactory(officer=self.officer)
+        trr_fingerprint = get_officer_xlsx_fingerprints([1])[1]
+        expect(trr_fingerprint).not_to.eq(document_fingerprint)
+
+        InvestigatorAllegationFactory(
+            allegation=AllegationFactory(crid='456'), investigator=InvestigatorFactory(officer=self.officer)
+        )
+        expect(get_officer_xlsx_fingerprints([1])[1]).not_to.eq(trr_fingerprint)
+
+    def test_fingerprint_changes_with_coaccused_officer(self):
+        unit = PoliceUnitFactory(unit_name='001')
+        coaccused_officer = OfficerFactory(id=3, complaint_percentile=10.0, last_unit=unit)
+        OfficerAllegationFactory(officer=coaccused_officer, allegation=self.allegation)
+        fingerprint = get_officer_xlsx_fingerprints([1])[1]
+
+        coaccused_officer.complaint_percentile = 20.0
+        coaccused_officer.save()
+        percentile_fingerprint = get_officer_xlsx_fingerprints([1])[1]
+        expect(percentile_fingerprint).not_to.eq(fingerprint)
+
+        unit.unit_name = '002'
+        unit.save()
+        unit_fingerprint = get_officer_xlsx_fingerprints([1])[1]
+        expect(unit_fingerprint).not_to.eq(percentile_fingerprint)
+
+        OfficerCoaccusal.objects.filter(officer_1_id=1, officer_2_id=3).update(coaccusal_count=2)
+        expect(get_officer_xlsx_fingerprints([1])[1]).not_to.eq(unit_fingerprint)
+
+    def test_fingerprint_changes_with_category_and_beat(self):
+        category = AllegationCategoryFactory(category='Use Of Force')
+        beat = AreaFactory(name='1', area_type='beat')
+        OfficerAllegationFactory(
+            officer=self.officer, allegation=AllegationFactory(crid='456', beat=beat), allegation_category=category
+        )
+        fingerprint = get_officer_xlsx_fingerprints([1])[1]
+
+        category.allegation_name = 'Excessive Force'
+        category.save()
+        category_fingerprint = get_officer_xlsx_fingerprints([1])[1]
+        expect(category_fingerprint).not_to.eq(fingerprint)
+
+        beat.median_income = '$50,000'
+        beat.save()
+        expect(get_officer_xlsx_fingerprints([1])[1]).not_to.eq(category_fingerprint)
+
+    def test_fingerprint_ignores_untracked_changes(self):
+        fingerprint = get_officer_xlsx_fingerprints([1])[1]
+
+        self.attachment.views_count = 100
+        self.attachment.save()
+        self.allegation.save()
+
+        expect(get_officer_xlsx_fingerprints([1])[1]).to.eq(fingerprint)
@@ -1,9 +1,12 @@
 from rest_framework.serializers import Serializer, CharField
 from robber import expect
 
-from data.factories import OfficerFactory, AllegationFactory, OfficerAllegationFactory
+from data.factories import (
+    OfficerFactory, AllegationFactory, OfficerAllegationFactory, InvestigatorFactory, InvestigatorAllegationFactory,
+)
 from data.models import Officer, Allegation
 from xlsx.tests.writer_base_test_case import WriterBaseTestCase
+from xlsx.writers.officer_xlsx_context import OfficerXlsxContext
 from xlsx.writers.officer_xlsx_writer import OfficerXlsxWriter
 
 
@@ -62,8 +65,33 @@ class OfficerXlsxWriterTestCase(WriterBaseTestCase):
 
         self.covert_xlsx_to_csv('officer.xlsx')
         self.assert_csv_files_equal('', ['Officer', 'Allegation'])
+        expect(writer.context.row_count).to.eq(2)
 
     def test_raise_NotImplementedError(self):
         officer = OfficerFactory()
         writer = OfficerXlsxWriter(officer=officer, out_dir=self.test_output_dir)
         expect(writer.export_xlsx).to.throw(NotImplementedError)
+
+    def test_share_context(self):
+        officer = OfficerFactory()
+        context = OfficerXlsxContext(officer)
+        OfficerTestWriter(officer=officer, out_dir=self.test_output_dir, context=context).export_xlsx()
+        writer = OfficerTestWriter(officer=officer, out_dir=self.test_output_dir, context=context)
+        writer.export_xlsx()
+
+        expect(writer.context).to.eq(context)
+        expect(context.row_count).to.eq(2)
+
+    def test_context_crids(self):
+        officer = OfficerFactory()
+        allegation_1 = AllegationFactory(crid='123')
+        allegation_2 = AllegationFactory(crid='456')
+        AllegationFactory(crid='789')
+        OfficerAllegationFactory(officer=officer, allegation=allegation_1)
+        OfficerAllegationFactory(officer=officer, allegation=allegation_1)
+        InvestigatorAllegationFactory(allegation=allegation_2, investigator=InvestigatorFactory(officer=officer))
+
+        context = OfficerXlsxContext(officer)
+
+        expect(context.accused_crids).to.eq(['123'])
+        expect(context.investigated_crids).to.eq(['456'])
@@ -15,31 +15,31 @@ class AccusedXlsxWriter(OfficerXlsxWriter):
         ws = self.wb.create_sheet('Allegation', 0)
         officer_allegations = OfficerAllegation.objects.filter(
             officer=self.officer
-        ).select_related('allegation').order_by('allegation__crid')
+        ).select_related('allegation__beat', 'allegation_category', 'officer').order_by('allegation__crid')
         self.write_sheet(ws, officer_allegations, OfficerAllegationXlsxSerializer)
 
     def write_coaccused_officers(self):
         ws = self.wb.create_sheet('Coaccused Officer', 1)
-        self.write_sheet(ws, self.officer.coaccusals, CoaccusedOfficerXlsxSerializer)
+        self.write_sheet(ws, self.officer.coaccusals.select_related('last_unit'), CoaccusedOfficerXlsxSerializer)
 
     def write_police_witnesses_sheet(self):
         ws = self.wb.create_sheet('Police Witness', 2)
         police_witnesses = PoliceWitness.objects.filter(
-            allegation__officerallegation__officer=self.officer
-        ).distinct().select_related('officer', 'allegation').order_by('allegation__crid')
+            allegation_id__in=self.context.accused_crids
+        ).select_related('officer__last_unit', 'allegation').order_by('allegation__crid')
         self.write_sheet(ws, police_witnesses, PoliceWitnessXlsxSerializer)
 
     def write_beat_sheet(self):
         ws = self.wb.create_sheet('Beat', 3)
         beats = Area.objects.filter(
-            beats__officerallegation__officer=self.officer
-        ).distinct().select_related('police_hq').order_by('id')
+            beats__crid__in=self.context.accused_crids
+        ).distinct().select_related('police_hq', 'commander').order_by('id')
         self.write_sheet(ws, beats, AreaXlsxSerializer)
 
     def write_victim_sheet(self):
         ws = self.wb.create_sheet('Victim', 4)
         victims = Victim.objects.filter(
-            allegation__officerallegation__officer=self.officer
+            allegation_id__in=self.context.accused_crids
         ).select_related('allegation').order_by('allegation__crid')
         self.write_sheet(ws, victims, VictimXlsxSerializer)
 
@@ -1,3 +1,5 @@
+from data.constants import AttachmentSourceType
+from data.models import AttachmentFile
 from xlsx.constants import DOCUMENTS_XLSX
 from xlsx.serializers.attachment_xlsx_serializer import AttachmentXlsxSerializer
 from xlsx.writers.officer_xlsx_writer import OfficerXlsxWriter
@@ -6,13 +8,19 @@ from xlsx.writers.officer_xlsx_writer import OfficerXlsxWriter
 class DocumentsXlsxWriter(OfficerXlsxWriter):
     file_name = DOCUMENTS_XLSX
 
+    def get_attachments(self, crids):
+        return AttachmentFile.showing.filter(
+            allegation_id__in=crids,
+            source_type__in=AttachmentSourceType.DOCUMENTCLOUD_SOURCE_TYPES,
+        ).order_by('id')
+
     def write_complaint_documents_sheet(self):
         ws = self.wb.create_sheet('Complaint Documents', 0)
-        self.write_sheet(ws, self.officer.allegation_attachments, AttachmentXlsxSerializer)
+        self.write_sheet(ws, self.get_attachments(self.context.accused_crids), AttachmentXlsxSerializer)
 
     def write_investigation_documents_sheet(self):
         ws = self.wb.create_sheet('Investigation Documents', 1)
-        self.write_sheet(ws, self.officer.investigator_attachments, AttachmentXlsxSerializer)
+        self.write_sheet(ws, self.get_attachments(self.context.investigated_crids), AttachmentXlsxSerializer)
 
     def export_xlsx(self):
         self.write_complaint_documents_sheet()
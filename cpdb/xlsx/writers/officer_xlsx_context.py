@@ -0,0 +1,44 @@
+from django.db import connection
+from django.utils.functional import cached_property
+
+from utils.raw_query_utils import dict_fetch_all
+
+
+OFFICER_CRIDS_QUERY = '''
+    SELECT
+        ARRAY(
+            SELECT DISTINCT allegation_id
+            FROM data_officerallegation
+            WHERE officer_id = %(officer_id)s AND allegation_id IS NOT NULL
+        ) AS accused_crids,
+        ARRAY(
+            SELECT DISTINCT IA.allegation_id
+            FROM data_investigatorallegation AS IA
+            INNER JOIN data_investigator AS I ON I.id = IA.investigator_id
+            WHERE I.officer_id = %(officer_id)s
+        ) AS investigated_crids
+'''
+
+
+class OfficerXlsxContext(object):
+    """
+    State shared by every xlsx writer of one officer: the allegations the officer is accused in and
+    investigated, fetched together in one query, and the number of rows streamed so far.
+    """
+    def __init__(self, officer):
+        self.officer = officer
+        self.row_count = 0
+
+    @cached_property
+    def _crids(self):
+        with connection.cursor() as cursor:
+            cursor.execute(OFFICER_CRIDS_QUERY, {'officer_id': self.officer.id})
+            return dict_fetch_all(cursor)[0]
+
+    @property
+    def accused_crids(self):
+        return self._crids['accused_crids']
+
+    @property
+    def investigated_crids(self):
+        return self._crids['investigated_crids']
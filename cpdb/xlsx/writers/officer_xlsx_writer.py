@@ -1,32 +1,38 @@
 import os
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+
+from xlsx.writers.officer_xlsx_context import OfficerXlsxContext
 
 
 class OfficerXlsxWriter(object):
     file_name = 'officer.xlsx'
 
-    def __init__(self, officer, out_dir):
+    def __init__(self, officer, out_dir, context=None):
         self.officer = officer
         self.out_dir = out_dir
-        self.wb = Workbook()
+        self.context = context or OfficerXlsxContext(officer)
+        self.wb = Workbook(write_only=True)
 
     def write_sheet(self, ws, queryset, serializer_klass):
-        rows = serializer_klass(queryset, many=True).data
-        fields = list(serializer_klass().fields)
-
-        for column_idx, column_name in enumerate(fields):
-            ws.cell(row=1, column=column_idx + 1, value=column_name)
-
-        for row_idx, row in enumerate(rows):
-            for column_idx, value in enumerate(row.values()):
-                ws.cell(row=row_idx + 2, column=column_idx + 1, value=value)
+        serializer = serializer_klass()
+        ws.append(list(serializer.fields))
+
+        # Rows are streamed from a server side cursor straight into the write-only sheet so memory stays
+        # flat however many rows the officer has
+        for instance in queryset.iterator():
+            row = list(serializer.to_representation(instance).values())
+            if row and row[-1] is None:
+                # Write-only sheets skip empty cells and have no dimension, keep the last column so every
+                # row spans the full width
+                row[-1] = WriteOnlyCell(ws)
+            ws.append(row)
+            self.context.row_count += 1
 
     def export_xlsx(self):
         raise NotImplementedError
 
     def save(self):
         os.makedirs(self.out_dir, exist_ok=True)
-
-        self.wb.remove(self.wb['Sheet'])
         self.wb.save(f'{self.out_dir}/{self.file_name}')